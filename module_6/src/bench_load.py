@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+bench_load.py - Throughput benchmark of the loader's write paths.
+
+Loads synthetic JSONL rows with each load mode (row-at-a-time, executemany,
+COPY text and COPY binary) at each batch size and prints rows/sec. Every
+measurement runs in a scratch schema that is dropped afterwards, so the real
+``applicant_data`` is untouched.
+
+Usage::
+
+    python bench_load.py --rows 10000 100000 1000000
+    python bench_load.py --rows 100000 --modes executemany copy --batch-size 1000 50000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict
+
+from psycopg import sql
+
+# pylint: disable=import-error
+from config import DB_CONFIG
+from load_data import LOAD_MODES, GradCafeDataLoader
+# pylint: enable=import-error
+
+SCHEMA = "bench_load"
+
+
+def synthetic_record(i: int) -> Dict[str, Any]:
+    """
+    Build one cleaned + LLM-extended record shaped like the scraper output.
+
+    :param i: Row number, used to vary the values.
+    :type i: int
+    :return: Record dictionary.
+    :rtype: dict
+    """
+    return {
+        "program": f"Program {i % 500}, University {i % 300}",
+        "comments": "Synthetic benchmark row" if i % 3 else "",
+        "date_added": f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+        "url": f"https://www.thegradcafe.com/result/{i}",
+        "status": ("Accepted", "Rejected", "Wait listed", "Interview")[i % 4],
+        "semester": ("Fall 2025", "Spring 2026")[i % 2],
+        "applicant_type": ("American", "International")[i % 2],
+        "gpa": round(3.0 + (i % 100) / 100, 2),
+        "gre_total": 300 + i % 40,
+        "gre_verbal": 150 + i % 20,
+        "gre_aw": 3.0 + (i % 7) / 2,
+        "degree": ("Masters", "PhD")[i % 2],
+        "llm-generated-program": f"Program {i % 500}",
+        "llm-generated-university": f"University {i % 300}",
+    }
+
+
+def write_jsonl(path: str, rows: int) -> None:
+    """
+    Write ``rows`` synthetic records to a JSONL file.
+
+    :param path: Output path.
+    :type path: str
+    :param rows: Number of records.
+    :type rows: int
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        for i in range(rows):
+            file.write(json.dumps(synthetic_record(i)))
+            file.write("\n")
+
+
+def time_load(path: str, mode: str, batch_size: int) -> float:
+    """
+    Load ``path`` into a fresh scratch schema with ``mode`` and return the seconds taken.
+
+    :param path: JSONL file to load.
+    :type path: str
+    :param mode: One of :data:`load_data.LOAD_MODES`.
+    :type mode: str
+    :param batch_size: Rows per batch.
+    :type batch_size: int
+    :return: Wall-clock seconds spent in ``load_data_from_jsonl``.
+    :rtype: float
+    :raises RuntimeError: If the database is unreachable or the load fails.
+    """
+    loader = GradCafeDataLoader(DB_CONFIG, load_mode=mode)
+    if not loader.connect_to_database():
+        raise RuntimeError("Failed to connect to database")
+    # pylint: disable=no-member
+    conn = loader.connection
+    schema = sql.Identifier(SCHEMA)
+    drop = sql.SQL("DROP SCHEMA IF EXISTS {schema} CASCADE").format(schema=schema)
+    try:
+        conn.execute(drop)
+        conn.execute(sql.SQL("CREATE SCHEMA {schema}").format(schema=schema))
+        conn.execute(sql.SQL("SET search_path TO {schema}").format(schema=schema))
+        conn.commit()
+        if not loader.create_table():
+            raise RuntimeError("Failed to create table")
+
+        start = time.perf_counter()
+        if not loader.load_data_from_jsonl(path, batch_size=batch_size):
+            raise RuntimeError(f"Load failed in mode {mode}")
+        return time.perf_counter() - start
+    finally:
+        conn.rollback()
+        conn.execute(drop)
+        conn.commit()
+        loader.close_connection()
+    # pylint: enable=no-member
+
+
+def main() -> None:
+    """Time every load mode at every row count and batch size; print one JSON line each."""
+    parser = argparse.ArgumentParser(description="Benchmark loader write paths.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--modes", nargs="+", choices=LOAD_MODES, default=list(LOAD_MODES))
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        nargs="+",
+        default=[1000],
+        help="Rows per batch; each batch is one INSERT run or COPY, merge and commit",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = os.path.join(tmp, f"bench_{rows}.jsonl")
+            write_jsonl(path, rows)
+            for mode in args.modes:
+                for batch_size in args.batch_size:
+                    elapsed = time_load(path, mode, batch_size)
+                    print(
+                        json.dumps(
+                            {
+                                "mode": mode,
+                                "rows": rows,
+                                "batch_size": batch_size,
+                                "seconds": round(elapsed, 3),
+                                "rows_per_sec": round(rows / elapsed, 1),
+                            }
+                        ),
+                        flush=True,
+                    )
+
+
+if __name__ == "__main__":
+    main()
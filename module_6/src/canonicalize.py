@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+canonicalize.py - Offline canonicalization table for program strings.
+
+Every distinct raw ``program`` string in ``applicant_data`` is standardized
+once (rules, fuzzy canonical index, then the LLM, via the ``llm_hosting`` CLI)
+and the answer is stored in ``program_canonical``. Queries join against this
+table instead of re-deriving names per row, and a new canonical university or
+program only recomputes the mappings it could change.
+
+Usage::
+
+    python canonicalize.py            # resolve new programs and new canonical names
+    python canonicalize.py --full     # recompute every mapping
+"""
+
+import difflib
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import psycopg
+
+# pylint: disable=import-error
+from config import DB_CONFIG
+from llm_hosting.program_parts import split_halves
+# pylint: enable=import-error
+
+LLM_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_hosting")
+
+logger = logging.getLogger(__name__)
+
+# Canonical name lists the mappings were built from, keyed by kind
+CANON_FILES = {
+    "university": "canon_universities.txt",
+    "program": "canon_programs.txt",
+}
+
+# Raw halves at least this similar to a new canonical name are recomputed. This is
+# looser than the standardizer's own cutoffs so the recomputed set is a superset.
+AFFECTED_CUTOFF = 0.6
+
+PROGRAM_CANONICAL_SQL = """
+CREATE TABLE IF NOT EXISTS program_canonical (
+    program TEXT PRIMARY KEY,
+    canonical_program TEXT,
+    canonical_university TEXT,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE TABLE IF NOT EXISTS canonical_names (
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (kind, name)
+);
+"""
+
+REGISTER_PROGRAMS_SQL = """
+INSERT INTO program_canonical (program)
+SELECT DISTINCT a.program
+FROM applicant_data a
+LEFT JOIN program_canonical pc ON pc.program = a.program
+WHERE a.program IS NOT NULL AND a.program != '' AND pc.program IS NULL
+ON CONFLICT (program) DO NOTHING
+"""
+
+UPSERT_MAPPING_SQL = """
+INSERT INTO program_canonical (program, canonical_program, canonical_university, updated_at)
+VALUES (%s, %s, %s, now())
+ON CONFLICT (program) DO UPDATE SET
+    canonical_program = EXCLUDED.canonical_program,
+    canonical_university = EXCLUDED.canonical_university,
+    updated_at = EXCLUDED.updated_at
+"""
+
+
+def read_canon_names(llm_dir: str = LLM_DIR) -> Dict[str, List[str]]:
+    """
+    Read the canonical university and program lists used by the standardizer.
+
+    :param llm_dir: Directory holding ``canon_universities.txt`` and ``canon_programs.txt``.
+    :type llm_dir: str
+    :return: Names per kind (``university``, ``program``), blank lines dropped.
+    :rtype: dict[str, list[str]]
+    """
+    names = {}
+    for kind, filename in CANON_FILES.items():
+        path = os.path.join(llm_dir, filename)
+        with open(path, "r", encoding="utf-8") as file:
+            names[kind] = [line.strip() for line in file if line.strip()]
+    return names
+
+
+def is_affected(
+    program: str,
+    current: Optional[str],
+    new_names: Iterable[str],
+    old_names: Iterable[str],
+    kind: str,
+) -> bool:
+    """
+    Decide whether a new canonical name could change an existing mapping.
+
+    A mapping is affected when its current value is not a canonical name at all
+    (a miss the new name may now cover), or when the matching raw half resembles
+    one of the new names closely enough that the fuzzy step could now prefer it.
+
+    :param program: Raw program string (the mapping key).
+    :type program: str
+    :param current: Currently stored canonical value for ``kind``.
+    :type current: str | None
+    :param new_names: Canonical names added since the last refresh.
+    :type new_names: Iterable[str]
+    :param old_names: Canonical names the mapping was built against.
+    :type old_names: Iterable[str]
+    :param kind: ``"university"`` or ``"program"``.
+    :type kind: str
+    :return: True if the mapping should be recomputed.
+    :rtype: bool
+    """
+    new_names = list(new_names)
+    if not new_names:
+        return False
+    if current not in set(old_names):
+        return True
+    prog_half, uni_half = split_halves(program)
+    half = (uni_half if kind == "university" else prog_half).lower()
+    if not half:
+        return False
+    lowered = [name.lower() for name in new_names]
+    if any(half in name or name in half for name in lowered):
+        return True
+    return bool(difflib.get_close_matches(half, lowered, n=1, cutoff=AFFECTED_CUTOFF))
+
+
+class ProgramCanonicalizer:
+    """
+    Maintain the ``program_canonical`` mapping from raw program strings.
+
+    Programs are registered as pending (no canonical values yet), resolved in
+    one batch through the ``llm_hosting`` CLI, and upserted. The canonical
+    lists used for the last refresh are kept in ``canonical_names`` so the next
+    refresh knows which names are new.
+    """
+
+    def __init__(self, connection: Any, llm_dir: str = LLM_DIR):
+        """
+        Initialize the canonicalizer.
+
+        :param connection: Open psycopg connection.
+        :type connection: psycopg.Connection
+        :param llm_dir: Directory of the ``llm_hosting`` app and canonical lists.
+        :type llm_dir: str
+        """
+        self.connection = connection
+        self.llm_dir = llm_dir
+
+    def ensure_tables(self) -> None:
+        """Create ``program_canonical`` and ``canonical_names`` if missing."""
+        cursor = self.connection.cursor()
+        cursor.execute(PROGRAM_CANONICAL_SQL)
+        self.connection.commit()
+
+    def register_programs(self) -> int:
+        """
+        Add every distinct ``applicant_data.program`` without a mapping as pending.
+
+        :return: Number of programs registered.
+        :rtype: int
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(REGISTER_PROGRAMS_SQL)
+        self.connection.commit()
+        return cursor.rowcount
+
+    def pending_programs(self) -> List[str]:
+        """
+        List programs that have no canonical mapping yet.
+
+        :return: Raw program strings, sorted.
+        :rtype: list[str]
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "SELECT program FROM program_canonical "
+            "WHERE canonical_program IS NULL OR canonical_university IS NULL "
+            "ORDER BY program"
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def new_canon_names(self, current: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """
+        Compare the canonical lists against the snapshot of the last refresh.
+
+        :param current: Canonical names per kind, as read from disk.
+        :type current: dict[str, list[str]]
+        :return: Names per kind that were not in the snapshot.
+        :rtype: dict[str, list[str]]
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT kind, name FROM canonical_names")
+        known = set(cursor.fetchall())
+        return {
+            kind: [name for name in names if (kind, name) not in known]
+            for kind, names in current.items()
+        }
+
+    def affected_programs(
+        self, new_names: Dict[str, List[str]], current: Dict[str, List[str]]
+    ) -> List[str]:
+        """
+        List resolved programs whose mapping a new canonical name could change.
+
+        :param new_names: Names per kind added since the last refresh.
+        :type new_names: dict[str, list[str]]
+        :param current: All canonical names per kind.
+        :type current: dict[str, list[str]]
+        :return: Raw program strings to recompute, sorted.
+        :rtype: list[str]
+        """
+        if not any(new_names.values()):
+            return []
+        old = {
+            kind: set(names) - set(new_names.get(kind, []))
+            for kind, names in current.items()
+        }
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "SELECT program, canonical_program, canonical_university FROM program_canonical "
+            "WHERE canonical_program IS NOT NULL AND canonical_university IS NOT NULL "
+            "ORDER BY program"
+        )
+        affected = []
+        for program, canon_prog, canon_uni in cursor.fetchall():
+            if is_affected(
+                program, canon_uni, new_names.get("university", []), old["university"], "university"
+            ) or is_affected(
+                program, canon_prog, new_names.get("program", []), old["program"], "program"
+            ):
+                affected.append(program)
+        return affected
+
+    def resolve(self, programs: List[str]) -> Dict[str, Tuple[str, str]]:
+        """
+        Standardize raw program strings with one run of the ``llm_hosting`` CLI.
+
+        Rows the CLI could only answer in degraded (rules-only) form, and output
+        lines that are not JSON rows, are left out, so those programs stay
+        pending and are retried on the next refresh.
+
+        :param programs: Raw program strings.
+        :type programs: list[str]
+        :return: ``program -> (canonical_program, canonical_university)``.
+        :rtype: dict[str, tuple[str, str]]
+        :raises RuntimeError: If the CLI exits with an error.
+        """
+        if not programs:
+            return {}
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".json", delete=False, encoding="utf-8"
+        ) as file:
+            json.dump([{"program": program} for program in programs], file, ensure_ascii=False)
+            in_path = file.name
+        try:
+            result = subprocess.run(
+                [sys.executable, "cli.py", "--file", in_path, "--stdout"],
+                capture_output=True,
+                text=True,
+                cwd=self.llm_dir,
+                check=False,
+            )
+        finally:
+            os.unlink(in_path)
+        if result.returncode != 0:
+            raise RuntimeError(f"LLM standardization failed: {result.stderr}")
+
+        mappings = {}
+        for line in result.stdout.splitlines():
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                logger.warning("Skipping unparsable CLI output line: %.200s", line)
+                continue
+            if not isinstance(row, dict) or row.get("llm-degraded") or not row.get("program"):
+                continue
+            mappings[row["program"]] = (
+                row.get("llm-generated-program", ""),
+                row.get("llm-generated-university", ""),
+            )
+        return mappings
+
+    def store(self, mappings: Dict[str, Tuple[str, str]]) -> int:
+        """
+        Upsert resolved mappings.
+
+        :param mappings: ``program -> (canonical_program, canonical_university)``.
+        :type mappings: dict[str, tuple[str, str]]
+        :return: Number of mappings written.
+        :rtype: int
+        """
+        if not mappings:
+            return 0
+        cursor = self.connection.cursor()
+        cursor.executemany(
+            UPSERT_MAPPING_SQL,
+            [(program, prog, uni) for program, (prog, uni) in mappings.items()],
+        )
+        self.connection.commit()
+        return len(mappings)
+
+    def snapshot_canon_names(self, current: Dict[str, List[str]]) -> None:
+        """
+        Record the canonical lists the mappings are now built against.
+
+        :param current: Canonical names per kind.
+        :type current: dict[str, list[str]]
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("DELETE FROM canonical_names")
+        cursor.executemany(
+            "INSERT INTO canonical_names (kind, name) VALUES (%s, %s)",
+            [(kind, name) for kind, names in current.items() for name in dict.fromkeys(names)],
+        )
+        self.connection.commit()
+
+    def refresh(self, full: bool = False) -> Dict[str, int]:
+        """
+        Bring ``program_canonical`` up to date.
+
+        Registers new programs, then resolves the pending ones plus any mapping
+        affected by canonical names added since the last refresh (or every
+        mapping with ``full``). The canonical snapshot is only advanced once all
+        affected mappings were stored, so degraded answers are retried.
+
+        :param full: Recompute every mapping, not just pending/affected ones.
+        :type full: bool
+        :return: Counts ``registered``, ``pending``, ``affected`` and ``resolved``.
+        :rtype: dict[str, int]
+        """
+        self.ensure_tables()
+        registered = self.register_programs()
+        current = read_canon_names(self.llm_dir)
+        pending = self.pending_programs()
+        if full:
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT program FROM program_canonical ORDER BY program")
+            affected = [row[0] for row in cursor.fetchall()]
+        else:
+            affected = self.affected_programs(self.new_canon_names(current), current)
+
+        mappings = self.resolve(list(dict.fromkeys(pending + affected)))
+        resolved = self.store(mappings)
+        if all(program in mappings for program in affected):
+            self.snapshot_canon_names(current)
+        counts = {
+            "registered": registered,
+            "pending": len(pending),
+            "affected": len(affected),
+            "resolved": resolved,
+        }
+        logger.info("program_canonical refresh: %s", counts)
+        return counts
+
+
+def main() -> bool:
+    """
+    Refresh ``program_canonical`` from the command line.
+
+    :return: True if the refresh succeeded, False otherwise.
+    :rtype: bool
+    """
+    # pylint: disable=import-outside-toplevel
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Refresh the program_canonical mapping table")
+    parser.add_argument("--full", action="store_true", help="Recompute every mapping")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    try:
+        with psycopg.connect(**DB_CONFIG) as connection:
+            counts = ProgramCanonicalizer(connection).refresh(full=args.full)
+    except (psycopg.Error, RuntimeError, IOError, ValueError) as exc:
+        logger.error("Canonicalization failed: %s", exc)
+        return False
+    print(json.dumps(counts))
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
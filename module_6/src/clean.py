@@ -7,9 +7,139 @@ and standardizing scraped admission results. It handles normalization
 of text fields, GPA/GRE extraction, duplicate removal, and output to JSON.
 """
 
+import hashlib
 import json
+import operator
+import os
 import re
-from typing import Any, Dict, List, Optional
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+# pylint: disable=import-error
+from data_statistics import StreamingStatistics
+from near_duplicates import minhash_signature, near_dup_shingles
+# pylint: enable=import-error
+
+# Version of each cleaning rule group. Bump a group's version whenever its logic
+# changes; ``--changed-only`` then re-cleans just the rows that group applies to.
+CLEAN_RULE_VERSIONS = {
+    "text": 1,
+    "degree": 1,
+    "status": 1,
+    "term": 1,
+    "applicant_type": 1,
+    "scores": 1,
+    "dates": 1,
+}
+
+# Raw fields read by each rule group
+CLEAN_RULE_FIELDS = {
+    "text": ("school", "major", "program", "comments"),
+    "degree": ("degree",),
+    "status": ("status",),
+    "term": ("semester",),
+    "applicant_type": ("applicant_type",),
+    "scores": ("gpa", "gre_total", "gre_verbal", "gre_quant", "gre_aw"),
+    "dates": ("date_added", "status_date"),
+}
+
+# Date layouts seen in scraped ``date_added`` values, tried in order
+DATE_FORMATS = ("%B %d, %Y", "%b %d, %Y", "%d %b %Y", "%d %B %Y", "%Y-%m-%d", "%m/%d/%Y")
+MONTHS = {
+    name: number
+    for number in range(1, 13)
+    for name in (date(2000, number, 1).strftime("%b").lower(),
+                 date(2000, number, 1).strftime("%B").lower())
+}
+
+# Upper bounds of the GPA scales recognized by the validation pass
+GPA_SCALES = ((4.3, "4.0"), (10.0, "10"), (100.0, "100"))
+
+# GRE ranges: (new scale, old scale) per score kind
+GRE_SECTION_RANGES = ((130.0, 170.0), (200.0, 800.0))
+GRE_TOTAL_RANGES = ((260.0, 340.0), (400.0, 1600.0))
+
+
+def content_hash(entry: Dict[str, Any]) -> str:
+    """
+    Compute a stable content hash of a raw scraped entry.
+
+    :param entry: Raw entry dictionary.
+    :type entry: dict
+    :return: Hex SHA-256 digest of the entry's canonical JSON form.
+    :rtype: str
+    """
+    canonical = json.dumps(entry, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def classify_gpa_scale(gpa: Optional[float]) -> Optional[str]:
+    """
+    Classify a GPA by the scale it was most likely reported on.
+
+    :param gpa: GPA value.
+    :type gpa: Optional[float]
+    :return: ``"4.0"``, ``"10"``, ``"100"``, ``"invalid"``, or None if missing.
+    :rtype: Optional[str]
+    """
+    if gpa is None:
+        return None
+    if gpa <= 0:
+        return "invalid"
+    for upper, scale in GPA_SCALES:
+        if gpa <= upper:
+            return scale
+    return "invalid"
+
+
+def classify_gre_scale(
+    total: Optional[float], verbal: Optional[float], quant: Optional[float]
+) -> Optional[str]:
+    """
+    Classify GRE scores as the current (130-170) or pre-2011 (200-800) scale.
+
+    Totals are accepted either as a section-style score or as a combined total
+    (260-340 new, 400-1600 old), since posters use the ``GRE`` badge for both.
+
+    :param total: GRE total (or general) score.
+    :type total: Optional[float]
+    :param verbal: GRE verbal score.
+    :type verbal: Optional[float]
+    :param quant: GRE quantitative score.
+    :type quant: Optional[float]
+    :return: ``"new"``, ``"old"``, ``"invalid"`` (out of range or mixed scales),
+             or None if no GRE score is present.
+    :rtype: Optional[str]
+    """
+    scales = set()
+    for value, ranges in (
+        (total, GRE_SECTION_RANGES + GRE_TOTAL_RANGES),
+        (verbal, GRE_SECTION_RANGES),
+        (quant, GRE_SECTION_RANGES),
+    ):
+        if value is None:
+            continue
+        # Even range indexes are new-scale ranges; prefer them when ranges overlap
+        matched = {idx % 2 for idx, (low, high) in enumerate(ranges) if low <= value <= high}
+        scales.add(("new", "old")[min(matched)] if matched else "invalid")
+    if not scales:
+        return None
+    return scales.pop() if len(scales) == 1 else "invalid"
+
+
+def is_valid_gre_aw(gre_aw: Optional[float]) -> Optional[bool]:
+    """
+    Check that an Analytical Writing score is on the 0-6 half-point scale.
+
+    :param gre_aw: GRE AW score.
+    :type gre_aw: Optional[float]
+    :return: True/False, or None if missing.
+    :rtype: Optional[bool]
+    """
+    if gre_aw is None:
+        return None
+    return 0 <= gre_aw <= 6 and float(gre_aw * 2).is_integer()
 
 
 class GradCafeDataCleaner:
@@ -23,6 +153,7 @@ class GradCafeDataCleaner:
     def __init__(self):
         """Initialize the cleaner with an empty dataset."""
         self.cleaned_data = []
+        self.statistics = StreamingStatistics()
 
     def _clean_text(self, text: str) -> str:
         """
@@ -207,6 +338,76 @@ class GradCafeDataCleaner:
             return score_match.group(1)
         return score_text if score_text else None
 
+    def _to_float(self, value: Optional[str]) -> Optional[float]:
+        """
+        Convert an extracted GPA/GRE string to a float.
+
+        :param value: Extracted numeric string (see :meth:`_extract_gre_score`).
+        :type value: Optional[str]
+        :return: Float value, or None if missing or not numeric.
+        :rtype: Optional[float]
+        """
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return None
+
+    def _normalize_date(self, text: str) -> Optional[str]:
+        """
+        Normalize a date string (e.g., ``"September 25, 2025"``) to ISO format.
+
+        :param text: Raw date string.
+        :type text: str
+        :return: ISO date (``YYYY-MM-DD``), the cleaned text if no known layout
+                 matches, or None if empty.
+        :rtype: Optional[str]
+        """
+        text = self._clean_text(text)
+        if not text:
+            return None
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(text, fmt).date().isoformat()
+            except ValueError:
+                continue
+        return text
+
+    def _normalize_status_date(self, text: str, date_added: Optional[str]) -> Optional[str]:
+        """
+        Normalize a status date such as ``"25 Sep"`` to ISO format.
+
+        The list view omits the year, so it is inferred from ``date_added``: the
+        decision must precede the post, so a day/month that would fall after
+        ``date_added`` belongs to the previous year.
+
+        :param text: Raw status date (``"25 Sep"`` or ``"15 Mar 2025"``).
+        :type text: str
+        :param date_added: ISO ``date_added`` of the same entry, if known.
+        :type date_added: Optional[str]
+        :return: ISO date, the cleaned text if it cannot be resolved, or None.
+        :rtype: Optional[str]
+        """
+        text = self._clean_text(text)
+        if not text:
+            return None
+
+        match = re.fullmatch(r"(\d{1,2})\s+([A-Za-z]+)\.?(?:,?\s+(\d{4}))?", text)
+        month = MONTHS.get(match.group(2).lower()) if match else None
+        if not month:
+            return self._normalize_date(text)
+
+        day = int(match.group(1))
+        try:
+            if match.group(3):
+                return date(int(match.group(3)), month, day).isoformat()
+            posted = date.fromisoformat(date_added or "")
+            year = posted.year if (month, day) <= (posted.month, posted.day) else posted.year - 1
+            return date(year, month, day).isoformat()
+        except ValueError:
+            return text
+
     def _clean_program_field(self, program: str) -> str:
         """
         Clean the program field for standardization.
@@ -231,6 +432,9 @@ class GradCafeDataCleaner:
         """
         Clean a single scraped entry.
 
+        GPA/GRE values are emitted as floats and ``date_added``/``status_date`` as
+        ISO dates, so downstream loaders do not need to re-parse them.
+
         :param entry: Raw scraped entry dictionary.
         :type entry: dict
         :return: Cleaned entry dictionary.
@@ -249,29 +453,45 @@ class GradCafeDataCleaner:
         cleaned_entry["degree"] = self._standardize_degree(entry.get("degree"))
         cleaned_entry["semester"] = self._standardize_term(entry.get("semester"))
         cleaned_entry["status"] = self._standardize_status(entry.get("status"))
-        cleaned_entry["status_date"] = self._clean_text(entry.get("status_date", "")) or None
-        cleaned_entry["date_added"] = self._clean_text(entry.get("date_added", "")) or None
+        # Dates are emitted as ISO strings so the loader can skip dateutil parsing
+        cleaned_entry["date_added"] = self._normalize_date(entry.get("date_added", ""))
+        cleaned_entry["status_date"] = self._normalize_status_date(
+            entry.get("status_date", ""), cleaned_entry["date_added"]
+        )
         cleaned_entry["url"] = entry.get("url") or None
         cleaned_entry["applicant_type"] = self._standardize_international_status(
             entry.get("applicant_type")
         )
-        cleaned_entry["gpa"] = self._extract_gpa_new_format(entry.get("gpa"))
-        cleaned_entry["gre_total"] = self._extract_gre_score(entry.get("gre_total", ""), "Total")
-        cleaned_entry["gre_verbal"] = self._extract_gre_score(entry.get("gre_verbal", ""), "Verbal")
-        cleaned_entry["gre_quant"] = self._extract_gre_score(
-            entry.get("gre_quant", ""), "Quantitative"
+        # Scores are emitted as floats (None when missing or non-numeric)
+        cleaned_entry["gpa"] = self._to_float(self._extract_gpa_new_format(entry.get("gpa")))
+        cleaned_entry["gre_total"] = self._to_float(
+            self._extract_gre_score(entry.get("gre_total", ""), "Total")
+        )
+        cleaned_entry["gre_verbal"] = self._to_float(
+            self._extract_gre_score(entry.get("gre_verbal", ""), "Verbal")
         )
-        cleaned_entry["gre_aw"] = self._extract_gre_score(
-            entry.get("gre_aw", ""), "Analytical Writing"
+        cleaned_entry["gre_quant"] = self._to_float(
+            self._extract_gre_score(entry.get("gre_quant", ""), "Quantitative")
+        )
+        cleaned_entry["gre_aw"] = self._to_float(
+            self._extract_gre_score(entry.get("gre_aw", ""), "Analytical Writing")
         )
         cleaned_entry["comments"] = self._clean_text(entry.get("comments", "")) or None
 
+        # Provenance for incremental re-cleaning (see clean_changed)
+        cleaned_entry["raw_hash"] = content_hash(entry)
+        cleaned_entry["clean_rules"] = dict(CLEAN_RULE_VERSIONS)
+
         return cleaned_entry
 
     def clean_data(self, raw_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Clean a list of raw scraped entries.
 
+        Kept entries are also streamed into :pyattr:`statistics`, so a worker that
+        cleans one shard can hand back its summary for merging, and get score
+        validity flags from :meth:`add_quality_flags`.
+
         :param raw_data: List of raw entries from the scraper.
         :type raw_data: list[dict]
         :return: List of cleaned entries.
@@ -280,6 +500,7 @@ class GradCafeDataCleaner:
         print(f"Starting data cleaning for {len(raw_data)} entries...")
 
         cleaned_entries = []
+        self.statistics = StreamingStatistics()
 
         for i, entry in enumerate(raw_data):
             try:
@@ -288,15 +509,109 @@ class GradCafeDataCleaner:
                 # Only keep entries with meaningful data
                 if cleaned_entry.get("program") and cleaned_entry.get("program").strip():
                     cleaned_entries.append(cleaned_entry)
+                    self.statistics.update(cleaned_entry)
 
             except (KeyError, TypeError, ValueError) as exc:
                 print(f"Error cleaning entry {i}: {exc}")
                 continue
 
+        self.add_quality_flags(cleaned_entries)
         self.cleaned_data = cleaned_entries
         print(f"Data cleaning completed. {len(cleaned_entries)} valid entries.")
         return cleaned_entries
 
+    def _stale_rule_groups(self, raw: Dict[str, Any], applied: Dict[str, int]) -> Set[str]:
+        """
+        Find rule groups whose version changed and that apply to a raw entry.
+
+        A group only matters when the entry has a value in one of its input fields,
+        so bumping e.g. the ``scores`` rules leaves rows without scores untouched.
+
+        :param raw: Raw entry dictionary.
+        :type raw: dict
+        :param applied: Rule versions recorded on the previously cleaned entry.
+        :type applied: dict
+        :return: Names of the stale rule groups.
+        :rtype: set[str]
+        """
+        return {
+            group
+            for group, version in CLEAN_RULE_VERSIONS.items()
+            if applied.get(group) != version
+            and any(raw.get(field) not in (None, "") for field in CLEAN_RULE_FIELDS[group])
+        }
+
+    def clean_changed(
+        self, raw_data: List[Dict[str, Any]], previous: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Any]]:
+        # pylint: disable=too-many-locals
+        """
+        Re-clean only entries whose raw content or relevant rule versions changed.
+
+        Previously cleaned entries are matched to raw entries by ``raw_hash``. A
+        match is reused as-is unless one of its applicable rule groups has a newer
+        version in :data:`CLEAN_RULE_VERSIONS`; everything else goes through
+        :meth:`clean_data`.
+
+        :param raw_data: List of raw entries from the scraper.
+        :type raw_data: list[dict]
+        :param previous: Entries from an earlier cleaning run.
+        :type previous: list[dict]
+        :return: Tuple of (all cleaned entries, re-cleaned entries only, report).
+                 The report counts ``unchanged``, ``new``, ``raw_changed``,
+                 ``rules_changed`` and ``removed`` entries (previous rows whose
+                 URL, or raw hash when they have none, is no longer in the input),
+                 the non-dict rows ``skipped``, and lists the
+                 ``stale_rule_groups`` that triggered re-cleaning.
+        :rtype: tuple[list[dict], list[dict], dict]
+        """
+        previous_by_hash = {entry["raw_hash"]: entry for entry in previous if entry.get("raw_hash")}
+        previous_urls = {entry.get("url") for entry in previous if entry.get("url")}
+        previous_keys = {
+            entry.get("url") or entry.get("raw_hash")
+            for entry in previous
+            if entry.get("url") or entry.get("raw_hash")
+        }
+
+        counts = Counter()
+        stale_groups: Set[str] = set()
+        seen_keys = set()
+        reused, to_clean = [], []
+
+        for entry in raw_data:
+            if not isinstance(entry, dict):
+                counts["skipped"] += 1
+                continue
+            raw_hash = content_hash(entry)
+            seen_keys.add(entry.get("url") or raw_hash)
+            match = previous_by_hash.get(raw_hash)
+            if match is not None:
+                stale = self._stale_rule_groups(entry, match.get("clean_rules") or {})
+                if not stale:
+                    counts["unchanged"] += 1
+                    reused.append(match)
+                    continue
+                counts["rules_changed"] += 1
+                stale_groups.update(stale)
+            elif entry.get("url") in previous_urls:
+                counts["raw_changed"] += 1
+            else:
+                counts["new"] += 1
+            to_clean.append(entry)
+
+        delta = self.clean_data(to_clean) if to_clean else []
+        for entry in reused:
+            self.statistics.update(entry)
+        self.cleaned_data = reused + delta
+
+        report = {
+            key: counts[key]
+            for key in ("unchanged", "new", "raw_changed", "rules_changed", "skipped")
+        }
+        report["removed"] = len(previous_keys - seen_keys)
+        report["stale_rule_groups"] = sorted(stale_groups)
+        return self.cleaned_data, delta, report
+
     def remove_duplicates(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Remove duplicate entries based on program, status, date, and URL.
@@ -325,6 +640,152 @@ class GradCafeDataCleaner:
         print(f"Removed {len(data) - len(unique_data)} duplicate entries.")
         return unique_data
 
+    def add_quality_flags(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Add score validity flags to every entry in one column-wise pass.
+
+        Each score column is pulled out once and classified with ``map``, then the
+        flag columns are written back: ``gpa_scale`` (see
+        :func:`classify_gpa_scale`), ``gre_scale`` (see :func:`classify_gre_scale`)
+        and ``gre_aw_valid`` (see :func:`is_valid_gre_aw`). The loader stores these
+        as indexed columns so queries do not repeat range predicates.
+
+        :param data: List of cleaned entries (with typed scores).
+        :type data: list[dict]
+        :return: The same list, with flags added in place.
+        :rtype: list[dict]
+        """
+        columns = {
+            field: [entry.get(field) for entry in data]
+            for field in ("gpa", "gre_total", "gre_verbal", "gre_quant", "gre_aw")
+        }
+        gpa_scales = map(classify_gpa_scale, columns["gpa"])
+        gre_scales = map(
+            classify_gre_scale, columns["gre_total"], columns["gre_verbal"], columns["gre_quant"]
+        )
+        aw_flags = map(is_valid_gre_aw, columns["gre_aw"])
+
+        for entry, gpa_scale, gre_scale, aw_valid in zip(data, gpa_scales, gre_scales, aw_flags):
+            entry["gpa_scale"] = gpa_scale
+            entry["gre_scale"] = gre_scale
+            entry["gre_aw_valid"] = aw_valid
+        return data
+
+    def find_near_duplicates(
+        self,
+        data: Sequence[Dict[str, Any]],
+        threshold: float = 0.8,
+        num_perm: int = 64,
+        bands: int = 16,
+    ) -> List[Optional[int]]:
+        # pylint: disable=too-many-locals
+        """
+        Find near-duplicate entries with MinHash signatures and LSH banding.
+
+        Entries are compared on ``school``, ``major``, ``degree``, ``status``,
+        ``date_added`` and ``comments``. Signatures are split into ``bands`` bands;
+        entries sharing any band bucket are candidates, and a candidate is accepted
+        when the estimated Jaccard similarity reaches ``threshold``. Each bucket is
+        only checked against its first member, so the pass stays near-linear.
+
+        :param data: List of cleaned entries.
+        :type data: list[dict]
+        :param threshold: Minimum estimated Jaccard similarity (default: 0.8).
+        :type threshold: float
+        :param num_perm: MinHash signature length (default: 64).
+        :type num_perm: int
+        :param bands: Number of LSH bands; must divide ``num_perm`` (default: 16).
+        :type bands: int
+        :return: For each entry, the index of the earliest entry it duplicates,
+                 or None if it is not a near-duplicate.
+        :rtype: list[Optional[int]]
+        :raises ValueError: If ``bands`` does not divide ``num_perm``.
+        """
+        if bands <= 0 or num_perm % bands:
+            raise ValueError("bands must be a positive divisor of num_perm")
+        rows_per_band = num_perm // bands
+
+        signatures: List[Optional[Tuple[int, ...]]] = []
+        for entry in data:
+            shingles = near_dup_shingles(entry)
+            signatures.append(minhash_signature(shingles, num_perm) if shingles else None)
+
+        parent = list(range(len(data)))
+        checked: Set[Tuple[int, int]] = set()
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for band in range(bands):
+            start = band * rows_per_band
+            buckets: Dict[Tuple[int, ...], int] = {}
+            for i, signature in enumerate(signatures):
+                if signature is None:
+                    continue
+                key = signature[start : start + rows_per_band]
+                first = buckets.setdefault(key, i)
+                if first == i or (first, i) in checked or find(first) == find(i):
+                    continue
+                checked.add((first, i))
+                matches = sum(map(operator.eq, signature, signatures[first]))
+                if matches / num_perm >= threshold:
+                    root_a, root_b = find(first), find(i)
+                    parent[max(root_a, root_b)] = min(root_a, root_b)
+
+        return [None if find(i) == i else find(i) for i in range(len(data))]
+
+    def remove_near_duplicates(
+        self,
+        data: List[Dict[str, Any]],
+        mode: str = "flag",
+        threshold: float = 0.8,
+    ) -> List[Dict[str, Any]]:
+        """
+        Flag or merge near-duplicate entries (e.g., reposts with edited comments).
+
+        In ``flag`` mode every entry is kept and duplicates get a
+        ``near_duplicate_of`` key holding the URL (or list index) of the earliest
+        matching entry. In ``merge`` mode duplicates are dropped and any fields
+        missing from the kept entry are filled from its duplicates.
+
+        :param data: List of cleaned entries.
+        :type data: list[dict]
+        :param mode: ``"flag"`` or ``"merge"`` (default: ``"flag"``).
+        :type mode: str
+        :param threshold: Minimum estimated Jaccard similarity (default: 0.8).
+        :type threshold: float
+        :return: Flagged or merged list of entries.
+        :rtype: list[dict]
+        :raises ValueError: If ``mode`` is not recognized.
+        """
+        if mode not in ("flag", "merge"):
+            raise ValueError(f"Unknown near-duplicate mode: {mode}")
+
+        canonical = self.find_near_duplicates(data, threshold=threshold)
+        duplicate_count = sum(1 for idx in canonical if idx is not None)
+
+        if mode == "flag":
+            for entry, idx in zip(data, canonical):
+                if idx is not None:
+                    entry["near_duplicate_of"] = data[idx].get("url") or idx
+            print(f"Flagged {duplicate_count} near-duplicate entries.")
+            return data
+
+        merged = []
+        for entry, idx in zip(data, canonical):
+            if idx is None:
+                merged.append(entry)
+                continue
+            kept = data[idx]
+            for key, value in entry.items():
+                if value not in (None, "") and kept.get(key) in (None, ""):
+                    kept[key] = value
+        print(f"Merged {duplicate_count} near-duplicate entries.")
+        return merged
+
     def save_data(
         self, data: List[Dict[str, Any]], filename: str = "cleaned_applicant_data.json"
     ) -> None:
@@ -363,38 +824,18 @@ class GradCafeDataCleaner:
 
     def get_data_statistics(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
-        Generate statistics from cleaned data.
+        Generate statistics from cleaned data in a single pass.
 
         :param data: List of cleaned entries.
         :type data: list[dict]
-        :return: Dictionary of statistics (counts, unique values, etc.).
+        :return: Dictionary of statistics (counts, unique values, numeric
+                 summaries, top values); see :meth:`StreamingStatistics.to_dict`.
         :rtype: dict
         """
-        if not data:
-            return {}
-
-        stats = {
-            "total_entries": len(data),
-            "entries_with_program": sum(1 for entry in data if entry.get("program")),
-            "entries_with_degree": sum(1 for entry in data if entry.get("degree")),
-            "entries_with_school": sum(1 for entry in data if entry.get("school")),
-            "entries_with_major": sum(1 for entry in data if entry.get("major")),
-            "entries_with_gpa": sum(1 for entry in data if entry.get("gpa")),
-            "entries_with_gre_total": sum(1 for entry in data if entry.get("gre_total")),
-            "entries_with_gre_verbal": sum(1 for entry in data if entry.get("gre_verbal")),
-            "entries_with_gre_quant": sum(1 for entry in data if entry.get("gre_quant")),
-            "entries_with_gre_aw": sum(1 for entry in data if entry.get("gre_aw")),
-            "entries_with_comments": sum(1 for entry in data if entry.get("comments")),
-            "entries_with_semester": sum(1 for entry in data if entry.get("semester")),
-            "unique_programs": len(
-                set(entry.get("program", "").lower() for entry in data if entry.get("program"))
-            ),
-            "unique_schools": len(
-                set(entry.get("school", "").lower() for entry in data if entry.get("school"))
-            ),
-        }
-
-        return stats
+        stats = StreamingStatistics()
+        for entry in data:
+            stats.update(entry)
+        return stats.to_dict()
 
 
 def main():
@@ -404,7 +845,7 @@ def main():
     This command:
       1) Loads raw JSON data
       2) Cleans and normalizes fields
-      3) Removes duplicates
+      3) Removes duplicates (optionally flags/merges near-duplicates)
       4) Saves cleaned JSON
       5) Prints summary statistics
 
@@ -412,6 +853,13 @@ def main():
     :type --input: str
     :param --output: Output JSON file path for cleaned entries.
     :type --output: str
+    :param --near-dedup: Near-duplicate handling: ``off``, ``flag`` or ``merge``.
+    :type --near-dedup: str
+    :param --changed-only: Re-clean only rows whose raw hash or rule versions changed,
+                           reusing the rest from the existing ``--output`` file.
+    :type --changed-only: bool
+    :param --delta-output: Optional file for just the re-cleaned rows.
+    :type --delta-output: str
     :return: None
     :rtype: None
     """
@@ -430,6 +878,28 @@ def main():
         default="cleaned_applicant_data.json",
         help="Output JSON file (default: cleaned_applicant_data.json)",
     )
+    parser.add_argument(
+        "--near-dedup",
+        choices=["off", "flag", "merge"],
+        default="off",
+        help="Near-duplicate pass using MinHash/LSH (default: off)",
+    )
+    parser.add_argument(
+        "--near-dedup-threshold",
+        type=float,
+        default=0.8,
+        help="Estimated Jaccard similarity for near-duplicates (default: 0.8)",
+    )
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="Reuse entries from the existing output and re-clean only new/changed rows",
+    )
+    parser.add_argument(
+        "--delta-output",
+        default=None,
+        help="With --changed-only, also save just the re-cleaned rows to this file",
+    )
 
     args = parser.parse_args()
 
@@ -442,14 +912,30 @@ def main():
         print(f"No data found to clean in {args.input}. Please check the file exists.")
         return
 
-    # Clean the data
-    cleaned_data = cleaner.clean_data(raw_data)
+    # Clean the data (optionally only rows whose content or rules changed)
+    delta_data = None
+    if args.changed_only:
+        previous = cleaner.load_data(args.output) if os.path.exists(args.output) else []
+        cleaned_data, delta_data, report = cleaner.clean_changed(raw_data, previous)
+        print("\nChange Report:")
+        for key, value in report.items():
+            print(f"  {key}: {value}")
+    else:
+        cleaned_data = cleaner.clean_data(raw_data)
 
     # Remove duplicates
     unique_data = cleaner.remove_duplicates(cleaned_data)
 
+    # Optionally flag or merge near-duplicates (reposts with small edits)
+    if args.near_dedup != "off":
+        unique_data = cleaner.remove_near_duplicates(
+            unique_data, mode=args.near_dedup, threshold=args.near_dedup_threshold
+        )
+
     # Save cleaned data to specified output file
     cleaner.save_data(unique_data, args.output)
+    if delta_data is not None and args.delta_output:
+        cleaner.save_data(delta_data, args.delta_output)
 
     # Print statistics
     stats = cleaner.get_data_statistics(unique_data)
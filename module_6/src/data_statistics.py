@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Streaming statistics for cleaned Grad Cafe data.
+
+This module provides :class:`StreamingStatistics`, a single-pass, mergeable
+summary of cleaned entries, and the sketches it uses to stay bounded in memory:
+:class:`HyperLogLog` for large distinct counts and :class:`MisraGries` for top
+values.
+"""
+
+import functools
+import hashlib
+import heapq
+import math
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+
+@functools.lru_cache(maxsize=1 << 20)
+def stable_hash64(text: str) -> int:
+    """
+    Hash a string to a 64-bit integer that is stable across processes.
+
+    Python's built-in ``hash`` is salted per interpreter, so signatures built with
+    it could not be compared between runs or worker processes. Results are cached
+    because shingles (school names, dates) repeat heavily across entries.
+
+    :param text: String to hash.
+    :type text: str
+    :return: Unsigned 64-bit hash value.
+    :rtype: int
+    """
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+# Fields summarized by the streaming statistics accumulator
+STAT_PRESENCE_FIELDS = (
+    "program",
+    "degree",
+    "school",
+    "major",
+    "gpa",
+    "gre_total",
+    "gre_verbal",
+    "gre_quant",
+    "gre_aw",
+    "comments",
+    "semester",
+)
+STAT_NUMERIC_FIELDS = ("gpa", "gre_total", "gre_verbal", "gre_quant", "gre_aw")
+STAT_DISTINCT_FIELDS = {"program": "unique_programs", "school": "unique_schools"}
+STAT_TOP_K_FIELDS = ("school", "program", "degree", "status", "semester")
+
+
+class HyperLogLog:
+    """
+    HyperLogLog cardinality sketch with mergeable registers.
+
+    Used by :class:`StreamingStatistics` once exact distinct sets grow too large.
+    """
+
+    def __init__(self, precision: int = 12):
+        """
+        Initialize an empty sketch.
+
+        :param precision: Number of index bits; the sketch keeps ``2**precision``
+                          registers (default: 12, about 1.6% standard error).
+        :type precision: int
+        """
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        """
+        Add a value to the sketch.
+
+        :param value: Value to count.
+        :type value: str
+        """
+        hashed = stable_hash64(value)
+        idx = hashed & ((1 << self.precision) - 1)
+        rest = hashed >> self.precision
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """
+        Merge another sketch with the same precision into this one.
+
+        :param other: Sketch to merge.
+        :type other: HyperLogLog
+        :raises ValueError: If the precisions differ.
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        """
+        Estimate the number of distinct values added.
+
+        :return: Estimated cardinality.
+        :rtype: int
+        """
+        size = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0 ** -reg for reg in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            estimate = size * math.log(size / zeros)
+        return int(round(estimate))
+
+
+class MisraGries:
+    """
+    Misra-Gries heavy-hitters sketch with at most ``capacity`` counters.
+
+    Counts are exact while at most ``capacity`` distinct values were seen. Past
+    that, a value that does not fit decrements every counter instead, so each
+    count is an underestimate by at most ``total / (capacity + 1)`` and any value
+    occurring more often than that is kept. Used by :class:`StreamingStatistics`
+    for top values.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        """
+        Initialize an empty sketch.
+
+        :param capacity: Maximum number of counters kept (default: 1000).
+        :type capacity: int
+        """
+        self.capacity = capacity
+        self.counts: Dict[Any, int] = {}
+
+    def __len__(self) -> int:
+        """
+        Number of counters currently kept.
+
+        :return: Counter count.
+        :rtype: int
+        """
+        return len(self.counts)
+
+    def add(self, value: Any) -> None:
+        """
+        Count one occurrence of a value.
+
+        :param value: Hashable value to count.
+        :type value: Any
+        """
+        counts = self.counts
+        if value in counts:
+            counts[value] += 1
+        elif len(counts) < self.capacity:
+            counts[value] = 1
+        else:
+            # Each decrement pass removes capacity + 1 occurrences, so it is amortized O(1)
+            self.counts = {item: count - 1 for item, count in counts.items() if count > 1}
+
+    def merge(self, other: "MisraGries") -> None:
+        """
+        Merge another sketch into this one, keeping at most ``capacity`` counters.
+
+        Counts are summed; if that leaves too many counters, the
+        ``(capacity + 1)``-th largest count is subtracted from all of them and
+        the ones left at zero or below are dropped, which keeps the error bound.
+
+        :param other: Sketch to merge.
+        :type other: MisraGries
+        """
+        for value, count in other.counts.items():
+            self.counts[value] = self.counts.get(value, 0) + count
+        if len(self.counts) > self.capacity:
+            cut = heapq.nlargest(self.capacity + 1, self.counts.values())[-1]
+            self.counts = {
+                value: count - cut for value, count in self.counts.items() if count > cut
+            }
+
+    def most_common(self, n: int) -> List[Tuple[Any, int]]:
+        """
+        List the ``n`` values with the highest counts, like :meth:`Counter.most_common`.
+
+        :param n: Number of values.
+        :type n: int
+        :return: ``(value, count)`` pairs, highest count first.
+        :rtype: list[tuple]
+        """
+        return heapq.nlargest(n, self.counts.items(), key=lambda item: item[1])
+
+
+class StreamingStatistics:
+    """
+    Single-pass, mergeable statistics over cleaned entries.
+
+    Tracks non-null counts, distinct counts (exact until ``exact_limit`` values,
+    then HyperLogLog), numeric min/max/mean for GPA/GRE fields and top-k values
+    (a Misra-Gries sketch of ``top_capacity`` counters per field).
+    Instances are plain picklable objects, so shards cleaned in worker processes
+    can be summarized independently and combined with :meth:`merge`.
+    """
+
+    def __init__(self, exact_limit: int = 50000, top_k: int = 5, top_capacity: int = 1000):
+        """
+        Initialize an empty accumulator.
+
+        :param exact_limit: Distinct values kept exactly before switching a field
+                            to HyperLogLog (default: 50000).
+        :type exact_limit: int
+        :param top_k: Number of most common values reported per field (default: 5).
+        :type top_k: int
+        :param top_capacity: Counters kept per top-values field; counts are exact
+                             up to that many distinct values (default: 1000).
+        :type top_capacity: int
+        """
+        self.exact_limit = exact_limit
+        self.top_k = top_k
+        self.total = 0
+        self.present = Counter()
+        self.distinct: Dict[str, Any] = {field: set() for field in STAT_DISTINCT_FIELDS}
+        self.numeric: Dict[str, List[float]] = {}
+        self.top_values: Dict[str, MisraGries] = {
+            field: MisraGries(top_capacity) for field in STAT_TOP_K_FIELDS
+        }
+
+    def _add_distinct(self, field: str, value: str) -> None:
+        """
+        Record a value for a distinct count, switching to HyperLogLog when large.
+
+        :param field: Field name.
+        :type field: str
+        :param value: Normalized value.
+        :type value: str
+        """
+        values = self.distinct[field]
+        values.add(value)
+        if isinstance(values, set) and len(values) > self.exact_limit:
+            sketch = HyperLogLog()
+            for item in values:
+                sketch.add(item)
+            self.distinct[field] = sketch
+
+    def _add_numeric(self, field: str, value: Any) -> None:
+        """
+        Update ``[count, min, max, sum]`` for a numeric field.
+
+        :param field: Field name.
+        :type field: str
+        :param value: Numeric value or numeric string; others are ignored.
+        :type value: Any
+        """
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return
+        summary = self.numeric.get(field)
+        if summary is None:
+            self.numeric[field] = [1, number, number, number]
+            return
+        summary[0] += 1
+        summary[1] = min(summary[1], number)
+        summary[2] = max(summary[2], number)
+        summary[3] += number
+
+    def update(self, entry: Dict[str, Any]) -> None:
+        """
+        Add one cleaned entry to the statistics.
+
+        :param entry: Cleaned entry dictionary.
+        :type entry: dict
+        """
+        self.total += 1
+        for field in STAT_PRESENCE_FIELDS:
+            if entry.get(field):
+                self.present[field] += 1
+        for field in STAT_DISTINCT_FIELDS:
+            value = entry.get(field)
+            if value:
+                self._add_distinct(field, str(value).lower())
+        for field in STAT_NUMERIC_FIELDS:
+            if entry.get(field):
+                self._add_numeric(field, entry[field])
+        for field in STAT_TOP_K_FIELDS:
+            value = entry.get(field)
+            if value:
+                self.top_values[field].add(value)
+
+    def merge(self, other: "StreamingStatistics") -> "StreamingStatistics":
+        """
+        Merge another accumulator (e.g., from a worker process) into this one.
+
+        :param other: Accumulator to merge.
+        :type other: StreamingStatistics
+        :return: This accumulator, for chaining.
+        :rtype: StreamingStatistics
+        """
+        self.total += other.total
+        self.present.update(other.present)
+        for field, theirs in other.distinct.items():
+            mine = self.distinct[field]
+            if isinstance(mine, set) and isinstance(theirs, set):
+                for value in theirs:
+                    self._add_distinct(field, value)
+                continue
+            if isinstance(mine, set):
+                sketch = HyperLogLog()
+                for value in mine:
+                    sketch.add(value)
+                mine = self.distinct[field] = sketch
+            if isinstance(theirs, set):
+                for value in theirs:
+                    mine.add(value)
+            else:
+                mine.merge(theirs)
+        for field, (count, low, high, total) in other.numeric.items():
+            summary = self.numeric.get(field)
+            if summary is None:
+                self.numeric[field] = [count, low, high, total]
+            else:
+                summary[0] += count
+                summary[1] = min(summary[1], low)
+                summary[2] = max(summary[2], high)
+                summary[3] += total
+        for field, sketch in other.top_values.items():
+            self.top_values[field].merge(sketch)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Render the accumulated statistics.
+
+        :return: Dictionary with the ``entries_with_*`` and ``unique_*`` counts of
+                 :meth:`clean.GradCafeDataCleaner.get_data_statistics`, plus ``numeric``
+                 (count/min/max/mean per field) and ``top_values``.
+        :rtype: dict
+        """
+        if not self.total:
+            return {}
+
+        stats: Dict[str, Any] = {"total_entries": self.total}
+        for field in STAT_PRESENCE_FIELDS:
+            stats[f"entries_with_{field}"] = self.present[field]
+        for field, key in STAT_DISTINCT_FIELDS.items():
+            values = self.distinct[field]
+            stats[key] = len(values) if isinstance(values, set) else values.count()
+        stats["numeric"] = {
+            field: {
+                "count": count,
+                "min": low,
+                "max": high,
+                "mean": round(total / count, 4),
+            }
+            for field, (count, low, high, total) in self.numeric.items()
+        }
+        stats["top_values"] = {
+            field: counts.most_common(self.top_k)
+            for field, counts in self.top_values.items()
+            if counts
+        }
+        return stats
@@ -157,7 +157,7 @@ def create_app(config=None, db_config=None, scraper=None):
         result = subprocess.run(
             [
                 "python",
-                "app.py",
+                "cli.py",
                 "--file",
                 "../new_cleaned_applicant_data.json",
                 "--stdout",
@@ -213,11 +213,15 @@ def create_app(config=None, db_config=None, scraper=None):
         scraping_status["progress"] = "Step 4/4: Loading new data into database..."
         print("[DEBUG] Loading data to database...")
 
-        new_count = load_new_data_to_database(llm_output_path)
+        counts = load_new_data_to_database(llm_output_path)
+        new_count = counts["inserted"]
 
-        scraping_status["progress"] = f"Complete! Added {new_count} new records"
+        scraping_status["progress"] = (
+            f"Complete! Added {new_count} new records "
+            f"({counts['updated']} updated, {counts['unchanged']} unchanged)"
+        )
         scraping_status["last_update"] = datetime.now()
-        print(f"[DEBUG] Pipeline complete! Added {new_count} new records")
+        print(f"[DEBUG] Pipeline complete! {counts}")
 
         return new_count
 
@@ -258,17 +262,19 @@ def create_app(config=None, db_config=None, scraper=None):
             scraping_status["is_running"] = False
             print("[DEBUG] Data pipeline thread finished")
 
-    def load_new_data_to_database(filename: str) -> int:
+    def load_new_data_to_database(filename: str) -> dict:
         """
         Load new data from a JSONL file into the database.
 
-        Uses :class:`load_data.GradCafeDataLoader` to load rows and computes the
-        number of newly added records by comparing counts before/after.
+        Runs the schema migration first (older tables lack ``result_id`` and the
+        flag columns), then uses :meth:`load_data.GradCafeDataLoader.upsert_from_jsonl`,
+        which merges rows on their GradCafe result id, so re-pulling the same
+        entries does not duplicate them.
 
         :param filename: Path to the JSONL file produced by the LLM step.
         :type filename: str
-        :return: Number of new rows added to ``applicant_data``.
-        :rtype: int
+        :return: Exact ``inserted``, ``updated`` and ``unchanged`` row counts.
+        :rtype: dict
         :raises Exception: If database connection or loading fails.
         """
         try:
@@ -281,38 +287,17 @@ def create_app(config=None, db_config=None, scraper=None):
             if not loader.connect_to_database():
                 raise RuntimeError("Failed to connect to database")
 
-            # Count existing records
-            conn = get_db_connection()
-            # pylint: disable=no-member
-            cursor = conn.cursor()
-            # Compose SQL query with identifier and limit
-            count_query = sql.SQL("SELECT COUNT(*) FROM {table} LIMIT {limit}").format(
-                table=sql.Identifier('applicant_data'),
-                limit=sql.Literal(1)
-            )
-            cursor.execute(count_query)
-            initial_count = cursor.fetchone()[0]
-            conn.close()
-            # pylint: enable=no-member
+            try:
+                if not loader.create_table():
+                    raise RuntimeError("Failed to migrate database schema")
+                counts = loader.upsert_from_jsonl(filename)
+            finally:
+                loader.close_connection()
 
-            # Load new data
-            success = loader.load_data_from_jsonl(filename)
-            if not success:
+            if not counts or counts["inserted"] + counts["updated"] + counts["unchanged"] == 0:
                 raise RuntimeError("Failed to load new data")
 
-            # Count final records
-            conn = get_db_connection()
-            # pylint: disable=no-member
-            cursor = conn.cursor()
-            # Reuse the same count query
-            cursor.execute(count_query)
-            final_count = cursor.fetchone()[0]
-            conn.close()
-            # pylint: enable=no-member
-
-            loader.close_connection()
-
-            return final_count - initial_count
+            return counts
 
         except (RuntimeError, psycopg.Error) as exc:
             raise RuntimeError(f"Database loading error: {exc}") from exc
@@ -1,22 +1,56 @@
 # -*- coding: utf-8 -*-
-"""Flask + tiny local LLM standardizer with incremental JSONL CLI output."""
+"""Flask + tiny local LLM standardizer (the command line is ``cli.py``)."""
 
 from __future__ import annotations
 
-import difflib
+import functools
+import hashlib
 import json
 import os
 import re
-import sys
-from typing import Any, Dict, List, Tuple
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from flask import Flask, Response, jsonify, request
+
+from backends import Backend, create_backend
+from dedup import RequestDedup
+from fuzzy_index import FuzzyIndex
+from jobs import JobQueue, resolve_input_path
+from llm_cache import LLMCache
+from metrics import Histogram
+from program_parts import split_halves, split_pair
+from prompts import (
+    BATCH_SYSTEM_PROMPT,
+    CHAT_STOP,
+    CHAT_TURN,
+    FEW_SHOTS,
+    GRAMMARS_GBNF,
+    PREFIX_MESSAGES,
+    SYSTEM_PROMPT,
+)
+from repass import RepassQueue
+from report import metrics_report, stats_report
+from row_stream import iter_json_rows, row_key
+from streaming import iter_windows, ndjson_response
+from worker_pool import WorkerPool
 
-from flask import Flask, jsonify, request
-from huggingface_hub import hf_hub_download
-from llama_cpp import Llama  # CPU-only by default if N_GPU_LAYERS=0
+try:  # NumPy is optional; without it the distilled classifier is disabled
+    from ngram_classifier import DistilledStandardizer
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    DistilledStandardizer = None  # type: ignore[assignment,misc]
 
 app = Flask(__name__)
 
 # ---------------- Model config ----------------
+# Inference backend: "llama" (llama.cpp), "rules" (no model) or "fake" (deterministic, slow)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "llama")
+FAKE_CALL_LATENCY_MS = float(os.getenv("FAKE_CALL_LATENCY_MS", "50"))
+FAKE_ROW_LATENCY_MS = float(os.getenv("FAKE_ROW_LATENCY_MS", "20"))
+
 MODEL_REPO = os.getenv(
     "MODEL_REPO",
     "TheBloke/TinyLlama-1.1B-Chat-v1.0-GGUF",
@@ -29,12 +63,63 @@ MODEL_FILE = os.getenv(
 N_THREADS = int(os.getenv("N_THREADS", str(os.cpu_count() or 2)))
 N_CTX = int(os.getenv("N_CTX", "2048"))
 N_GPU_LAYERS = int(os.getenv("N_GPU_LAYERS", "0"))  # 0 → CPU-only
+# Model worker processes; N_THREADS is split across them (1 = in-process model)
+LLM_WORKERS = max(1, int(os.getenv("LLM_WORKERS", "1")))
+# Load the model and run a warmup completion at startup (in the background) instead of
+# on the first request; memory-map the weights so later processes reuse the page cache
+EAGER_LOAD = os.getenv("EAGER_LOAD", "1") != "0"
+USE_MMAP = os.getenv("USE_MMAP", "1") != "0"
+USE_MLOCK = os.getenv("USE_MLOCK", "0") == "1"
 
 CANON_UNIS_PATH = os.getenv("CANON_UNIS_PATH", "canon_universities.txt")
 CANON_PROGS_PATH = os.getenv("CANON_PROGS_PATH", "canon_programs.txt")
 
+# Persistent result cache; set LLM_CACHE_PATH="" to disable
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3")
+
+# Persistent store for the async job API (/jobs)
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "jobs.sqlite3")
+# Directory POST /jobs {"path": ...} may read inputs from; unset disables path jobs
+JOBS_DIR = os.getenv("JOBS_DIR", "")
+
+# Load shedding (0 = off): how long a row may wait for the model, and a deadline per
+# HTTP request / CLI run. Rows over either get the rules-only answer and are re-passed later
+ROW_BUDGET_MS = float(os.getenv("ROW_BUDGET_MS", "0"))
+DEADLINE_S = float(os.getenv("DEADLINE_S", "0"))
+# Queue of degraded rows, re-standardized in the background once the model has been idle
+REPASS_DB_PATH = os.getenv("REPASS_DB_PATH", "repass.sqlite3")
+REPASS_IDLE_S = float(os.getenv("REPASS_IDLE_S", "2"))
+
+# Rules-first resolver: skip the LLM when both names map confidently to the canon lists
+RULES_FIRST = os.getenv("RULES_FIRST", "1") != "0"
+RULES_FUZZY_CUTOFF = float(os.getenv("RULES_FUZZY_CUTOFF", "0.93"))
+
+# Char n-gram classifier distilled from past LLM outputs; answers only confident rows
+CLASSIFIER = os.getenv("CLASSIFIER", "1") != "0" and DistilledStandardizer is not None
+CLASSIFIER_MIN_CONFIDENCE = float(os.getenv("CLASSIFIER_MIN_CONFIDENCE", "0.95"))
+# Extra labelled rows (program -> llm-generated-*), os.pathsep-separated JSON/JSONL paths
+CLASSIFIER_JSONL = os.getenv(
+    "CLASSIFIER_JSONL", os.path.join("..", "new_llm_extend_applicant_data.jsonl")
+)
+# Minimum seconds between checks for enough new cache entries to retrain
+CLASSIFIER_RETRAIN_S = float(os.getenv("CLASSIFIER_RETRAIN_S", "30"))
+
+# Evaluate the fixed system prompt + few-shots once and restore that model state per call
+PREFIX_CACHE = os.getenv("PREFIX_CACHE", "1") != "0"
+
+# Constrain decoding with a GBNF grammar that only admits the result JSON
+GRAMMAR = os.getenv("GRAMMAR", "1") != "0"
+# Token budgets: a constrained result object fits in ~40 tokens
+MAX_TOKENS_ROW = 48 if GRAMMAR else 128
+MAX_TOKENS_BATCH_ROW = 40 if GRAMMAR else 64
+
+# Rows packed into one prompt for batched inference (1 = one completion per row)
+BATCH_SIZE = max(1, int(os.getenv("BATCH_SIZE", "8")))
+
 # Precompiled, non-greedy JSON object matcher to tolerate chatter around JSON
 JSON_OBJ_RE = re.compile(r"\{.*?\}", re.DOTALL)
+# Greedy JSON array matcher for batched replies
+JSON_ARR_RE = re.compile(r"\[.*\]", re.DOTALL)
 
 
 # ---------------- Canonical lists + abbrev maps ----------------
@@ -49,6 +134,11 @@ def _read_lines(path: str) -> List[str]:
 
 CANON_UNIS = _read_lines(CANON_UNIS_PATH)
 CANON_PROGS = _read_lines(CANON_PROGS_PATH)
+CANON_UNIS_SET = frozenset(CANON_UNIS)
+CANON_PROGS_SET = frozenset(CANON_PROGS)
+# Trigram indexes built once at import; each lookup scores only a short candidate list
+CANON_UNIS_INDEX = FuzzyIndex(CANON_UNIS)
+CANON_PROGS_INDEX = FuzzyIndex(CANON_PROGS)
 
 ABBREV_UNI: Dict[str, str] = {
     r"(?i)^mcg(\.|ill)?$": "McGill University",
@@ -68,82 +158,86 @@ COMMON_PROG_FIXES: Dict[str, str] = {
     "Info Studies": "Information Studies",
 }
 
-# ---------------- Few-shot prompt ----------------
-SYSTEM_PROMPT = (
-    "You are a data cleaning assistant. Standardize degree program and university "
-    "names.\n\n"
-    "Rules:\n"
-    "- Input provides a single string under key `program` that may contain both "
-    "program and university.\n"
-    "- Split into (program name, university name).\n"
-    "- Trim extra spaces and commas.\n"
-    '- Expand obvious abbreviations (e.g., "McG" -> "McGill University", '
-    '"UBC" -> "University of British Columbia").\n'
-    "- Use Title Case for program; use official capitalization for university "
-    'names (e.g., "University of X").\n'
-    '- Ensure correct spelling (e.g., "McGill", not "McGiill").\n'
-    '- If university cannot be inferred, return "Unknown".\n\n'
-    "Return JSON ONLY with keys:\n"
-    "  standardized_program, standardized_university\n"
-)
 
-FEW_SHOTS: List[Tuple[Dict[str, str], Dict[str, str]]] = [
-    (
-        {"program": "Information Studies, McGill University"},
-        {
-            "standardized_program": "Information Studies",
-            "standardized_university": "McGill University",
-        },
-    ),
-    (
-        {"program": "Information, McG"},
-        {
-            "standardized_program": "Information Studies",
-            "standardized_university": "McGill University",
-        },
-    ),
-    (
-        {"program": "Mathematics, University Of British Columbia"},
-        {
-            "standardized_program": "Mathematics",
-            "standardized_university": "University of British Columbia",
-        },
-    ),
-]
-
-_LLM: Llama | None = None
-
-
-def _load_llm() -> Llama:
-    """Download (or reuse) the GGUF file and initialize llama.cpp."""
-    global _LLM
-    if _LLM is not None:
-        return _LLM
-
-    model_path = hf_hub_download(
-        repo_id=MODEL_REPO,
-        filename=MODEL_FILE,
-        local_dir="models",
-        local_dir_use_symlinks=False,
-        force_filename=MODEL_FILE,
+def _prompt_version() -> str:
+    """Hash everything that shapes a result: model, prompt, few-shots, canon lists."""
+    blob = json.dumps(
+        [
+            MODEL_REPO,
+            MODEL_FILE,
+            SYSTEM_PROMPT,
+            BATCH_SYSTEM_PROMPT,
+            FEW_SHOTS,
+            CHAT_TURN if PREFIX_CACHE else "chat-completion",
+            GRAMMARS_GBNF if GRAMMAR else "free",
+            CANON_UNIS,
+            CANON_PROGS,
+        ],
+        ensure_ascii=False,
     )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+CACHE_NAMESPACE = f"{LLM_BACKEND}:{MODEL_FILE}:{_prompt_version()}"
+_CACHE: LLMCache | None = LLMCache(LLM_CACHE_PATH, CACHE_NAMESPACE) if LLM_CACHE_PATH else None
+
+_BACKEND: Backend | None = None
+_BACKEND_LOCK = threading.Lock()
+# Readiness for /ready: model loaded (and warmed up when EAGER_LOAD), with timings
+_READY: Dict[str, Any] = {
+    "ready": False,
+    "loading": False,
+    "load_seconds": None,
+    "warmup_seconds": None,
+    "error": None,
+}
 
-    _LLM = Llama(
-        model_path=model_path,
-        n_ctx=N_CTX,
-        n_threads=N_THREADS,
-        n_gpu_layers=N_GPU_LAYERS,
-        verbose=False,
-    )
-    return _LLM
+
+def _get_backend() -> Backend:
+    """Create and load the configured inference backend on first use."""
+    global _BACKEND
+    with _BACKEND_LOCK:
+        if _BACKEND is None:
+            backend = create_backend(
+                LLM_BACKEND,
+                _split_fallback,
+                fake={
+                    "call_latency_s": FAKE_CALL_LATENCY_MS / 1000,
+                    "row_latency_s": FAKE_ROW_LATENCY_MS / 1000,
+                },
+                llama={
+                    "repo": MODEL_REPO,
+                    "filename": MODEL_FILE,
+                    "n_ctx": N_CTX,
+                    "n_threads": _WORKERS["n_threads"],
+                    "n_gpu_layers": N_GPU_LAYERS,
+                    "prefix_messages": PREFIX_MESSAGES,
+                    "chat_turn": CHAT_TURN,
+                    "chat_stop": CHAT_STOP,
+                    "grammars": GRAMMARS_GBNF if GRAMMAR else None,
+                    "prefix_cache": PREFIX_CACHE,
+                    "use_mmap": USE_MMAP,
+                    "use_mlock": USE_MLOCK,
+                },
+            )
+            backend.usage_hook = _record_usage
+            began = time.perf_counter()
+            backend.load()
+            _READY["load_seconds"] = round(time.perf_counter() - began, 3)
+            if not _READY["loading"]:  # an eager load is ready only after its warmup
+                _READY["ready"] = True
+            _BACKEND = backend
+        return _BACKEND
+
+
+def _complete(kind: str, user_content: str, max_tokens: int) -> str:
+    """Run one completion after the ``kind`` prompt prefix on the configured backend."""
+    return _get_backend().complete(kind, user_content, max_tokens)
 
 
 def _split_fallback(text: str) -> Tuple[str, str]:
     """Simple, rules-first parser if the model returns non-JSON."""
-    s = re.sub(r"\s+", " ", (text or "")).strip().strip(",")
-    parts = [p.strip() for p in re.split(r",| at | @ ", s) if p.strip()]
-    prog = parts[0] if parts else ""
-    uni = parts[1] if len(parts) > 1 else ""
+    prog, uni = split_halves(text)
 
     # High-signal expansions
     if re.fullmatch(r"(?i)mcg(ill)?(\.)?", uni or ""):
@@ -163,12 +257,9 @@ def _split_fallback(text: str) -> Tuple[str, str]:
     return prog, uni
 
 
-def _best_match(name: str, candidates: List[str], cutoff: float = 0.86) -> str | None:
-    """Fuzzy match via difflib (lightweight, Replit-friendly)."""
-    if not name or not candidates:
-        return None
-    matches = difflib.get_close_matches(name, candidates, n=1, cutoff=cutoff)
-    return matches[0] if matches else None
+def _best_match(name: str, index: FuzzyIndex, cutoff: float = 0.86) -> str | None:
+    """Fuzzy match via a prebuilt trigram index (same results as difflib, much faster)."""
+    return index.best_match(name, cutoff=cutoff)
 
 
 def _post_normalize_program(prog: str) -> str:
@@ -177,8 +268,10 @@ def _post_normalize_program(prog: str) -> str:
     p = COMMON_PROG_FIXES.get(p, p)
     p = p.title()
     if p in CANON_PROGS:
+        _count(canon_program_exact=1)
         return p
-    match = _best_match(p, CANON_PROGS, cutoff=0.84)
+    match = _best_match(p, CANON_PROGS_INDEX, cutoff=0.84)
+    _count(**{"canon_program_fuzzy" if match else "canon_program_miss": 1})
     return match or p
 
 
@@ -201,46 +294,65 @@ def _post_normalize_university(uni: str) -> str:
 
     # Canonical or fuzzy map
     if u in CANON_UNIS:
+        _count(canon_university_exact=1)
         return u
-    match = _best_match(u, CANON_UNIS, cutoff=0.86)
+    match = _best_match(u, CANON_UNIS_INDEX, cutoff=0.86)
+    _count(**{"canon_university_fuzzy" if match else "canon_university_miss": 1})
     return match or u or "Unknown"
 
 
-def _call_llm(program_text: str) -> Dict[str, str]:
-    """Query the tiny LLM and return standardized fields."""
-    llm = _load_llm()
+def _resolve_program(prog: str) -> str | None:
+    """Map a program to the canon list by fix-up, exact or high-confidence fuzzy match."""
+    p = COMMON_PROG_FIXES.get(prog, prog)
+    if p in CANON_PROGS_SET:
+        return p
+    p = p.title()
+    if p in CANON_PROGS_SET:
+        return p
+    return _best_match(p, CANON_PROGS_INDEX, cutoff=RULES_FUZZY_CUTOFF)
 
-    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-    for x_in, x_out in FEW_SHOTS:
-        messages.append({"role": "user", "content": json.dumps(x_in, ensure_ascii=False)})
-        messages.append(
-            {
-                "role": "assistant",
-                "content": json.dumps(x_out, ensure_ascii=False),
-            }
-        )
-    messages.append(
-        {
-            "role": "user",
-            "content": json.dumps({"program": program_text}, ensure_ascii=False),
-        }
-    )
 
-    out = llm.create_chat_completion(
-        messages=messages,
-        temperature=0.0,
-        max_tokens=128,
-        top_p=1.0,
-    )
+def _resolve_university(uni: str) -> str | None:
+    """Map a university by abbreviation, fix-up, exact or high-confidence fuzzy match."""
+    for pat, full in ABBREV_UNI.items():
+        if re.fullmatch(pat, uni):
+            return full
+    u = COMMON_UNI_FIXES.get(uni, uni)
+    if u in CANON_UNIS_SET:
+        return u
+    u = re.sub(r"\bOf\b", "of", u.title())
+    if u in CANON_UNIS_SET:
+        return u
+    return _best_match(u, CANON_UNIS_INDEX, cutoff=RULES_FUZZY_CUTOFF)
+
+
+def _rules_resolve(program_text: str) -> Dict[str, str] | None:
+    """Resolve "<program>, <university>" without the LLM, or None if unsure."""
+    parts = split_pair(program_text)
+    if parts is None:
+        return None
+    prog = _resolve_program(parts[0])
+    uni = _resolve_university(parts[1]) if prog else None
+    if not uni:
+        return None
+    return {"standardized_program": prog, "standardized_university": uni}
+
 
-    text = (out["choices"][0]["message"]["content"] or "").strip()
+def _call_llm(program_text: str) -> Dict[str, str]:
+    """Query the tiny LLM and return standardized fields."""
+    text = _complete(
+        "single",
+        json.dumps({"program": program_text}, ensure_ascii=False),
+        max_tokens=MAX_TOKENS_ROW,
+    )
     try:
         match = JSON_OBJ_RE.search(text)
         obj = json.loads(match.group(0) if match else text)
         std_prog = str(obj.get("standardized_program", "")).strip()
         std_uni = str(obj.get("standardized_university", "")).strip()
-    except Exception:
+    except (ValueError, AttributeError):
         std_prog, std_uni = _split_fallback(program_text)
+        _count(fallback_rows=1)
 
     std_prog = _post_normalize_program(std_prog)
     std_uni = _post_normalize_university(std_uni)
@@ -250,6 +362,503 @@ def _call_llm(program_text: str) -> Dict[str, str]:
     }
 
 
+def _parse_batch_reply(text: str, program_texts: List[str]) -> List[Dict[str, str]]:
+    """Map a JSON-array reply back to rows, falling back per row where it is malformed."""
+    try:
+        match = JSON_ARR_RE.search(text)
+        items = json.loads(match.group(0) if match else text)
+    except ValueError:
+        items = []
+    if not isinstance(items, list) or len(items) != len(program_texts):
+        items = [None] * len(program_texts)
+
+    results = []
+    for program_text, obj in zip(program_texts, items):
+        if isinstance(obj, dict) and obj.get("standardized_program"):
+            std_prog = str(obj.get("standardized_program", "")).strip()
+            std_uni = str(obj.get("standardized_university", "")).strip()
+        else:
+            std_prog, std_uni = _split_fallback(program_text)
+            _count(fallback_rows=1)
+        results.append(
+            {
+                "standardized_program": _post_normalize_program(std_prog),
+                "standardized_university": _post_normalize_university(std_uni),
+            }
+        )
+    return results
+
+
+def _call_llm_batch(program_texts: List[str]) -> List[Dict[str, str]]:
+    """Standardize several rows with one completion that returns a JSON array."""
+    if len(program_texts) == 1:
+        return [_call_llm(program_texts[0])]
+    text = _complete(
+        "batch",
+        json.dumps([{"program": t} for t in program_texts], ensure_ascii=False),
+        max_tokens=MAX_TOKENS_BATCH_ROW * len(program_texts) + 16,
+    )
+    return _parse_batch_reply(text, program_texts)
+
+
+_COUNTS_LOCK = threading.Lock()
+_COUNTS: Dict[str, float] = {
+    "input_rows": 0,
+    "rows": 0,
+    "rules_resolved": 0,
+    "cache_resolved": 0,
+    "classifier_resolved": 0,
+    "llm_calls": 0,
+    "llm_rows": 0,
+    "llm_seconds": 0.0,
+    "llm_queued_rows": 0,
+    "prompt_tokens": 0,
+    "completion_tokens": 0,
+    "fallback_rows": 0,
+    "shed_rows": 0,
+    "late_rows": 0,
+    # Outcomes of the canonical mapping in _post_normalize_* (LLM and degraded answers)
+    "canon_program_exact": 0,
+    "canon_program_fuzzy": 0,
+    "canon_program_miss": 0,
+    "canon_university_exact": 0,
+    "canon_university_fuzzy": 0,
+    "canon_university_miss": 0,
+}
+# Per-row time to an answer, by the stage that answered it
+_ROW_LATENCY = Histogram(
+    "standardizer_row_latency_seconds",
+    "Per-row standardization latency (LLM rows: batch time divided by its rows).",
+    labelnames=("path",),
+)
+_REQUEST_LATENCY = Histogram(
+    "standardizer_request_seconds", "Latency of non-streaming /standardize requests."
+)
+# Foreground requests in flight and when the last one finished (the re-pass waits for idle)
+_FOREGROUND: Dict[str, float] = {"inflight": 0, "last": float("-inf")}
+
+
+def _count(**deltas: float) -> None:
+    """Add to the runtime counters (thread-safe)."""
+    with _COUNTS_LOCK:
+        for key, value in deltas.items():
+            _COUNTS[key] += value
+
+
+def _record_usage(prompt_tokens: int, completion_tokens: int) -> None:
+    """Backend usage hook: count prompt and completion tokens."""
+    _count(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+
+
+_CLASSIFIER_LOCK = threading.Lock()
+# The trained model, the cache size at the last (re)training, when it was last checked,
+# and whether a fit is running
+_CLASSIFIER_STATE: Dict[str, Any] = {
+    "model": None,
+    "entries": -1,
+    "checked": float("-inf"),
+    "training": False,
+}
+
+
+def _classifier_examples() -> Iterator[Tuple[str, Dict[str, str]]]:
+    """Labelled (program text, result) pairs from the cache and the CLASSIFIER_JSONL files."""
+    if _CACHE is not None:
+        yield from _CACHE.items()
+    for path in filter(None, CLASSIFIER_JSONL.split(os.pathsep)):
+        if not os.path.exists(path):
+            continue
+        try:
+            for row in iter_json_rows(path):
+                row = row or {}
+                prog = row.get("llm-generated-program")
+                uni = row.get("llm-generated-university")
+                if row.get("program") and prog and uni:
+                    yield row["program"], {
+                        "standardized_program": prog,
+                        "standardized_university": uni,
+                    }
+        except ValueError:
+            continue
+
+
+def _train_classifier() -> None:
+    """Fit a fresh classifier and swap it in once trained (runs on a background thread)."""
+    try:
+        model = DistilledStandardizer(min_confidence=CLASSIFIER_MIN_CONFIDENCE)
+        if model.train(_classifier_examples()):
+            _CLASSIFIER_STATE["model"] = model
+    finally:
+        with _CLASSIFIER_LOCK:
+            _CLASSIFIER_STATE["training"] = False
+
+
+def _maybe_retrain_classifier() -> None:
+    """Start a background fit on first use and whenever the cache has grown by >= 20%."""
+    if not CLASSIFIER:
+        return
+    now = time.monotonic()
+    with _CLASSIFIER_LOCK:
+        state = _CLASSIFIER_STATE
+        if state["training"] or now - state["checked"] < CLASSIFIER_RETRAIN_S:
+            return
+        state["checked"] = now
+        entries = _CACHE.stats()["entries"] if _CACHE is not None else 0
+        last = state["entries"]
+        if last >= 0 and entries - last < max(50, last // 5):
+            return
+        state["entries"] = entries
+        state["training"] = True
+    threading.Thread(target=_train_classifier, name="classifier-train", daemon=True).start()
+
+
+def _classify(program_text: str) -> Dict[str, str] | None:
+    """Answer from the distilled classifier when it is trained and confident."""
+    model = _CLASSIFIER_STATE["model"]
+    return model.predict(program_text) if model is not None else None
+
+
+_POOL_LOCK = threading.Lock()
+# Created on first use: "pool" (WorkerPool) or "local" (one in-process model thread);
+# in a pool worker, "n_threads" is that worker's share of N_THREADS
+_WORKERS: Dict[str, Any] = {"pool": None, "local": None, "n_threads": N_THREADS}
+
+
+def _init_worker(n_threads: int) -> None:
+    """Pool worker bootstrap: load this process's model with its share of threads."""
+    _WORKERS["n_threads"] = n_threads
+    _get_backend()
+
+
+def _worker_batch(
+    program_texts: List[str],
+) -> Tuple[List[Dict[str, str]], Dict[str, float], float]:
+    """Run one batch in a pool worker; return results, counter deltas and seconds."""
+    with _COUNTS_LOCK:
+        before = dict(_COUNTS)
+    began = time.perf_counter()
+    results = _call_llm_batch(program_texts)
+    seconds = time.perf_counter() - began
+    with _COUNTS_LOCK:
+        deltas = {k: v - before[k] for k, v in _COUNTS.items() if v != before[k]}
+    return results, deltas, seconds
+
+
+def _get_pool() -> WorkerPool:
+    """Start the model worker pool on first use; ready once every worker loaded its model."""
+    with _POOL_LOCK:
+        if _WORKERS["pool"] is None:
+            pool = WorkerPool(LLM_WORKERS, N_THREADS, _init_worker)
+            pool.start()
+            if not _READY["loading"]:  # an eager load is ready only after its warmup
+                _READY["ready"] = True
+            _WORKERS["pool"] = pool
+        return _WORKERS["pool"]
+
+
+def _submit_batch(texts: List[str]) -> Future:
+    """Schedule one batch on the worker pool, or on a single in-process model thread."""
+    if LLM_WORKERS > 1:
+        return _get_pool().submit(_worker_batch, texts)
+    with _POOL_LOCK:
+        if _WORKERS["local"] is None:
+            _WORKERS["local"] = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm")
+    return _WORKERS["local"].submit(_worker_batch, texts)
+
+
+def _cache_late(texts: List[str], future: Future) -> None:
+    """Keep the answer of a batch that finished after its budget ran out."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    results = future.result()[0]
+    _count(late_rows=len(results))
+    if _CACHE is not None:
+        _CACHE.put_many(zip(texts, results))
+
+
+def _batch_timeout(
+    rows: int, deadline: float | None, row_budget_s: float | None
+) -> float | None:
+    """Seconds to wait for a batch of ``rows``: the rows' budget, capped by the deadline."""
+    timeout = rows * row_budget_s if row_budget_s else None
+    if deadline is not None:
+        left = max(0.0, deadline - time.monotonic())
+        timeout = left if timeout is None else min(timeout, left)
+    return timeout
+
+
+def _worker_warmup(_: int) -> Tuple[float | None, float]:
+    """Warm up this process's model; return (load seconds, warmup seconds)."""
+    backend = _get_backend()
+    began = time.perf_counter()
+    backend.warmup(json.dumps(FEW_SHOTS[0][0], ensure_ascii=False))
+    return _READY["load_seconds"], time.perf_counter() - began
+
+
+def warm_up() -> None:
+    """Load the model(s) and run a warmup completion, recording timings for /ready."""
+    with _BACKEND_LOCK:
+        if _READY["loading"]:
+            return
+        _READY.update(loading=True, ready=False, error=None)
+    try:
+        if LLM_WORKERS > 1:
+            # Each worker loads its model in the pool initializer, then warms it up
+            timings = _get_pool().on_each(_worker_warmup)
+            load_s = max(t[0] or 0.0 for t in timings)
+            warm_s = max(t[1] for t in timings)
+        else:
+            load_s, warm_s = _worker_warmup(0)
+        _READY.update(ready=True, load_seconds=load_s, warmup_seconds=round(warm_s, 3))
+    except Exception as exc:  # pylint: disable=broad-except
+        _READY["error"] = repr(exc)
+    finally:
+        _READY["loading"] = False
+
+
+def start_warmup() -> None:
+    """Warm the model up on a background thread so the server answers /ready meanwhile."""
+    threading.Thread(target=warm_up, name="warmup", daemon=True).start()
+
+
+def _run_batches(
+    batches: List[List[str]],
+    deadline: float | None = None,
+    row_budget_s: float | None = None,
+) -> Iterator[Tuple[List[Dict[str, str]] | None, float]]:
+    """Yield (results, seconds) per batch, in order, in-process or sharded across workers.
+
+    With a ``deadline`` (``time.monotonic()`` value) or ``row_budget_s``, a batch
+    not done in time yields ``None`` results: queued batches are dropped, and a
+    running one finishes in the background with its answer kept in the cache.
+    """
+    if LLM_WORKERS <= 1 and deadline is None and not row_budget_s:
+        for texts in batches:
+            began = time.perf_counter()
+            results = _call_llm_batch(texts)
+            yield results, time.perf_counter() - began
+        return
+    futures = [_submit_batch(texts) for texts in batches]
+    for texts, future in zip(batches, futures):
+        try:
+            results, deltas, seconds = future.result(
+                timeout=_batch_timeout(len(texts), deadline, row_budget_s)
+            )
+        except FutureTimeout:
+            if not future.cancel():
+                future.add_done_callback(functools.partial(_cache_late, texts))
+            yield None, 0.0
+            continue
+        if LLM_WORKERS > 1:
+            _count(**deltas)  # fallbacks, tokens and canon matches counted in the worker
+        yield results, seconds
+
+
+def _degrade(program_text: str) -> Dict[str, Any]:
+    """Rules-only answer for a row that ran out of time, flagged for the re-pass."""
+    prog, uni = _split_fallback(program_text)
+    return {
+        "standardized_program": _post_normalize_program(prog),
+        "standardized_university": _post_normalize_university(uni),
+        "degraded": True,
+    }
+
+
+def _resolve_without_llm(program_text: str) -> Tuple[Dict[str, Any] | None, str]:
+    """Answer from the rules, the cache or the classifier; return (result, stage)."""
+    if RULES_FIRST:
+        resolved = _rules_resolve(program_text)
+        if resolved is not None:
+            return resolved, "rules"
+    if _CACHE is not None:
+        resolved = _CACHE.get(program_text)
+        if resolved is not None:
+            return resolved, "cache"
+    if CLASSIFIER:
+        resolved = _classify(program_text)
+        if resolved is not None:
+            return resolved, "classifier"
+    return None, "llm"
+
+
+def _standardize_many(  # pylint: disable=too-many-locals
+    program_texts: List[str],
+    batch_size: int | None = None,
+    deadline: float | None = None,
+    row_budget_s: float | None = None,
+    dedup: RequestDedup | None = None,
+) -> List[Dict[str, Any]]:
+    """Resolve by rules, the cache, then the classifier, batching the rest into LLM calls.
+
+    Only one row per distinct normalized input goes through the pipeline; its
+    answer is fanned out to the repeats (and, via ``dedup``, to later windows
+    of the same request or run). Classifier answers are not cached, so the
+    cache (its training data) only ever holds LLM outputs. Rows whose batch
+    misses ``deadline`` or ``row_budget_s`` get :func:`_degrade` results marked
+    ``"degraded": True``.
+    """
+    batch_size = max(1, batch_size or BATCH_SIZE)
+    dedup = dedup if dedup is not None else RequestDedup()
+    keys, todo = dedup.plan(program_texts)
+    results: Dict[int, Dict[str, Any]] = {}
+    pending: List[int] = []
+    _count(input_rows=len(program_texts), rows=len(todo))
+    _maybe_retrain_classifier()
+
+    for i in todo:
+        began = time.perf_counter()
+        resolved, path = _resolve_without_llm(program_texts[i])
+        if resolved is None:
+            pending.append(i)
+        else:
+            results[i] = resolved
+            _count(**{f"{path}_resolved": 1})
+            _ROW_LATENCY.observe(time.perf_counter() - began, path=path)
+
+    chunks = [pending[start : start + batch_size] for start in range(0, len(pending), batch_size)]
+    batches = [[program_texts[i] for i in chunk] for chunk in chunks]
+    queued = len(pending)
+    _count(llm_queued_rows=queued)
+    try:
+        ran = _run_batches(batches, deadline, row_budget_s)
+        for chunk, texts, (chunk_results, seconds) in zip(chunks, batches, ran):
+            queued -= len(chunk)
+            _count(llm_queued_rows=-len(chunk))
+            if chunk_results is None:
+                _count(shed_rows=len(chunk))
+                for i, program_text in zip(chunk, texts):
+                    results[i] = _degrade(program_text)
+                continue
+            _count(llm_calls=1, llm_rows=len(chunk), llm_seconds=seconds)
+            _ROW_LATENCY.observe(seconds / len(chunk), count=len(chunk), path="llm")
+            results.update(zip(chunk, chunk_results))
+            if _CACHE is not None:
+                _CACHE.put_many(zip(texts, chunk_results))
+    finally:
+        _count(llm_queued_rows=-queued)  # rows of batches never reached (on error)
+    return dedup.fan_out(keys, results)
+
+
+def _standardize(program_text: str) -> Dict[str, Any]:
+    """Standardize a single row (rules, cache, classifier, then the LLM)."""
+    return _standardize_many([program_text], batch_size=1)[0]
+
+
+def _counts() -> Dict[str, float]:
+    """Snapshot of the runtime counters."""
+    with _COUNTS_LOCK:
+        return dict(_COUNTS)
+
+
+def stats() -> Dict[str, Any]:
+    """Collect runtime counters for the /stats endpoint and CLI summary."""
+    model = _CLASSIFIER_STATE["model"]
+    repass = _get_repass() if REPASS_DB_PATH else None
+    state = {
+        "classifier": CLASSIFIER,
+        "trained_on": model.trained_on if model else 0,
+        "grammar": GRAMMAR,
+        "row_budget_ms": ROW_BUDGET_MS,
+        "deadline_s": DEADLINE_S,
+        "repass": {**repass.counts(), "failures": repass.failures} if repass else None,
+    }
+    return stats_report(_counts(), _CACHE.stats() if _CACHE is not None else None, state)
+
+
+def _metrics_text() -> str:
+    """Render counters, gauges and latency histograms in Prometheus text format."""
+    counts = _counts()
+    queues = {"llm": counts["llm_queued_rows"]}
+    if _QUEUES["jobs"] is not None:
+        queues["jobs"] = _QUEUES["jobs"].backlog()
+    if _QUEUES["repass"] is not None:
+        queues["repass"] = _QUEUES["repass"].counts()["queued"]
+        counts["repass_failures"] = _QUEUES["repass"].failures
+    return metrics_report(
+        counts,
+        _CACHE.stats() if _CACHE is not None else None,
+        queues,
+        _READY["ready"],
+        (_ROW_LATENCY, _REQUEST_LATENCY),
+    )
+
+
+def request_budget() -> Tuple[float | None, float | None]:
+    """(deadline, row budget in seconds) for a request or CLI run starting now."""
+    deadline = time.monotonic() + DEADLINE_S if DEADLINE_S > 0 else None
+    return deadline, (ROW_BUDGET_MS / 1000 if ROW_BUDGET_MS > 0 else None)
+
+
+def _model_idle() -> bool:
+    """True when no foreground rows are in flight and none finished in the last REPASS_IDLE_S."""
+    with _COUNTS_LOCK:
+        idle_for = time.monotonic() - _FOREGROUND["last"]
+        return _FOREGROUND["inflight"] == 0 and idle_for >= REPASS_IDLE_S
+
+
+_REPASS_LOCK = threading.Lock()
+# Persistent queues opened on first use: "repass" and "jobs"
+_QUEUES: Dict[str, Any] = {"repass": None, "jobs": None}
+
+
+def _get_repass() -> RepassQueue:
+    """Open the re-pass queue on first use."""
+    with _REPASS_LOCK:
+        if _QUEUES["repass"] is None:
+            _QUEUES["repass"] = RepassQueue(REPASS_DB_PATH, batch=BATCH_SIZE)
+        return _QUEUES["repass"]
+
+
+def standardize_rows(  # pylint: disable=too-many-arguments
+    rows: List[Dict[str, Any]],
+    batch_size: int | None = None,
+    deadline: float | None = None,
+    row_budget_s: float | None = None,
+    dedup: RequestDedup | None = None,
+) -> List[Dict[str, Any]]:
+    """Add the llm-generated-* fields to each row (rules, cache, classifier, then the LLM).
+
+    Repeated programs are standardized once (across calls sharing ``dedup``).
+    Rows answered by the degraded path get ``llm-degraded: true`` and are queued
+    for the background re-pass.
+    """
+    texts = [(row or {}).get("program") or "" for row in rows]
+    with _COUNTS_LOCK:
+        _FOREGROUND["inflight"] += 1
+    try:
+        results = _standardize_many(texts, batch_size, deadline, row_budget_s, dedup)
+    finally:
+        with _COUNTS_LOCK:
+            _FOREGROUND["inflight"] -= 1
+            _FOREGROUND["last"] = time.monotonic()
+    out: List[Dict[str, Any]] = []
+    degraded = []
+    for row, text, result in zip(rows, texts, results):
+        row = row or {}
+        row["llm-generated-program"] = result["standardized_program"]
+        row["llm-generated-university"] = result["standardized_university"]
+        if result.get("degraded"):
+            row["llm-degraded"] = True
+            degraded.append((row_key(row), row.get("url"), text))
+        out.append(row)
+    if degraded and REPASS_DB_PATH:
+        _get_repass().add(degraded)
+    return out
+
+
+def _repass_rows(program_texts: List[str]) -> List[Dict[str, Any]]:
+    """Re-standardize degraded rows with no budget (the cache may hold late answers)."""
+    return _standardize_many(program_texts)
+
+
+def drain_repass() -> RepassQueue:
+    """Re-standardize every queued degraded row now; return the queue for export."""
+    queue = _get_repass()
+    while queue.run_once(_repass_rows):
+        pass
+    return queue
+
+
 def _normalize_input(payload: Any) -> List[Dict[str, Any]]:
     """Accept either a list of rows or {'rows': [...]}."""
     if isinstance(payload, list):
@@ -265,97 +874,125 @@ def health() -> Any:
     return jsonify({"ok": True})
 
 
+@app.get("/ready")
+def ready() -> Any:
+    """Readiness check: 200 once the model is loaded (and warmed up), else 503."""
+    body = {"backend": LLM_BACKEND, "workers": LLM_WORKERS, "eager_load": EAGER_LOAD, **_READY}
+    return jsonify(body), (200 if _READY["ready"] else 503)
+
+
+@app.get("/metrics")
+def metrics() -> Any:
+    """Prometheus scrape endpoint."""
+    return Response(_metrics_text(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/stats")
+def runtime_stats() -> Any:
+    """Report cache, rules-first, classifier, LLM and load-shedding counters."""
+    return jsonify(stats())
+
+
 @app.post("/standardize")
 def standardize() -> Any:
-    """Standardize rows from an HTTP request and return JSON."""
+    """Standardize rows from an HTTP request and return JSON.
+
+    With ``?stream=1`` or ``Accept: application/x-ndjson`` the rows are streamed
+    back as NDJSON, one line per row, as soon as each batch finishes.
+    ``ROW_BUDGET_MS`` and ``DEADLINE_S`` bound how long rows wait for the model.
+    Repeated programs are inferred once; the distinct-to-total ratio is returned
+    under ``dedup`` (``X-Distinct-Ratio`` header when streaming).
+    """
     payload = request.get_json(force=True, silent=True)
     rows = _normalize_input(payload)
+    budget = request_budget()
+    dedup = RequestDedup()
+
+    wants_ndjson = "application/x-ndjson" in request.headers.get("Accept", "")
+    if wants_ndjson or request.args.get("stream") in ("1", "true"):
+        # One batch per worker per window, so the first lines go out after a single round
+        window = BATCH_SIZE * LLM_WORKERS
+        # Rows are streamed as they finish, so the ratio is computed up front
+        preview = RequestDedup()
+        preview.plan([(row or {}).get("program") or "" for row in rows])
+        return ndjson_response(
+            iter_windows(rows, window, lambda part: standardize_rows(part, None, *budget, dedup)),
+            headers={"X-Distinct-Ratio": str(preview.report()["distinct_ratio"])},
+        )
 
-    out: List[Dict[str, Any]] = []
-    for row in rows:
-        program_text = (row or {}).get("program") or ""
-        result = _call_llm(program_text)
-        row["llm-generated-program"] = result["standardized_program"]
-        row["llm-generated-university"] = result["standardized_university"]
-        out.append(row)
-
-    return jsonify({"rows": out})
-
+    began = time.perf_counter()
+    out = standardize_rows(rows, None, *budget, dedup=dedup)
+    _REQUEST_LATENCY.observe(time.perf_counter() - began)
+    return jsonify({"rows": out, "dedup": dedup.report()})
 
-def _cli_process_file(
-    in_path: str,
-    out_path: str | None,
-    append: bool,
-    to_stdout: bool,
-) -> None:
-    """Process a JSON file and write JSONL incrementally."""
-    with open(in_path, "r", encoding="utf-8") as f:
-        rows = _normalize_input(json.load(f))
 
-    sink = sys.stdout if to_stdout else None
-    if not to_stdout:
-        out_path = out_path or (in_path + ".jsonl")
-        mode = "a" if append else "w"
-        sink = open(out_path, mode, encoding="utf-8")
+_JOBS_LOCK = threading.Lock()
 
-    assert sink is not None  # for type-checkers
 
-    try:
-        for row in rows:
-            program_text = (row or {}).get("program") or ""
-            result = _call_llm(program_text)
-            row["llm-generated-program"] = result["standardized_program"]
-            row["llm-generated-university"] = result["standardized_university"]
-
-            json.dump(row, sink, ensure_ascii=False)
-            sink.write("\n")
-            sink.flush()
-    finally:
-        if sink is not sys.stdout:
-            sink.close()
+def _get_jobs() -> JobQueue:
+    """Open the job store and start its worker (resuming unfinished jobs) on first use."""
+    with _JOBS_LOCK:
+        if _QUEUES["jobs"] is None:
+            window = BATCH_SIZE * max(4, 2 * LLM_WORKERS)
+            jobs = JobQueue(JOBS_DB_PATH, standardize_rows, window=window)
+            jobs.start()
+            _QUEUES["jobs"] = jobs
+        return _QUEUES["jobs"]
 
 
-if __name__ == "__main__":
-    import argparse
+def start_background() -> None:
+    """Resume jobs left unfinished by a previous run and start the background re-pass."""
+    _get_jobs()
+    if REPASS_DB_PATH:
+        _get_repass().start(_repass_rows, _model_idle)
 
-    parser = argparse.ArgumentParser(
-        description="Standardize program/university with a tiny local LLM.",
-    )
-    parser.add_argument(
-        "--file",
-        help="Path to JSON input (list of rows or {'rows': [...]})",
-        default=None,
-    )
-    parser.add_argument(
-        "--serve",
-        action="store_true",
-        help="Run the HTTP server instead of CLI.",
-    )
-    parser.add_argument(
-        "--out",
-        default=None,
-        help="Output path for JSON Lines (ndjson). "
-        "Defaults to <input>.jsonl when --file is set.",
-    )
-    parser.add_argument(
-        "--append",
-        action="store_true",
-        help="Append to the output file instead of overwriting.",
-    )
-    parser.add_argument(
-        "--stdout",
-        action="store_true",
-        help="Write JSON Lines to stdout instead of a file.",
-    )
-    args = parser.parse_args()
 
-    if args.serve or args.file is None:
-        port = int(os.getenv("PORT", "8000"))
-        app.run(host="0.0.0.0", port=port, debug=False)
+@app.post("/jobs")
+def submit_job() -> Any:
+    """Queue rows (or {'path': <json file under JOBS_DIR>}) for background standardization."""
+    payload = request.get_json(force=True, silent=True)
+    if isinstance(payload, dict) and payload.get("path"):
+        path = resolve_input_path(JOBS_DIR, str(payload["path"]))
+        if path is None:
+            return jsonify({"error": "path must be inside JOBS_DIR"}), 403
+        rows: Iterable[Dict[str, Any]] = iter_json_rows(path)
     else:
-        _cli_process_file(
-            in_path=args.file,
-            out_path=args.out,
-            append=bool(args.append),
-            to_stdout=bool(args.stdout),
-        )
+        rows = _normalize_input(payload)
+    try:
+        job_id = _get_jobs().submit(rows)
+    except (OSError, ValueError) as exc:
+        return jsonify({"error": f"cannot read job input: {exc}"}), 400
+    if job_id is None:
+        return jsonify({"error": "no rows"}), 400
+    return jsonify({"job_id": job_id, "total": _get_jobs().status(job_id)["total"]}), 202
+
+
+@app.get("/jobs/<job_id>")
+def job_status(job_id: str) -> Any:
+    """Report a job's status and progress."""
+    status = _get_jobs().status(job_id)
+    if status is None:
+        return jsonify({"error": "unknown job"}), 404
+    return jsonify(status)
+
+
+@app.get("/jobs/<job_id>/results")
+def job_results(job_id: str) -> Any:
+    """Return finished rows from ?offset= (default 0), up to ?limit= (default 500)."""
+    jobs = _get_jobs()
+    status = jobs.status(job_id)
+    if status is None:
+        return jsonify({"error": "unknown job"}), 404
+    offset = max(0, request.args.get("offset", 0, type=int))
+    limit = min(5000, max(1, request.args.get("limit", 500, type=int)))
+    rows = jobs.results(job_id, offset, limit)
+    return jsonify(
+        {
+            "job_id": job_id,
+            "status": status["status"],
+            "offset": offset,
+            "next_offset": offset + len(rows),
+            "complete": status["status"] == "done" and offset + len(rows) >= status["total"],
+            "rows": rows,
+        }
+    )
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""Inference backends for the standardizer: llama.cpp, rules-only, and a deterministic fake."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+Messages = List[Dict[str, str]]
+SplitFn = Callable[[str], Tuple[str, str]]
+UsageHook = Callable[[int, int], None]
+
+
+class Backend:
+    """Turns a prompt kind ("single" or "batch") plus the row message into reply text."""
+
+    name = "base"
+    # Called with (prompt tokens, completion tokens) after each completion, if set
+    usage_hook: UsageHook | None = None
+
+    def _report_usage(self, prompt_tokens: int, completion_tokens: int) -> None:
+        """Pass one completion's token counts to :attr:`usage_hook`."""
+        if self.usage_hook is not None:
+            self.usage_hook(prompt_tokens, completion_tokens)
+
+    def load(self) -> None:
+        """Prepare resources (download/load a model); safe to call repeatedly."""
+
+    def complete(self, kind: str, user_content: str, max_tokens: int) -> str:
+        """Return the raw reply text for one prompt."""
+        raise NotImplementedError
+
+    def warmup(self, user_content: str) -> None:
+        """Run a short completion so the first real request pays no one-off setup cost."""
+        self.complete("single", user_content, max_tokens=8)
+
+
+class PromptPrefixes:
+    """Per-kind chat prefixes, rendered with a turn template, and their saved model states.
+
+    Every prompt of a kind starts with the same system/example turns; evaluating
+    them once and restoring the saved state leaves only the row's own tokens to
+    evaluate per completion.
+    """
+
+    def __init__(
+        self,
+        messages: Dict[str, Messages],
+        chat_turn: str,
+        chat_stop: List[str],
+        cache: bool = True,
+    ) -> None:
+        self.messages = messages
+        self.chat_turn = chat_turn
+        self.chat_stop = chat_stop
+        # Off: callers send the full chat every time instead of restoring states
+        self.cache = cache
+        # Per kind: (prefix tokens, model state right after evaluating them)
+        self._states: Dict[str, Tuple[List[int], Any]] = {}
+
+    def render(self, messages: Messages) -> str:
+        """Render chat messages with the turn template (no generation prompt)."""
+        return "".join(
+            self.chat_turn.format(role=m["role"], content=m["content"]) for m in messages
+        )
+
+    def reply_prompt(self, user_content: str) -> str:
+        """The user's turn followed by the opening of the assistant's turn."""
+        suffix = self.render([{"role": "user", "content": user_content}])
+        return suffix + self.chat_turn.split("{content}", 1)[0].format(role="assistant")
+
+    def state(self, llm: Any, kind: str) -> Tuple[List[int], Any]:
+        """Evaluate the ``kind`` prefix once and keep its tokens and model state for reuse."""
+        if kind not in self._states:
+            text = self.render(self.messages[kind])
+            tokens = llm.tokenize(text.encode("utf-8"), add_bos=True, special=True)
+            llm.reset()
+            llm.eval(tokens)
+            self._states[kind] = (tokens, llm.save_state())
+        return self._states[kind]
+
+
+class LlamaCppBackend(Backend):
+    """llama.cpp model with a saved prompt-prefix state and optional GBNF grammars.
+
+    ``llama_cpp`` and ``huggingface_hub`` are imported on :meth:`load`, so the
+    other backends work on machines without them.
+    """
+
+    name = "llama"
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        repo: str,
+        filename: str,
+        n_ctx: int,
+        n_threads: int,
+        n_gpu_layers: int,
+        prefix_messages: Dict[str, Messages],
+        chat_turn: str,
+        chat_stop: List[str],
+        grammars: Dict[str, str] | None,
+        prefix_cache: bool = True,
+        use_mmap: bool = True,
+        use_mlock: bool = False,
+    ) -> None:
+        self.model_file = {"repo_id": repo, "filename": filename}
+        self.llama_options = {
+            "n_ctx": n_ctx,
+            "n_threads": n_threads,
+            "n_gpu_layers": n_gpu_layers,
+            "use_mmap": use_mmap,
+            "use_mlock": use_mlock,
+        }
+        self.prefixes = PromptPrefixes(prefix_messages, chat_turn, chat_stop, cache=prefix_cache)
+        self.grammar_sources = grammars
+        self._llm: Any = None
+        # One llama.cpp context: serialize calls that restore state and evaluate tokens
+        self._lock = threading.Lock()
+        self._grammars: Dict[str, Any] = {}
+
+    def load(self) -> None:
+        """Download (or reuse) the GGUF file and initialize llama.cpp.
+
+        With ``use_mmap`` the weights are memory-mapped rather than read into
+        private memory, so a later process (e.g. the next CLI run) maps pages
+        that are still in the OS page cache; ``use_mlock`` pins them in RAM.
+        """
+        if self._llm is not None:
+            return
+        # pylint: disable=import-outside-toplevel
+        from huggingface_hub import hf_hub_download
+        from llama_cpp import Llama  # CPU-only by default if n_gpu_layers=0
+
+        model_path = hf_hub_download(
+            **self.model_file,
+            local_dir="models",
+            local_dir_use_symlinks=False,
+            force_filename=self.model_file["filename"],
+        )
+        self._llm = Llama(model_path=model_path, verbose=False, **self.llama_options)
+
+    def _grammar(self, kind: str) -> Any:
+        """Compiled GBNF grammar for ``kind`` replies, or None when grammars are off."""
+        if not self.grammar_sources:
+            return None
+        if kind not in self._grammars:
+            from llama_cpp import LlamaGrammar  # pylint: disable=import-outside-toplevel
+
+            self._grammars[kind] = LlamaGrammar.from_string(
+                self.grammar_sources[kind], verbose=False
+            )
+        return self._grammars[kind]
+
+    def warmup(self, user_content: str) -> None:
+        """Evaluate both prompt prefixes and compile the grammars, then run one completion."""
+        self.load()
+        if self.prefixes.cache:
+            with self._lock:
+                for kind in self.prefixes.messages:
+                    self.prefixes.state(self._llm, kind)
+        for kind in self.prefixes.messages:
+            self._grammar(kind)
+        super().warmup(user_content)
+
+    def complete(self, kind: str, user_content: str, max_tokens: int) -> str:
+        """Run one completion after the ``kind`` prefix and return the reply text.
+
+        With the prefix cache on, the saved prefix state is restored first, so
+        llama.cpp only evaluates this row's tokens; otherwise the full chat is
+        sent each time.
+        """
+        self.load()
+        llm = self._llm
+        with self._lock:
+            if not self.prefixes.cache:
+                messages = self.prefixes.messages[kind] + [
+                    {"role": "user", "content": user_content}
+                ]
+                out = llm.create_chat_completion(
+                    messages=messages,
+                    temperature=0.0,
+                    max_tokens=max_tokens,
+                    top_p=1.0,
+                    grammar=self._grammar(kind),
+                )
+                self._report_usage(
+                    out["usage"]["prompt_tokens"], out["usage"]["completion_tokens"]
+                )
+                return (out["choices"][0]["message"]["content"] or "").strip()
+
+            prefix_tokens, state = self.prefixes.state(llm, kind)
+            llm.load_state(state)
+            suffix = self.prefixes.reply_prompt(user_content)
+            tokens = prefix_tokens + llm.tokenize(
+                suffix.encode("utf-8"), add_bos=False, special=True
+            )
+            # generate() keeps the longest common prefix with the restored context
+            out = llm.create_completion(
+                prompt=tokens,
+                temperature=0.0,
+                max_tokens=max_tokens,
+                top_p=1.0,
+                stop=self.prefixes.chat_stop,
+                grammar=self._grammar(kind),
+            )
+        self._report_usage(out["usage"]["prompt_tokens"], out["usage"]["completion_tokens"])
+        return (out["choices"][0]["text"] or "").strip()
+
+
+class RulesBackend(Backend):
+    """No model: answers in the model's JSON format from a rules-only splitter."""
+
+    name = "rules"
+
+    def __init__(self, split: SplitFn) -> None:
+        self.split = split
+
+    def complete(self, kind: str, user_content: str, max_tokens: int) -> str:
+        """Split each requested program string and return the JSON reply."""
+        payload = json.loads(user_content)
+        items = payload if isinstance(payload, list) else [payload]
+        results = []
+        for item in items:
+            prog, uni = self.split((item or {}).get("program") or "")
+            results.append({"standardized_program": prog, "standardized_university": uni})
+        return json.dumps(results if isinstance(payload, list) else results[0], ensure_ascii=False)
+
+
+class FakeBackend(RulesBackend):
+    """Deterministic stand-in for the model, for benchmarks and load tests.
+
+    Replies like :class:`RulesBackend` after sleeping ``call_latency_s`` plus
+    ``row_latency_s`` per row. Calls are serialized like a single model
+    context, so queueing under load behaves as with llama.cpp. Token usage is
+    estimated at four characters per token.
+    """
+
+    name = "fake"
+
+    def __init__(self, split: SplitFn, call_latency_s: float = 0.05, row_latency_s: float = 0.02):
+        super().__init__(split)
+        self.call_latency_s = call_latency_s
+        self.row_latency_s = row_latency_s
+        self._lock = threading.Lock()
+
+    def complete(self, kind: str, user_content: str, max_tokens: int) -> str:
+        """Sleep for the configured latency, then reply deterministically."""
+        rows = len(json.loads(user_content)) if kind == "batch" else 1
+        with self._lock:
+            time.sleep(self.call_latency_s + self.row_latency_s * rows)
+        reply = super().complete(kind, user_content, max_tokens)
+        self._report_usage(len(user_content) // 4 + 1, len(reply) // 4 + 1)
+        return reply
+
+
+def create_backend(
+    name: str,
+    split: SplitFn,
+    *,
+    fake: Dict[str, Any] | None = None,
+    llama: Dict[str, Any] | None = None,
+) -> Backend:
+    """Build the backend selected by ``name`` ("rules", "fake" or "llama").
+
+    ``fake`` and ``llama`` are the keyword arguments of :class:`FakeBackend`
+    and :class:`LlamaCppBackend`; only the selected backend's are used.
+    """
+    if name == "rules":
+        return RulesBackend(split)
+    if name == "fake":
+        return FakeBackend(split, **(fake or {}))
+    if name == "llama":
+        return LlamaCppBackend(**(llama or {}))
+    raise ValueError(f"unknown LLM_BACKEND: {name!r}")
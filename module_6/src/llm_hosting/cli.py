@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""Command line for the standardizer: file runs, the re-pass export, and the server."""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+from typing import Any, Dict, Iterable, List
+
+import app as service
+from dedup import RequestDedup
+from row_stream import iter_json_rows, scan_completed, skip_completed
+from streaming import iter_windows, write_jsonl
+
+
+def process_file(
+    in_path: str,
+    out_path: str | None,
+    append: bool,
+    to_stdout: bool,
+    batch_size: int | None = None,
+) -> None:
+    """Process a JSON file and write JSONL incrementally, one window of rows at a time.
+
+    Input is streamed (JSON array, JSON Lines or {'rows': [...]}). With ``append``,
+    rows already present in the output (matched by URL or input hash) are skipped,
+    so an interrupted run resumes where it stopped.
+    """
+    rows: Iterable[Dict[str, Any]] = iter_json_rows(in_path)
+
+    budget = service.request_budget()
+    dedup = RequestDedup()
+    # Windows span several batches so rows resolved by rules/cache don't starve the LLM
+    # batches, and every pool worker has at least two batches to chew on
+    batch_size = max(1, batch_size or service.BATCH_SIZE)
+    window = batch_size * max(4, 2 * service.LLM_WORKERS)
+    try:
+        with contextlib.ExitStack() as stack:
+            sink = sys.stdout
+            if not to_stdout:
+                out_path = out_path or (in_path + ".jsonl")
+                if append:
+                    completed = scan_completed(out_path)
+                    print(
+                        f"resume: {sum(completed.values())} rows already in {out_path}",
+                        file=sys.stderr,
+                    )
+                    rows = skip_completed(rows, completed)
+                mode = "a" if append else "w"
+                sink = stack.enter_context(open(out_path, mode, encoding="utf-8"))
+            standardized = iter_windows(
+                rows,
+                window,
+                lambda chunk: service.standardize_rows(chunk, batch_size, *budget, dedup),
+            )
+            write_jsonl(standardized, sink, flush_every=window)
+    finally:
+        print(json.dumps({**service.stats(), "run_dedup": dedup.report()}), file=sys.stderr)
+
+
+def repass(out_path: str | None, to_stdout: bool) -> None:
+    """Re-standardize every queued degraded row now and write the corrections as JSONL.
+
+    Each correction holds the row's url, program and new llm-generated-* fields,
+    ready for ``load_data.py --updates``.
+    """
+    queue = service.drain_repass()
+    try:
+        with contextlib.ExitStack() as stack:
+            sink = sys.stdout
+            if not to_stdout:
+                sink = stack.enter_context(
+                    open(out_path or "repass.jsonl", "a", encoding="utf-8")
+                )
+            write_jsonl(queue.export(), sink, flush_every=service.BATCH_SIZE)
+    finally:
+        print(json.dumps(service.stats()), file=sys.stderr)
+
+
+def serve() -> None:
+    """Run the HTTP server, resuming unfinished jobs and the background re-pass."""
+    port = int(os.getenv("PORT", "8000"))
+    service.start_background()
+    service.app.run(host="0.0.0.0", port=port, debug=False)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command-line options for ``python cli.py``."""
+    parser = argparse.ArgumentParser(
+        description="Standardize program/university with a tiny local LLM.",
+    )
+    parser.add_argument(
+        "--file",
+        help="Path to JSON input (list of rows or {'rows': [...]})",
+        default=None,
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run the HTTP server instead of CLI.",
+    )
+    parser.add_argument(
+        "--out",
+        default=None,
+        help="Output path for JSON Lines (ndjson). "
+        "Defaults to <input>.jsonl when --file is set.",
+    )
+    parser.add_argument(
+        "--append",
+        action="store_true",
+        help="Append to the output file instead of overwriting, skipping rows it "
+        "already contains (resume an interrupted run).",
+    )
+    parser.add_argument(
+        "--stdout",
+        action="store_true",
+        help="Write JSON Lines to stdout instead of a file.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help=f"Rows per LLM prompt (default: BATCH_SIZE env or {service.BATCH_SIZE}).",
+    )
+    parser.add_argument(
+        "--row-budget-ms",
+        type=float,
+        default=None,
+        help="Max milliseconds a row may wait for the model before it is degraded "
+        "(default: ROW_BUDGET_MS env; 0 = no limit).",
+    )
+    parser.add_argument(
+        "--deadline-s",
+        type=float,
+        default=None,
+        help="Seconds after which all remaining rows are degraded "
+        "(default: DEADLINE_S env; 0 = no deadline).",
+    )
+    parser.add_argument(
+        "--repass",
+        action="store_true",
+        help="Re-standardize queued degraded rows and write the corrections as JSONL "
+        "(to --out, default repass.jsonl, or --stdout).",
+    )
+    return parser
+
+
+def main(argv: List[str] | None = None) -> None:
+    """Parse arguments and run a file, the re-pass export or the server."""
+    args = build_parser().parse_args(argv)
+    if args.row_budget_ms is not None:
+        service.ROW_BUDGET_MS = args.row_budget_ms
+    if args.deadline_s is not None:
+        service.DEADLINE_S = args.deadline_s
+
+    if service.EAGER_LOAD and not args.repass:
+        service.start_warmup()  # overlaps model load with input streaming and rules/cache lookups
+    if args.repass:
+        repass(args.out, bool(args.stdout))
+    elif args.serve or args.file is None:
+        serve()
+    else:
+        process_file(
+            in_path=args.file,
+            out_path=args.out,
+            append=bool(args.append),
+            to_stdout=bool(args.stdout),
+            batch_size=args.batch_size,
+        )
+
+
+if __name__ == "__main__":
+    main()
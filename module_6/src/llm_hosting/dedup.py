@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Collapse repeated program strings within one request or CLI run."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+from llm_cache import normalize_key
+
+
+class RequestDedup:
+    """Distinct normalized inputs seen in one request (or CLI run) and their results.
+
+    :meth:`plan` picks one representative row per new distinct input; the
+    caller standardizes only those and hands the answers to :meth:`fan_out`,
+    which fills in every row. Answers are remembered across calls, so later
+    windows of the same run reuse them too.
+    """
+
+    def __init__(self) -> None:
+        self.total = 0
+        self._seen: set = set()
+        self._results: Dict[str, Dict[str, Any]] = {}
+
+    def plan(self, texts: List[str]) -> Tuple[List[str], List[int]]:
+        """Return each row's key and the indexes of the rows that still need an answer."""
+        keys = [normalize_key(t) for t in texts]
+        self.total += len(keys)
+        self._seen.update(keys)
+        todo: List[int] = []
+        claimed: set = set()
+        for i, key in enumerate(keys):
+            if key not in self._results and key not in claimed:
+                claimed.add(key)
+                todo.append(i)
+        return keys, todo
+
+    def fan_out(
+        self, keys: List[str], answers: Dict[int, Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Results for every row from the representatives' ``answers`` (by row index).
+
+        Degraded answers are shared within the call but not remembered, so a
+        later window can still get a full answer for the same input.
+        """
+        fresh: Dict[str, Dict[str, Any]] = {}
+        for i, result in answers.items():
+            fresh[keys[i]] = result
+            if not result.get("degraded"):
+                self._results[keys[i]] = result
+        return [fresh.get(key) or self._results[key] for key in keys]
+
+    def report(self) -> Dict[str, Any]:
+        """Total rows, distinct inputs and their ratio so far."""
+        distinct = len(self._seen)
+        return {
+            "total": self.total,
+            "distinct": distinct,
+            "distinct_ratio": round(distinct / self.total, 4) if self.total else 1.0,
+        }
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""Character-trigram index for fast fuzzy matching against the canonical lists."""
+
+from __future__ import annotations
+
+import difflib
+from collections import Counter
+from typing import Dict, Iterable, List, Set
+
+
+def _ngrams(text: str, size: int) -> Set[str]:
+    """Lowercased, space-padded character n-grams of ``text``."""
+    padded = f"  {text.lower()} "
+    return {padded[i : i + size] for i in range(len(padded) - size + 1)}
+
+
+class FuzzyIndex:
+    """Drop-in replacement for ``difflib.get_close_matches(name, candidates, n=1)``.
+
+    An inverted index from character trigrams to candidates picks the few
+    candidates sharing the most trigrams with the query; only those are scored
+    with ``SequenceMatcher``, using the same cutoff checks and tie-break as
+    difflib. Very short queries fall back to a full difflib scan.
+    """
+
+    def __init__(self, candidates: Iterable[str], ngram: int = 3, max_candidates: int = 24) -> None:
+        self.candidates: List[str] = list(dict.fromkeys(candidates))
+        self.ngram = ngram
+        self.max_candidates = max_candidates
+        self._exact = frozenset(self.candidates)
+        self._gram_counts: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+        self._common_limit = max(8, len(self.candidates) // 8)
+        for idx, candidate in enumerate(self.candidates):
+            grams = _ngrams(candidate, ngram)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(idx)
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def best_match(self, name: str, cutoff: float = 0.86) -> str | None:
+        """Return the closest candidate with similarity ratio >= ``cutoff``, or None."""
+        if not name or not self.candidates:
+            return None
+        if name in self._exact:
+            return name
+        if len(name) < self.ngram:
+            matches = difflib.get_close_matches(name, self.candidates, n=1, cutoff=cutoff)
+            return matches[0] if matches else None
+
+        # Grams shared by most candidates ("uni", "ity", ...) barely discriminate; skip them
+        grams = _ngrams(name, self.ngram)
+        shared: Counter = Counter()
+        for gram in grams:
+            postings = self._postings.get(gram, ())
+            if len(postings) <= self._common_limit:
+                shared.update(postings)
+        if not shared:
+            for gram in grams:
+                shared.update(self._postings.get(gram, ()))
+
+        # Shortlist by shared trigrams, then rank by Dice coefficient and keep the best few
+        shortlist = [idx for idx, _ in shared.most_common(4 * self.max_candidates)]
+        ranked = sorted(
+            shortlist,
+            key=lambda idx: 2 * shared[idx] / (len(grams) + self._gram_counts[idx]),
+            reverse=True,
+        )[: self.max_candidates]
+
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(name)
+        best: tuple[float, str] | None = None
+        for idx in ranked:
+            candidate = self.candidates[idx]
+            matcher.set_seq1(candidate)
+            if (
+                matcher.real_quick_ratio() >= cutoff
+                and matcher.quick_ratio() >= cutoff
+                and matcher.ratio() >= cutoff
+            ):
+                scored = (matcher.ratio(), candidate)
+                if best is None or scored > best:
+                    best = scored
+        return best[1] if best else None
+
+
+def _perturb(text: str, seed: int) -> str:
+    """Deterministic typo: drop, double, swap or recase one character."""
+    if len(text) < 4:
+        return text.lower()
+    pos = 1 + seed % (len(text) - 2)
+    kind = seed % 4
+    if kind == 0:
+        return text[:pos] + text[pos + 1 :]
+    if kind == 1:
+        return text[:pos] + text[pos] + text[pos:]
+    if kind == 2:
+        return text[: pos - 1] + text[pos] + text[pos - 1] + text[pos + 1 :]
+    return text.lower()
+
+
+def benchmark(candidates: List[str], cutoff: float = 0.86, queries: int = 500) -> Dict[str, float]:
+    """Compare latency and agreement of :class:`FuzzyIndex` against difflib."""
+    import time  # pylint: disable=import-outside-toplevel
+
+    index = FuzzyIndex(candidates)
+    sample = [_perturb(candidates[i % len(candidates)], i * 7) for i in range(queries)]
+
+    start = time.perf_counter()
+    expected = [difflib.get_close_matches(q, candidates, n=1, cutoff=cutoff) for q in sample]
+    difflib_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    got = [index.best_match(q, cutoff=cutoff) for q in sample]
+    index_s = time.perf_counter() - start
+
+    agree = sum((e[0] if e else None) == g for e, g in zip(expected, got))
+    return {
+        "candidates": len(candidates),
+        "queries": queries,
+        "difflib_ms_per_query": round(1000 * difflib_s / queries, 4),
+        "index_ms_per_query": round(1000 * index_s / queries, 4),
+        "agreement": round(agree / queries, 4),
+    }
+
+
+if __name__ == "__main__":
+    import json
+    import os
+
+    for path, cut in (("canon_universities.txt", 0.86), ("canon_programs.txt", 0.84)):
+        with open(os.path.join(os.path.dirname(__file__) or ".", path), encoding="utf-8") as f:
+            names = [ln.strip() for ln in f if ln.strip()]
+        print(path, json.dumps(benchmark(names, cutoff=cut)))
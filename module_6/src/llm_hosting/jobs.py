@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""SQLite-persisted background job queue for large standardization requests."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_rows (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    row TEXT NOT NULL,
+    result TEXT,
+    PRIMARY KEY (job_id, idx)
+);
+"""
+
+
+def resolve_input_path(base_dir: str, path: str) -> str | None:
+    """Resolve a job input ``path`` against ``base_dir``; None if it escapes it (or no base)."""
+    if not base_dir:
+        return None
+    base = os.path.realpath(base_dir)
+    target = os.path.realpath(os.path.join(base, path))
+    return target if os.path.commonpath([base, target]) == base else None
+
+
+class JobQueue:
+    """Persistent job queue drained by one background thread.
+
+    Rows are stored when a job is submitted and each result is written as soon
+    as its window finishes, so after a restart :meth:`start` resumes queued and
+    running jobs from the first unprocessed row.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        process: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+        window: int = 64,
+    ) -> None:
+        self.path = path
+        self.process = process
+        self.window = window
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Run a statement under the lock and commit."""
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            self._conn.commit()
+            return rows
+
+    def submit(self, rows: Iterable[Dict[str, Any]]) -> str | None:
+        """Persist a new job and wake the worker; return the job id, or None if no rows.
+
+        ``rows`` may be a stream; it is consumed inside one transaction, so a read
+        error while streaming leaves no partial job behind.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        total = 0
+
+        def numbered() -> Iterable[tuple]:
+            nonlocal total
+            for total, row in enumerate(rows, start=1):
+                yield (job_id, total - 1, json.dumps(row, ensure_ascii=False))
+
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT INTO jobs (id, status, total, created_at, updated_at) "
+                    "VALUES (?, 'queued', 0, ?, ?)",
+                    (job_id, now, now),
+                )
+                self._conn.executemany(
+                    "INSERT INTO job_rows (job_id, idx, row) VALUES (?, ?, ?)", numbered()
+                )
+                if not total:
+                    self._conn.rollback()
+                    return None
+                self._conn.execute("UPDATE jobs SET total = ? WHERE id = ?", (total, job_id))
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        self.start()
+        self._wake.set()
+        return job_id
+
+    def status(self, job_id: str) -> Dict[str, Any] | None:
+        """Return status and progress for a job, or None if unknown."""
+        found = self._query(
+            "SELECT status, total, done, error, created_at, updated_at FROM jobs WHERE id = ?",
+            (job_id,),
+        )
+        if not found:
+            return None
+        status, total, done, error, created_at, updated_at = found[0]
+        return {
+            "job_id": job_id,
+            "status": status,
+            "total": total,
+            "done": done,
+            "progress": round(done / total, 4) if total else 1.0,
+            "error": error,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+
+    def results(self, job_id: str, offset: int = 0, limit: int = 500) -> List[Dict[str, Any]]:
+        """Return finished rows from ``offset`` in input order, stopping at the first gap."""
+        found = self._query(
+            "SELECT idx, result FROM job_rows WHERE job_id = ? AND idx >= ? ORDER BY idx LIMIT ?",
+            (job_id, offset, limit),
+        )
+        out = []
+        for expected, (idx, result) in enumerate(found, start=offset):
+            if idx != expected or result is None:
+                break
+            out.append(json.loads(result))
+        return out
+
+    def backlog(self) -> int:
+        """Rows of queued and running jobs still waiting to be processed."""
+        found = self._query(
+            "SELECT COALESCE(SUM(total - done), 0) FROM jobs WHERE status IN ('queued', 'running')"
+        )
+        return int(found[0][0])
+
+    def start(self) -> None:
+        """Start the background worker (idempotent); it resumes unfinished jobs."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="job-queue", daemon=True)
+            self._thread.start()
+
+    def _next_job(self) -> str | None:
+        """Oldest job that is queued or was running when the process stopped."""
+        found = self._query(
+            "SELECT id FROM jobs WHERE status IN ('queued', 'running') "
+            "ORDER BY created_at LIMIT 1"
+        )
+        return found[0][0] if found else None
+
+    def _run(self) -> None:
+        """Worker loop: drain jobs, then sleep until a new one is submitted."""
+        while True:
+            job_id = self._next_job()
+            if job_id is None:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            try:
+                self._run_job(job_id)
+            except Exception as exc:  # pylint: disable=broad-except
+                self._query(
+                    "UPDATE jobs SET status = 'failed', error = ?, updated_at = ? WHERE id = ?",
+                    (repr(exc), time.time(), job_id),
+                )
+
+    def _run_job(self, job_id: str) -> None:
+        """Process a job's remaining rows window by window, persisting each window."""
+        self._query(
+            "UPDATE jobs SET status = 'running', updated_at = ? WHERE id = ?",
+            (time.time(), job_id),
+        )
+        while True:
+            pending = self._query(
+                "SELECT idx, row FROM job_rows WHERE job_id = ? AND result IS NULL "
+                "ORDER BY idx LIMIT ?",
+                (job_id, self.window),
+            )
+            if not pending:
+                break
+            outputs = self.process([json.loads(row) for _, row in pending])
+            with self._lock:
+                self._conn.executemany(
+                    "UPDATE job_rows SET result = ? WHERE job_id = ? AND idx = ?",
+                    (
+                        (json.dumps(out, ensure_ascii=False), job_id, idx)
+                        for (idx, _), out in zip(pending, outputs)
+                    ),
+                )
+                self._conn.execute(
+                    "UPDATE jobs SET done = done + ?, updated_at = ? WHERE id = ?",
+                    (len(pending), time.time(), job_id),
+                )
+                self._conn.commit()
+        self._query(
+            "UPDATE jobs SET status = 'done', updated_at = ? WHERE id = ?", (time.time(), job_id)
+        )
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""Persistent SQLite memo of standardized results, keyed by normalized input text."""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+from typing import Dict, Iterable, Iterator, Tuple
+
+
+def normalize_key(text: str) -> str:
+    """Collapse whitespace, trim stray commas and casefold the input text."""
+    return re.sub(r"\s+", " ", text or "").strip().strip(",").strip().casefold()
+
+
+class LLMCache:
+    """On-disk cache of ``_call_llm`` results with hit/miss counters.
+
+    Entries are scoped by ``namespace`` (model + prompt version), so changing
+    the model or prompt never serves stale results. A single connection is
+    shared behind a lock so the Flask server can use it from worker threads.
+    """
+
+    def __init__(self, path: str, namespace: str) -> None:
+        self.path = path
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " namespace TEXT NOT NULL,"
+            " input_key TEXT NOT NULL,"
+            " result TEXT NOT NULL,"
+            " PRIMARY KEY (namespace, input_key))"
+        )
+        self._conn.commit()
+
+    def get(self, text: str) -> Dict[str, str] | None:
+        """Return the cached result for ``text`` or None, updating counters."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM llm_cache WHERE namespace = ? AND input_key = ?",
+                (self.namespace, normalize_key(text)),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, text: str, result: Dict[str, str]) -> None:
+        """Store ``result`` for ``text`` under the current namespace."""
+        self.put_many([(text, result)])
+
+    def put_many(self, pairs: Iterable[Tuple[str, Dict[str, str]]]) -> None:
+        """Store several (text, result) pairs, e.g. one LLM batch, in a single transaction."""
+        rows = [
+            (self.namespace, normalize_key(text), json.dumps(result, ensure_ascii=False))
+            for text, result in pairs
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO llm_cache (namespace, input_key, result) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, str]]]:
+        """Yield (normalized input, result) pairs stored under the current namespace."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT input_key, result FROM llm_cache WHERE namespace = ?", (self.namespace,)
+            ).fetchall()
+        for key, result in rows:
+            yield key, json.loads(result)
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters, hit rate and number of stored entries."""
+        with self._lock:
+            size = self._conn.execute(
+                "SELECT COUNT(*) FROM llm_cache WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": size,
+        }
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""Character n-gram naive Bayes classifiers distilled from past LLM outputs.
+
+Requires NumPy; the standardizer disables the classifier when it is missing.
+"""
+
+from __future__ import annotations
+
+import functools
+import zlib
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from program_parts import split_pair
+
+
+@functools.lru_cache(maxsize=1 << 17)
+def _gram_id(gram: str, dim: int) -> int:
+    """Stable hash bucket of an n-gram (cached; the same grams recur constantly)."""
+    return zlib.crc32(gram.encode("utf-8")) % dim
+
+
+def featurize(
+    text: str, dim: int, sizes: Sequence[int] = (2, 3, 4)
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Hashed character n-gram ids and counts of ``text`` (lowercased, space-padded)."""
+    padded = f" {text.lower()} "
+    ids = [_gram_id(padded[i : i + n], dim) for n in sizes for i in range(len(padded) - n + 1)]
+    if not ids:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    uniq, counts = np.unique(np.asarray(ids, dtype=np.int64), return_counts=True)
+    return uniq, counts.astype(np.float32)
+
+
+class NgramNB:
+    """Multinomial naive Bayes over hashed char n-grams with temperature calibration."""
+
+    def __init__(self, dim: int = 1 << 12, alpha: float = 0.1) -> None:
+        self.dim = dim
+        self.alpha = alpha
+        self.classes: List[str] = []
+        self.temperature = 1.0
+        self._log_prior = np.zeros(0, dtype=np.float32)
+        # Stored (dim, classes) so a row's n-grams gather contiguous rows
+        self._log_prob = np.zeros((dim, 0), dtype=np.float32)
+
+    def fit(self, texts: Sequence[str], labels: Sequence[str]) -> "NgramNB":
+        """Fit class priors and n-gram likelihoods."""
+        self.classes = sorted(set(labels))
+        index = {label: i for i, label in enumerate(self.classes)}
+        counts = np.zeros((len(self.classes), self.dim), dtype=np.float64)
+        prior = np.zeros(len(self.classes), dtype=np.float64)
+        for text, label in zip(texts, labels):
+            row = index[label]
+            ids, cnt = featurize(text, self.dim)
+            np.add.at(counts[row], ids, cnt)
+            prior[row] += 1
+        smoothed = counts + self.alpha
+        log_prob = np.log(smoothed / smoothed.sum(axis=1, keepdims=True))
+        self._log_prob = np.ascontiguousarray(log_prob.T, dtype=np.float32)
+        self._log_prior = np.log(prior / prior.sum()).astype(np.float32)
+        return self
+
+    def _scores(self, text: str) -> np.ndarray:
+        """Unnormalized log-posterior per class."""
+        ids, cnt = featurize(text, self.dim)
+        return self._log_prior + cnt @ self._log_prob[ids]
+
+    def _proba(self, scores: np.ndarray, temperature: float) -> np.ndarray:
+        """Temperature-scaled softmax."""
+        z = scores / temperature
+        z = np.exp(z - z.max())
+        return z / z.sum()
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """Most likely label and its calibrated probability."""
+        proba = self._proba(self._scores(text), self.temperature)
+        best = int(proba.argmax())
+        return self.classes[best], float(proba[best])
+
+    def calibrate(self, texts: Sequence[str], labels: Sequence[str]) -> float:
+        """Pick the softmax temperature minimizing held-out negative log-likelihood."""
+        index = {label: i for i, label in enumerate(self.classes)}
+        held_out = [(self._scores(t), index[y]) for t, y in zip(texts, labels) if y in index]
+        if not held_out:
+            return self.temperature
+        best_t, best_nll = self.temperature, float("inf")
+        for temperature in np.geomspace(0.25, 256.0, 41):
+            nll = -sum(
+                np.log(self._proba(scores, temperature)[target] + 1e-12)
+                for scores, target in held_out
+            )
+            if nll < best_nll:
+                best_t, best_nll = float(temperature), nll
+        self.temperature = best_t
+        return best_t
+
+
+class DistilledStandardizer:
+    """Program and university classifiers trained on (input, LLM output) pairs.
+
+    :meth:`predict` answers only when both halves clear ``min_confidence``;
+    everything else is left to the LLM.
+    """
+
+    def __init__(self, min_confidence: float = 0.95, min_examples: int = 50) -> None:
+        self.min_confidence = min_confidence
+        self.min_examples = min_examples
+        self.program = NgramNB()
+        self.university = NgramNB()
+        self.trained_on = 0
+
+    @property
+    def ready(self) -> bool:
+        """True once a model has been trained."""
+        return self.trained_on > 0
+
+    def train(  # pylint: disable=too-many-locals
+        self, examples: Iterable[Tuple[str, Dict[str, str]]]
+    ) -> bool:
+        """Train on (program text, standardized result) pairs; False if too few usable pairs."""
+        rows = []
+        for text, result in examples:
+            parts = split_pair(text)
+            prog = (result or {}).get("standardized_program")
+            uni = (result or {}).get("standardized_university")
+            if parts and prog and uni and uni != "Unknown":
+                rows.append((parts[0], parts[1], prog, uni))
+        if len(rows) < self.min_examples:
+            return False
+
+        # Fit on 80% to calibrate temperatures on the rest, then refit on everything
+        order = np.random.default_rng(0).permutation(len(rows))
+        cut = max(1, int(len(rows) * 0.8))
+        fit_rows = [rows[i] for i in order[:cut]]
+        cal_rows = [rows[i] for i in order[cut:]]
+        program, university = NgramNB(), NgramNB()
+        for model, col in ((program, 0), (university, 1)):
+            model.fit([r[col] for r in fit_rows], [r[col + 2] for r in fit_rows])
+            temperature = model.calibrate(
+                [r[col] for r in cal_rows], [r[col + 2] for r in cal_rows]
+            )
+            model.fit([r[col] for r in rows], [r[col + 2] for r in rows])
+            model.temperature = temperature
+
+        self.program, self.university = program, university
+        self.trained_on = len(rows)
+        return True
+
+    def predict(self, program_text: str) -> Dict[str, str] | None:
+        """Standardized fields when both classifiers are confident, else None."""
+        if not self.ready:
+            return None
+        parts = split_pair(program_text)
+        if parts is None:
+            return None
+        prog, prog_conf = self.program.predict(parts[0])
+        if prog_conf < self.min_confidence:
+            return None
+        uni, uni_conf = self.university.predict(parts[1])
+        if uni_conf < self.min_confidence:
+            return None
+        return {"standardized_program": prog, "standardized_university": uni}
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""Split raw "<program>, <university>" strings the same way everywhere."""
+
+from __future__ import annotations
+
+import re
+from typing import List, Tuple
+
+SPLIT_RE = re.compile(r",| at | @ ")
+
+
+def split_parts(program_text: str) -> List[str]:
+    """Non-empty parts of a whitespace-normalized string, split on ",", " at " and " @ "."""
+    s = re.sub(r"\s+", " ", program_text or "").strip().strip(",")
+    return [p.strip() for p in SPLIT_RE.split(s) if p.strip()]
+
+
+def split_pair(program_text: str) -> Tuple[str, str] | None:
+    """(program, university) when the string has exactly two parts, else None."""
+    parts = split_parts(program_text)
+    return (parts[0], parts[1]) if len(parts) == 2 else None
+
+
+def split_halves(program_text: str) -> Tuple[str, str]:
+    """The first two parts as (program, university); a missing part is ""."""
+    parts = split_parts(program_text) + ["", ""]
+    return parts[0], parts[1]
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Prompt text, few-shots, chat turn format and output grammars for the standardizer."""
+
+from __future__ import annotations
+
+import json
+from typing import Dict, List, Tuple
+
+# TinyLlama-Chat (Zephyr) turn format used by the llama.cpp backend with the prefix cache
+CHAT_TURN = "<|{role}|>\n{content}</s>\n"
+CHAT_STOP = ["</s>"]
+
+# GBNF grammars that only admit the result JSON (one object, or an array of them)
+RESULT_GBNF = r"""
+obj    ::= (
+  "{" ws "\"standardized_program\"" ws ":" ws string ws ","
+  ws "\"standardized_university\"" ws ":" ws string ws "}"
+)
+string ::= "\"" char* "\""
+char   ::= [^"\\\x00-\x1f]
+ws     ::= [ ]?
+"""
+GRAMMARS_GBNF = {
+    "single": "root ::= obj\n" + RESULT_GBNF,
+    "batch": 'root ::= "[" ws obj (ws "," ws obj)* ws "]"\n' + RESULT_GBNF,
+}
+
+SYSTEM_PROMPT = (
+    "You are a data cleaning assistant. Standardize degree program and university "
+    "names.\n\n"
+    "Rules:\n"
+    "- Input provides a single string under key `program` that may contain both "
+    "program and university.\n"
+    "- Split into (program name, university name).\n"
+    "- Trim extra spaces and commas.\n"
+    '- Expand obvious abbreviations (e.g., "McG" -> "McGill University", '
+    '"UBC" -> "University of British Columbia").\n'
+    "- Use Title Case for program; use official capitalization for university "
+    'names (e.g., "University of X").\n'
+    '- Ensure correct spelling (e.g., "McGill", not "McGiill").\n'
+    '- If university cannot be inferred, return "Unknown".\n\n'
+    "Return JSON ONLY with keys:\n"
+    "  standardized_program, standardized_university\n"
+)
+
+FEW_SHOTS: List[Tuple[Dict[str, str], Dict[str, str]]] = [
+    (
+        {"program": "Information Studies, McGill University"},
+        {
+            "standardized_program": "Information Studies",
+            "standardized_university": "McGill University",
+        },
+    ),
+    (
+        {"program": "Information, McG"},
+        {
+            "standardized_program": "Information Studies",
+            "standardized_university": "McGill University",
+        },
+    ),
+    (
+        {"program": "Mathematics, University Of British Columbia"},
+        {
+            "standardized_program": "Mathematics",
+            "standardized_university": "University of British Columbia",
+        },
+    ),
+]
+
+BATCH_SYSTEM_PROMPT = SYSTEM_PROMPT + (
+    "\nBatches: the input may be a JSON array of such objects. Then return a JSON "
+    "array ONLY, with exactly one result object per input, in the same order.\n"
+)
+
+# Fixed conversation prefixes (system prompt + few-shots) shared by every call
+PREFIX_MESSAGES: Dict[str, List[Dict[str, str]]] = {
+    "single": [{"role": "system", "content": SYSTEM_PROMPT}]
+    + [
+        msg
+        for x_in, x_out in FEW_SHOTS
+        for msg in (
+            {"role": "user", "content": json.dumps(x_in, ensure_ascii=False)},
+            {"role": "assistant", "content": json.dumps(x_out, ensure_ascii=False)},
+        )
+    ],
+    "batch": [
+        {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+        {"role": "user", "content": json.dumps([x for x, _ in FEW_SHOTS], ensure_ascii=False)},
+        {"role": "assistant", "content": json.dumps([y for _, y in FEW_SHOTS], ensure_ascii=False)},
+    ],
+}
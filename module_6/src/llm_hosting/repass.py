@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""SQLite-persisted queue of degraded rows awaiting a low-priority LLM re-pass."""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repass_rows (
+    row_key TEXT PRIMARY KEY,
+    url TEXT,
+    program TEXT NOT NULL,
+    queued_at REAL NOT NULL,
+    result TEXT,
+    exported INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class RepassQueue:
+    """Rows answered by the degraded path, re-standardized later when the model is idle.
+
+    :meth:`start` runs a background thread that processes one small batch at a
+    time, and only while ``is_idle()`` is true, so foreground requests keep
+    priority. Finished rows are kept until :meth:`export` hands them out as
+    corrections (url, program and the new llm-generated-* fields). Failed
+    background batches are logged and counted in :attr:`failures`.
+    """
+
+    def __init__(self, path: str, batch: int = 8, poll_s: float = 1.0) -> None:
+        self.path = path
+        self.batch = batch
+        self.poll_s = poll_s
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Run a statement under the lock and commit."""
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            self._conn.commit()
+            return rows
+
+    def add(self, rows: List[Tuple[str, str | None, str]]) -> None:
+        """Queue (row key, url, program text) triples; re-queuing a key resets its result."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO repass_rows (row_key, url, program, queued_at) "
+                "VALUES (?, ?, ?, ?)",
+                ((key, url, program, now) for key, url, program in rows),
+            )
+            self._conn.commit()
+
+    def pending(self, limit: int) -> List[Tuple[str, str]]:
+        """Oldest queued (row key, program text) pairs without a result yet."""
+        return self._query(
+            "SELECT row_key, program FROM repass_rows WHERE result IS NULL "
+            "ORDER BY queued_at LIMIT ?",
+            (limit,),
+        )
+
+    def complete(self, results: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Store the re-pass result for each row key."""
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE repass_rows SET result = ? WHERE row_key = ?",
+                ((json.dumps(result, ensure_ascii=False), key) for key, result in results),
+            )
+            self._conn.commit()
+
+    def run_once(self, process: Callable[[List[str]], List[Dict[str, Any]]]) -> int:
+        """Re-standardize one batch of pending rows; return how many were processed."""
+        pending = self.pending(self.batch)
+        if pending:
+            outputs = process([program for _, program in pending])
+            self.complete([(key, out) for (key, _), out in zip(pending, outputs)])
+        return len(pending)
+
+    def export(self) -> Iterator[Dict[str, Any]]:
+        """Yield finished rows not exported before as corrections, then mark them exported."""
+        found = self._query(
+            "SELECT row_key, url, program, result FROM repass_rows "
+            "WHERE result IS NOT NULL AND exported = 0 ORDER BY queued_at"
+        )
+        for _, url, program, result in found:
+            out = json.loads(result)
+            yield {
+                "url": url,
+                "program": program,
+                "llm-generated-program": out["standardized_program"],
+                "llm-generated-university": out["standardized_university"],
+            }
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE repass_rows SET exported = 1 WHERE row_key = ?",
+                ((key,) for key, *_ in found),
+            )
+            self._conn.commit()
+
+    def counts(self) -> Dict[str, int]:
+        """Numbers of queued, re-standardized and exported rows."""
+        queued, done, exported = self._query(
+            "SELECT COUNT(*), COUNT(result), COALESCE(SUM(exported), 0) FROM repass_rows"
+        )[0]
+        return {"queued": queued - done, "done": done, "exported": exported}
+
+    def start(
+        self,
+        process: Callable[[List[str]], List[Dict[str, Any]]],
+        is_idle: Callable[[], bool],
+    ) -> None:
+        """Start the background re-pass thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, args=(process, is_idle), name="repass", daemon=True
+            )
+            self._thread.start()
+
+    def _run(
+        self,
+        process: Callable[[List[str]], List[Dict[str, Any]]],
+        is_idle: Callable[[], bool],
+    ) -> None:
+        """Worker loop: process a batch whenever the model is idle, else wait and retry."""
+        while True:
+            try:
+                if is_idle() and self.run_once(process):
+                    continue
+            except Exception:  # pylint: disable=broad-except
+                # The rows stay queued and are retried on the next poll
+                self.failures += 1
+                logger.exception("Re-pass batch failed (%d so far)", self.failures)
+            time.sleep(self.poll_s)
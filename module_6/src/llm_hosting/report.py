@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""Runtime counters rendered for /stats (JSON) and /metrics (Prometheus text)."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List
+
+from metrics import Histogram, family
+
+Counts = Dict[str, float]
+
+_EMPTY_CACHE = {"hits": 0, "misses": 0, "hit_rate": 0.0}
+
+
+def _ratio(part: float, whole: float) -> float:
+    """part / whole, or 0 when there is nothing to divide."""
+    return part / whole if whole else 0.0
+
+
+def stats_report(
+    counts: Counts, cache: Dict[str, Any] | None, state: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Summarize a snapshot of the counters for the /stats endpoint and CLI summary.
+
+    ``state`` carries the settings and side stores reported alongside them:
+    ``classifier`` (enabled), ``trained_on``, ``grammar``, ``row_budget_ms``,
+    ``deadline_s`` and ``repass`` (queue counts, or None when disabled).
+    """
+    avg_llm = counts["llm_seconds"] / counts["llm_rows"] if counts["llm_rows"] else None
+    return {
+        "cache": cache,
+        # Rows collapsed onto an identical input earlier in the same request or run
+        "dedup": {
+            "input_rows": counts["input_rows"],
+            "distinct_rows": counts["rows"],
+            "distinct_ratio": (
+                round(counts["rows"] / counts["input_rows"], 4) if counts["input_rows"] else 1.0
+            ),
+        },
+        "rules": {
+            "rows": counts["rows"],
+            "resolved": counts["rules_resolved"],
+            "skip_fraction": (
+                round(counts["rules_resolved"] / counts["rows"], 4) if counts["rows"] else 0.0
+            ),
+            # Estimated from the mean per-row LLM latency observed in this process
+            "latency_saved_s": (
+                round(counts["rules_resolved"] * avg_llm, 3) if avg_llm is not None else None
+            ),
+        },
+        "classifier": {
+            "enabled": state["classifier"],
+            "trained_on": state["trained_on"],
+            "resolved": counts["classifier_resolved"],
+            "resolve_fraction": (
+                round(counts["classifier_resolved"] / counts["rows"], 4) if counts["rows"] else 0.0
+            ),
+        },
+        "llm": {
+            "calls": counts["llm_calls"],
+            "rows": counts["llm_rows"],
+            "seconds": round(counts["llm_seconds"], 3),
+            "prompt_tokens": counts["prompt_tokens"],
+            "completion_tokens": counts["completion_tokens"],
+            "tokens_per_s": (
+                round(counts["completion_tokens"] / counts["llm_seconds"], 2)
+                if counts["llm_seconds"]
+                else None
+            ),
+            "grammar": state["grammar"],
+            "fallback_rows": counts["fallback_rows"],
+            "fallback_rate": round(_ratio(counts["fallback_rows"], counts["llm_rows"]), 4),
+        },
+        "shedding": {
+            "row_budget_ms": state["row_budget_ms"],
+            "deadline_s": state["deadline_s"],
+            "shed_rows": counts["shed_rows"],
+            "late_rows": counts["late_rows"],
+            "repass": state["repass"],
+        },
+    }
+
+
+def metrics_report(
+    counts: Counts,
+    cache: Dict[str, Any] | None,
+    queues: Dict[str, float],
+    ready: bool,
+    histograms: Iterable[Histogram],
+) -> str:
+    """Render counters, gauges and latency histograms in Prometheus text format.
+
+    ``queues`` maps a queue name to the rows waiting in it.
+    """
+    c = counts
+    cache = cache or _EMPTY_CACHE
+    lines = family(
+        "standardizer_rows_total",
+        "counter",
+        "Input rows by the stage that answered them.",
+        [
+            ({"path": "duplicate"}, c["input_rows"] - c["rows"]),
+            ({"path": "rules"}, c["rules_resolved"]),
+            ({"path": "cache"}, c["cache_resolved"]),
+            ({"path": "classifier"}, c["classifier_resolved"]),
+            ({"path": "llm"}, c["llm_rows"]),
+            ({"path": "degraded"}, c["shed_rows"]),
+        ],
+    )
+    lines += family(
+        "standardizer_cache_lookups_total",
+        "counter",
+        "Result cache lookups.",
+        [({"result": "hit"}, cache["hits"]), ({"result": "miss"}, cache["misses"])],
+    )
+    lines += family(
+        "standardizer_cache_hit_ratio", "gauge", "Result cache hit rate.", [({}, cache["hit_rate"])]
+    )
+    lines += family(
+        "standardizer_llm_calls_total", "counter", "LLM completions.", [({}, c["llm_calls"])]
+    )
+    lines += family(
+        "standardizer_llm_seconds_total",
+        "counter",
+        "Time spent in LLM batches.",
+        [({}, c["llm_seconds"])],
+    )
+    lines += family(
+        "standardizer_llm_tokens_total",
+        "counter",
+        "Prompt and completion tokens.",
+        [
+            ({"kind": "prompt"}, c["prompt_tokens"]),
+            ({"kind": "completion"}, c["completion_tokens"]),
+        ],
+    )
+    lines += family(
+        "standardizer_llm_tokens_per_second",
+        "gauge",
+        "Completion tokens per second of LLM time since start.",
+        [({}, _ratio(c["completion_tokens"], c["llm_seconds"]))],
+    )
+    lines += family(
+        "standardizer_llm_fallback_rows_total",
+        "counter",
+        "LLM rows whose reply failed to parse as JSON (rules fallback used).",
+        [({}, c["fallback_rows"])],
+    )
+    lines += family(
+        "standardizer_llm_fallback_ratio",
+        "gauge",
+        "JSON-parse fallback rate among LLM rows.",
+        [({}, _ratio(c["fallback_rows"], c["llm_rows"]))],
+    )
+    canon = [
+        ({"field": field, "outcome": outcome}, c[f"canon_{field}_{outcome}"])
+        for field in ("program", "university")
+        for outcome in ("exact", "fuzzy", "miss")
+    ]
+    lines += family(
+        "standardizer_canon_matches_total",
+        "counter",
+        "Canonical mapping outcomes in post-normalization.",
+        canon,
+    )
+    lines += family(
+        "standardizer_canon_fuzzy_hit_ratio",
+        "gauge",
+        "Share of non-exact names that the fuzzy index mapped to a canonical name.",
+        [
+            (
+                {"field": f},
+                _ratio(c[f"canon_{f}_fuzzy"], c[f"canon_{f}_fuzzy"] + c[f"canon_{f}_miss"]),
+            )
+            for f in ("program", "university")
+        ],
+    )
+    lines += family(
+        "standardizer_queue_rows",
+        "gauge",
+        "Rows waiting, by queue.",
+        [({"queue": name}, rows) for name, rows in queues.items()],
+    )
+    lines += family(
+        "standardizer_repass_failures_total",
+        "counter",
+        "Background re-pass batches that raised (their rows stay queued).",
+        [({}, c.get("repass_failures", 0))],
+    )
+    lines += family(
+        "standardizer_ready", "gauge", "1 once the model is loaded.", [({}, float(ready))]
+    )
+    rendered: List[str] = [line for h in histograms for line in h.render()]
+    return "\n".join(lines + rendered) + "\n"
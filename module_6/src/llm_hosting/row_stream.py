@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""Streaming input rows and resume bookkeeping for the standardizer CLI."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator
+
+# Fields the standardizer adds; ignored when matching output rows back to inputs
+GENERATED_FIELDS = ("llm-generated-program", "llm-generated-university", "llm-degraded")
+
+_DECODER = json.JSONDecoder()
+
+
+def row_key(row: Dict[str, Any]) -> str:
+    """Identify a row by its result URL, or by a hash of its input fields."""
+    url = row.get("url")
+    if url:
+        return f"url:{url}"
+    fields = {k: v for k, v in row.items() if k not in GENERATED_FIELDS}
+    canonical = json.dumps(fields, sort_keys=True, ensure_ascii=False)
+    return "sha1:" + hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def _iter_array(f: Any, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array without loading it whole."""
+    buf = ""
+    pos = 0
+    eof = False
+    while True:
+        # Skip whitespace and separators between elements
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+        if pos >= len(buf) or buf[pos] == "]":
+            return
+        try:
+            value, end = _DECODER.raw_decode(buf, pos)
+            # A number ending at the buffer's end may continue in the next chunk
+            complete = eof or end < len(buf)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+        if not complete:
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+        yield value
+        pos = end
+
+
+def iter_json_rows(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream rows from a JSON array, JSON Lines, or a {'rows': [...]} file."""
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(1)
+        while head and head.isspace():
+            head = f.read(1)
+        if head == "[":
+            yield from _iter_array(f)
+            return
+        if head != "{":
+            return
+        first = head + f.readline()
+        try:
+            obj = json.loads(first)
+        except json.JSONDecodeError:
+            # Multi-line {'rows': [...]} wrapper
+            obj = json.loads(first + f.read())
+            yield from (obj.get("rows") or []) if isinstance(obj, dict) else []
+            return
+        if isinstance(obj, dict) and isinstance(obj.get("rows"), list):
+            yield from obj["rows"]
+            return
+        # JSON Lines: one row per line
+        yield obj
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def scan_completed(out_path: str) -> Counter:
+    """Count row keys already written to a JSONL output.
+
+    A trailing partial line left by a crash is truncated so appended rows
+    start on a clean line.
+    """
+    done: Counter = Counter()
+    if not os.path.exists(out_path):
+        return done
+    good_end = 0
+    with open(out_path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                done[row_key(json.loads(line))] += 1
+            except (ValueError, AttributeError):
+                pass
+            good_end += len(line)
+    if good_end < os.path.getsize(out_path):
+        with open(out_path, "r+b") as f:
+            f.truncate(good_end)
+    return done
+
+
+def skip_completed(rows: Iterable[Dict[str, Any]], completed: Counter) -> Iterator[Dict[str, Any]]:
+    """Drop rows whose key is still counted in ``completed`` (consuming one count each)."""
+    for row in rows:
+        key = row_key(row or {})
+        if completed[key] > 0:
+            completed[key] -= 1
+            continue
+        yield row
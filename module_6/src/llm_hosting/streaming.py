@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""Windowed row processing and NDJSON output for the streaming endpoint and CLI."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List, TextIO
+
+from flask import Response, stream_with_context
+
+Row = Dict[str, Any]
+
+
+def iter_windows(
+    rows: Iterable[Row], window: int, process: Callable[[List[Row]], List[Row]]
+) -> Iterator[Row]:
+    """Yield ``process``-ed rows in input order, handing it ``window`` rows at a time."""
+    chunk: List[Row] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= window:
+            yield from process(chunk)
+            chunk = []
+    if chunk:
+        yield from process(chunk)
+
+
+def ndjson_lines(rows: Iterable[Row]) -> Iterator[str]:
+    """One JSON document per row, newline-terminated."""
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def ndjson_response(rows: Iterable[Row], headers: Dict[str, str] | None = None) -> Response:
+    """Stream rows back as NDJSON while they are still being produced."""
+    return Response(
+        stream_with_context(ndjson_lines(rows)),
+        mimetype="application/x-ndjson",
+        headers=headers,
+    )
+
+
+def write_jsonl(rows: Iterable[Row], sink: TextIO, flush_every: int) -> int:
+    """Write rows to ``sink`` as JSON Lines, flushing every ``flush_every`` rows."""
+    written = 0
+    for written, line in enumerate(ndjson_lines(rows), start=1):
+        sink.write(line)
+        if written % flush_every == 0:
+            sink.flush()
+    return written
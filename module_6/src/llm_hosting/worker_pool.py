@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Process pool that gives each model worker its own share of the CPU threads."""
+
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List
+
+# Per worker process: the barrier :meth:`WorkerPool.on_each` lines workers up on
+_WORKER: Dict[str, Any] = {}
+
+
+def split_threads(total: int, workers: int) -> List[int]:
+    """Divide ``total`` threads across ``workers`` as evenly as possible (each >= 1)."""
+    workers = max(1, workers)
+    base, extra = divmod(max(total, workers), workers)
+    return [base + (1 if i < extra else 0) for i in range(workers)]
+
+
+def _init_with_threads(queue: Any, barrier: Any, initializer: Callable[[int], None]) -> None:
+    """Worker bootstrap: claim one thread budget from the queue, then initialize."""
+    _WORKER["barrier"] = barrier
+    initializer(queue.get())
+
+
+def _call_on_worker(func: Callable[[Any], Any], item: Any) -> Any:
+    """Wait until every worker holds one of these calls, then run ``func(item)``."""
+    _WORKER["barrier"].wait()
+    return func(item)
+
+
+def _noop(item: Any) -> Any:
+    """Startup probe: returns its argument once the worker is initialized."""
+    return item
+
+
+class WorkerPool:
+    """N worker processes, each initialized with its own thread count.
+
+    ``initializer(n_threads)`` runs once per worker (e.g. to load a model with
+    ``n_threads``). :meth:`map` shards items across workers and returns the
+    results in input order. Workers are spawned rather than forked, so they do
+    not inherit the parent's threads, locks or open model state.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        total_threads: int,
+        initializer: Callable[[int], None],
+        start_method: str = "spawn",
+    ) -> None:
+        self.workers = max(1, workers)
+        self.threads = split_threads(total_threads, self.workers)
+        ctx = multiprocessing.get_context(start_method)
+        queue = ctx.SimpleQueue()
+        for n_threads in self.threads:
+            queue.put(n_threads)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=ctx,
+            initializer=_init_with_threads,
+            initargs=(queue, ctx.Barrier(self.workers), initializer),
+        )
+
+    def on_each(self, func: Callable[[int], Any]) -> List[Any]:
+        """Run ``func(i)`` once on every worker ``i``, starting any not yet running.
+
+        Each call waits at a barrier until all workers hold one, so no worker
+        takes two; the results are in worker order.
+        """
+        futures = [self._executor.submit(_call_on_worker, func, i) for i in range(self.workers)]
+        return [future.result() for future in futures]
+
+    def start(self) -> None:
+        """Start every worker and wait until each has run its initializer."""
+        self.on_each(_noop)
+
+    def map(self, func: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        """Run ``func`` over ``items`` on the workers; results keep input order."""
+        return list(self._executor.map(func, items))
+
+    def submit(self, func: Callable[[Any], Any], item: Any) -> Future:
+        """Schedule ``func(item)`` on a worker and return its future."""
+        return self._executor.submit(func, item)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
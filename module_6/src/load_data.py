@@ -12,7 +12,7 @@ Date: September 2025
 import json
 import logging
 import sys
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any, Dict, List, Optional, Tuple
 
 import psycopg
@@ -20,6 +20,15 @@ from psycopg import sql
 from dateutil import parser as date_parser
 
 # pylint: disable=import-error
+from canonicalize import PROGRAM_CANONICAL_SQL
+from clean import (
+    GPA_SCALES,
+    GRE_SECTION_RANGES,
+    GRE_TOTAL_RANGES,
+    classify_gpa_scale,
+    classify_gre_scale,
+    is_valid_gre_aw,
+)
 from config import DB_CONFIG
 # pylint: enable=import-error
 
@@ -31,6 +40,130 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# GradCafe result id, taken from the entry URL (``.../result/<id>``)
+RESULT_ID_EXPR = r"substring(url from '/result/([0-9]+)')::bigint"
+
+# Result id key for idempotent loads. Existing rows are backfilled when the
+# column is first added; when a result was loaded more than once only its oldest
+# row gets the id, so the unique index can be built without deleting anything.
+RESULT_ID_SQL = f"""
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = 'applicant_data' AND column_name = 'result_id'
+    ) THEN
+        ALTER TABLE applicant_data ADD COLUMN IF NOT EXISTS result_id BIGINT;
+        UPDATE applicant_data AS a SET result_id = d.result_id
+        FROM (
+            SELECT MIN(p_id) AS p_id, {RESULT_ID_EXPR} AS result_id
+            FROM applicant_data
+            WHERE url ~ '/result/[0-9]+'
+            GROUP BY 2
+        ) AS d
+        WHERE a.p_id = d.p_id;
+    END IF;
+END
+$$;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_applicant_data_result_id ON applicant_data (result_id);
+"""
+
+
+def _gre_scale_case(column: str, ranges) -> str:
+    """
+    SQL ``CASE`` mirroring :func:`clean.classify_gre_scale` for one score column.
+
+    :param column: Score column name.
+    :type column: str
+    :param ranges: ``(new, old)`` range pairs, as in :mod:`clean`.
+    :return: CASE expression yielding ``'new'``, ``'old'`` or ``'invalid'``.
+    :rtype: str
+    """
+    # New-scale ranges come first so they win where ranges overlap
+    ordered = ranges[0::2] + ranges[1::2]
+    labels = ["new"] * len(ranges[0::2]) + ["old"] * len(ranges[1::2])
+    whens = " ".join(
+        f"WHEN {column} BETWEEN {low} AND {high} THEN '{label}'"
+        for (low, high), label in zip(ordered, labels)
+    )
+    return f"CASE {whens} ELSE 'invalid' END"
+
+
+_GPA_SCALE_WHENS = " ".join(f"WHEN gpa <= {upper} THEN '{scale}'" for upper, scale in GPA_SCALES)
+_GPA_SCALE_CASE = f"CASE WHEN gpa <= 0 THEN 'invalid' {_GPA_SCALE_WHENS} ELSE 'invalid' END"
+_GRE_TOTAL_CASE = _gre_scale_case("gre", GRE_SECTION_RANGES + GRE_TOTAL_RANGES)
+_GRE_V_CASE = _gre_scale_case("gre_v", GRE_SECTION_RANGES)
+
+# Score validity flags (added after the original schema). Tables that predate
+# them get the columns plus a one-time backfill from the stored scores, using
+# the same rules as the cleaner; newer tables already have the columns and skip it.
+SCORE_FLAGS_SQL = f"""
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = 'applicant_data' AND column_name = 'gre_scale'
+    ) THEN
+        ALTER TABLE applicant_data ADD COLUMN IF NOT EXISTS gpa_scale TEXT;
+        ALTER TABLE applicant_data ADD COLUMN IF NOT EXISTS gre_scale TEXT;
+        ALTER TABLE applicant_data ADD COLUMN IF NOT EXISTS gre_aw_valid BOOLEAN;
+        UPDATE applicant_data SET
+            gpa_scale = CASE WHEN gpa IS NOT NULL THEN {_GPA_SCALE_CASE} END,
+            gre_scale = CASE
+                WHEN gre IS NULL AND gre_v IS NULL THEN NULL
+                WHEN gre IS NULL THEN {_GRE_V_CASE}
+                WHEN gre_v IS NULL THEN {_GRE_TOTAL_CASE}
+                WHEN {_GRE_TOTAL_CASE} = {_GRE_V_CASE} THEN {_GRE_V_CASE}
+                ELSE 'invalid'
+            END,
+            gre_aw_valid = CASE WHEN gre_aw IS NOT NULL
+                THEN gre_aw BETWEEN 0 AND 6 AND gre_aw * 2 = trunc(gre_aw * 2) END
+        WHERE gpa IS NOT NULL OR gre IS NOT NULL OR gre_v IS NOT NULL OR gre_aw IS NOT NULL;
+    END IF;
+END
+$$;
+"""
+
+# Rows that could not be loaded, with the reason and where they came from
+LOAD_REJECTS_SQL = """
+CREATE TABLE IF NOT EXISTS load_rejects (
+    reject_id SERIAL PRIMARY KEY,
+    source_file TEXT,
+    line_number INTEGER,
+    error TEXT,
+    record TEXT,
+    rejected_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+"""
+
+# Re-pass corrections (``llm_hosting/cli.py --repass``), staged and applied by URL
+LLM_UPDATES_STAGING_SQL = """
+CREATE TEMP TABLE IF NOT EXISTS llm_field_updates (
+    line_number INTEGER,
+    url TEXT,
+    llm_generated_program TEXT,
+    llm_generated_university TEXT
+) ON COMMIT DELETE ROWS
+"""
+
+APPLY_LLM_UPDATES_SQL = """
+UPDATE applicant_data AS a
+SET llm_generated_program = u.llm_generated_program,
+    llm_generated_university = u.llm_generated_university
+FROM (
+    SELECT DISTINCT ON (url) url, llm_generated_program, llm_generated_university
+    FROM llm_field_updates
+    ORDER BY url, line_number DESC
+) AS u
+WHERE a.url = u.url
+"""
+
+# Errors caused by the data in a row (bad values, constraint violations); only
+# these are worth bisecting a failed batch for
+ROW_ERRORS = (psycopg.DataError, psycopg.IntegrityError)
+
 # Table schema definition
 CREATE_TABLE_SQL = """
 CREATE TABLE IF NOT EXISTS applicant_data (
@@ -48,9 +181,120 @@ CREATE TABLE IF NOT EXISTS applicant_data (
     gre_aw FLOAT,
     degree TEXT,
     llm_generated_program TEXT,
-    llm_generated_university TEXT
+    llm_generated_university TEXT,
+    gpa_scale TEXT,
+    gre_scale TEXT,
+    gre_aw_valid BOOLEAN,
+    result_id BIGINT
 );
-"""
+
+""" + SCORE_FLAGS_SQL + """
+CREATE INDEX IF NOT EXISTS idx_applicant_data_gpa_scale ON applicant_data (gpa_scale);
+CREATE INDEX IF NOT EXISTS idx_applicant_data_score_flags
+    ON applicant_data (gre_scale, gre_aw_valid);
+""" + RESULT_ID_SQL + PROGRAM_CANONICAL_SQL + LOAD_REJECTS_SQL
+
+
+# Columns written by every load mode, in ``transform_record`` order
+INSERT_COLUMNS = (
+    "program", "comments", "date_added", "url", "status", "term",
+    "us_or_international", "gpa", "gre", "gre_v", "gre_aw", "degree",
+    "llm_generated_program", "llm_generated_university",
+    "gpa_scale", "gre_scale", "gre_aw_valid",
+)
+
+# Postgres types of INSERT_COLUMNS, required by binary COPY
+COPY_TYPES = (
+    "text", "text", "date", "text", "text", "text",
+    "text", "float8", "float8", "float8", "float8", "text",
+    "text", "text",
+    "text", "text", "bool",
+)
+
+# row: one execute() per row, each waiting for its result (the baseline);
+# executemany: the same INSERTs, which psycopg 3 pipelines into one round trip per batch;
+# copy / copy-binary: COPY FROM STDIN in text or binary format.
+# Every mode stages, merges and commits one batch at a time (``--batch-size``)
+LOAD_MODES = ("row", "executemany", "copy", "copy-binary")
+
+# Per-transaction staging table every load mode writes to before the merge
+STAGING_TABLE = "applicant_data_staging"
+
+
+def _staging_sql() -> sql.Composed:
+    """Create the session's staging table (emptied on every commit) if needed."""
+    return sql.SQL(
+        "CREATE TEMP TABLE IF NOT EXISTS {staging} ON COMMIT DELETE ROWS AS "
+        "SELECT {columns} FROM {table} WITH NO DATA"
+    ).format(
+        staging=sql.Identifier(STAGING_TABLE),
+        columns=sql.SQL(", ").join(map(sql.Identifier, INSERT_COLUMNS)),
+        table=sql.Identifier('applicant_data'),
+    )
+
+
+def _add_counts(total: Dict[str, int], batch: Dict[str, int]) -> None:
+    """Add a batch's row counts into the running ``total``."""
+    for key, value in batch.items():
+        total[key] += value
+
+
+def _merge_sql() -> sql.Composed:
+    """
+    Merge the staged batch into ``applicant_data`` keyed on ``result_id``.
+
+    New result ids are inserted, known ones updated only when a column changed,
+    and rows without a result id are always inserted. Returns one boolean row
+    per inserted (true) or updated (false) row; unchanged rows return nothing.
+    A result id repeated within the batch is merged once.
+    """
+    columns = sql.SQL(", ").join(map(sql.Identifier, INSERT_COLUMNS))
+    table = sql.Identifier('applicant_data')
+    return sql.SQL("""
+    WITH staged AS (
+        SELECT {columns}, {result_id_expr} AS result_id FROM {staging}
+    ), keyed AS (
+        SELECT DISTINCT ON (result_id) * FROM staged
+        WHERE result_id IS NOT NULL ORDER BY result_id
+    ), upserted AS (
+        INSERT INTO {table} ({columns}, result_id)
+        SELECT {columns}, result_id FROM keyed
+        ON CONFLICT (result_id) DO UPDATE SET {assignments}
+        WHERE ({current}) IS DISTINCT FROM ({incoming})
+        RETURNING (xmax = 0) AS inserted
+    ), keyless AS (
+        INSERT INTO {table} ({columns})
+        SELECT {columns} FROM staged WHERE result_id IS NULL
+        RETURNING TRUE AS inserted
+    )
+    SELECT inserted FROM upserted UNION ALL SELECT inserted FROM keyless
+    """).format(
+        columns=columns,
+        result_id_expr=sql.SQL(RESULT_ID_EXPR),
+        staging=sql.Identifier(STAGING_TABLE),
+        table=table,
+        assignments=sql.SQL(", ").join(
+            sql.SQL("{col} = EXCLUDED.{col}").format(col=sql.Identifier(col))
+            for col in INSERT_COLUMNS
+        ),
+        current=sql.SQL(", ").join(
+            sql.Identifier('applicant_data', col) for col in INSERT_COLUMNS
+        ),
+        incoming=sql.SQL(", ").join(sql.Identifier('excluded', col) for col in INSERT_COLUMNS),
+    )
+
+
+def _register_programs_sql() -> sql.Composed:
+    """Add the staged batch's programs to ``program_canonical`` as pending (if new)."""
+    return sql.SQL(
+        "INSERT INTO {canonical} ({program}) "
+        "SELECT DISTINCT {program} FROM {staging} WHERE {program} <> '' "
+        "ON CONFLICT ({program}) DO NOTHING"
+    ).format(
+        canonical=sql.Identifier('program_canonical'),
+        program=sql.Identifier('program'),
+        staging=sql.Identifier(STAGING_TABLE),
+    )
 
 
 class GradCafeDataLoader:
@@ -61,16 +305,24 @@ class GradCafeDataLoader:
     batch inserts from JSONL, and table statistics.
     """
 
-    def __init__(self, db_config: Dict[str, Any]):
+    def __init__(self, db_config: Dict[str, Any], load_mode: str = "executemany"):
         """
         Initialize the data loader.
 
         :param db_config: Database configuration dictionary containing keys
                           ``host``, ``port``, ``dbname``, ``user``, ``password``.
         :type db_config: dict
+        :param load_mode: Default write path for :meth:`load_data_from_jsonl`,
+                          one of :data:`LOAD_MODES` (default: ``executemany``).
+        :type load_mode: str
+        :raises ValueError: If ``load_mode`` is not a known mode.
         """
+        if load_mode not in LOAD_MODES:
+            raise ValueError(f"Unknown load mode {load_mode!r}; expected one of {LOAD_MODES}")
         self.db_config = db_config
         self.connection = None
+        self.load_mode = load_mode
+        self._reject_source: Optional[str] = None
 
     def connect_to_database(self) -> bool:
         """
@@ -91,6 +343,10 @@ class GradCafeDataLoader:
         """
         Create the ``applicant_data`` table if it does not exist.
 
+        Also adds the score validity flag columns and their indexes to tables
+        created with the original schema, the ``program_canonical`` mapping
+        table the queries join against, and the ``load_rejects`` table.
+
         :return: True if the table exists or was created successfully, False on error.
         :rtype: bool
         """
@@ -110,7 +366,9 @@ class GradCafeDataLoader:
         """
         Parse a date string into a ``date`` value.
 
-        Uses ``dateutil.parser.parse`` to accept multiple formats.
+        ISO dates (as emitted by the cleaner) take a fast path through
+        ``date.fromisoformat``; anything else falls back to the much slower
+        ``dateutil.parser.parse`` to accept multiple formats.
 
         :param date_string: Date string to parse (e.g., ``"2024-01-15"``).
         :type date_string: str
@@ -120,6 +378,15 @@ class GradCafeDataLoader:
         if not date_string:
             return None
 
+        if isinstance(date_string, date):
+            return date_string
+
+        try:
+            # Fast path: cleaner output is already ISO formatted
+            return date.fromisoformat(date_string)
+        except (ValueError, TypeError):
+            pass
+
         try:
             # Handle various date formats
             return date_parser.parse(date_string).date()
@@ -139,6 +406,10 @@ class GradCafeDataLoader:
         if value is None or value == "":
             return None
 
+        # Fast path: cleaner output is already typed
+        if isinstance(value, float):
+            return value
+
         try:
             return float(value)
         except (ValueError, TypeError):
@@ -150,7 +421,9 @@ class GradCafeDataLoader:
         Transform a JSONL record into a tuple matching the DB schema.
 
         Maps JSON fields to columns of ``applicant_data`` and applies parsing for
-        date/float fields.
+        date/float fields. Typed cleaner output (floats, ISO dates) skips the
+        string parsing. Score validity flags are taken from the record when the
+        cleaner computed them, and derived from the scores otherwise.
 
         :param record: A single JSON object (one line from the JSONL file).
         :type record: dict
@@ -161,6 +434,18 @@ class GradCafeDataLoader:
         gre_total = self.parse_float(record.get("gre_total"))
         gre_quant = self.parse_float(record.get("gre_quant"))
         gre = gre_total or gre_quant
+        gpa = self.parse_float(record.get("gpa"))
+        gre_v = self.parse_float(record.get("gre_verbal"))
+        gre_aw = self.parse_float(record.get("gre_aw"))
+
+        if "gre_scale" in record:
+            flags = (record.get("gpa_scale"), record.get("gre_scale"), record.get("gre_aw_valid"))
+        else:
+            flags = (
+                classify_gpa_scale(gpa),
+                classify_gre_scale(gre_total, gre_v, gre_quant),
+                is_valid_gre_aw(gre_aw),
+            )
 
         return (
             record.get("program", ""),
@@ -170,121 +455,344 @@ class GradCafeDataLoader:
             record.get("status", ""),
             record.get("semester", ""),  # semester maps to term
             record.get("applicant_type", ""),
-            self.parse_float(record.get("gpa")),
+            gpa,
             gre,
-            self.parse_float(record.get("gre_verbal")),
-            self.parse_float(record.get("gre_aw")),
+            gre_v,
+            gre_aw,
             record.get("degree", ""),
             record.get("llm-generated-program", ""),
             record.get("llm-generated-university", ""),
+            *flags,
         )
 
-    def load_data_from_jsonl(self, file_path: str, batch_size: int = 1000) -> bool:
+    def load_data_from_jsonl(
+        self, file_path: str, batch_size: int = 1000, mode: Optional[str] = None
+    ) -> bool:
         """
-        Load data lines from a JSONL file and insert into the database in batches.
+        Load data lines from a JSONL file into the database in batches.
 
-        Each line is parsed as JSON, transformed to match the DB schema, and inserted
-        using ``executemany`` in chunks.
+        Thin wrapper around :meth:`upsert_from_jsonl` for callers that only
+        need to know whether the load worked.
 
         :param file_path: Path to the input JSONL file.
         :type file_path: str
         :param batch_size: Number of rows per batch insert (default: 1000).
         :type batch_size: int
-        :return: True if at least one record was inserted, False otherwise.
+        :param mode: Load mode for this call (default: the loader's ``load_mode``).
+        :type mode: str | None
+        :return: True if at least one record was inserted, updated or already
+                 present unchanged, False otherwise.
         :rtype: bool
-        :raises FileNotFoundError: If the input file does not exist.
+        :raises ValueError: If ``mode`` is not a known load mode.
         """
-        try:
-            insert_sql = """
-            INSERT INTO applicant_data (
-                program, comments, date_added, url, status, term,
-                us_or_international, gpa, gre, gre_v, gre_aw, degree,
-                llm_generated_program, llm_generated_university
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
+        counts = self.upsert_from_jsonl(file_path, batch_size, mode)
+        if counts is None:
+            return False
+        return counts["inserted"] + counts["updated"] + counts["unchanged"] > 0
 
+    def upsert_from_jsonl(
+        self, file_path: str, batch_size: int = 1000, mode: Optional[str] = None
+    ) -> Optional[Dict[str, int]]:
+        """
+        Idempotently load a JSONL file, keyed on the GradCafe ``result_id``.
+
+        Each line is parsed as JSON, transformed to match the DB schema, and
+        written in chunks with the chosen load mode (see :data:`LOAD_MODES`) into
+        a staging table, which is then merged into ``applicant_data``. Re-loading
+        the same file therefore inserts nothing and reports the rows unchanged.
+        Lines that cannot be parsed or rows the database refuses are written to
+        ``load_rejects`` with their line number; the rest of their batch still loads.
+
+        :param file_path: Path to the input JSONL file.
+        :type file_path: str
+        :param batch_size: Number of rows per batch insert (default: 1000).
+        :type batch_size: int
+        :param mode: Load mode for this call (default: the loader's ``load_mode``).
+        :type mode: str | None
+        :return: Row counts ``processed``, ``inserted``, ``updated``, ``unchanged``,
+                 ``rejected`` (unparseable lines and refused rows) and ``failed``
+                 (rows of batches lost to non-row errors), or None if the file
+                 could not be read.
+        :rtype: dict[str, int] | None
+        :raises ValueError: If ``mode`` is not a known load mode.
+        """
+        mode = mode or self.load_mode
+        if mode not in LOAD_MODES:
+            raise ValueError(f"Unknown load mode {mode!r}; expected one of {LOAD_MODES}")
+        counts = {
+            "processed": 0, "inserted": 0, "updated": 0, "unchanged": 0, "rejected": 0, "failed": 0,
+        }
+        self._reject_source = file_path
+        try:
             batch_data = []
-            total_records = 0
-            successful_inserts = 0
+            batch_lines = []
+            parse_rejects = []
 
-            logger.info("Starting to load data from %s", file_path)
+            logger.info("Starting to load data from %s (mode: %s)", file_path, mode)
 
             with open(file_path, "r", encoding="utf-8") as file:
                 for line_num, line in enumerate(file, 1):
                     try:
                         # Parse JSON line
                         record = json.loads(line.strip())
-                        total_records += 1
+                        counts["processed"] += 1
 
                         # Transform record
                         transformed_record = self.transform_record(record)
                         batch_data.append(transformed_record)
+                        batch_lines.append((line_num, line.strip()))
 
-                        # Insert batch when batch_size is reached
+                        # Write batch when batch_size is reached
                         if len(batch_data) >= batch_size:
-                            inserted = self._insert_batch(insert_sql, batch_data)
-                            successful_inserts += inserted
-                            batch_data = []
+                            _add_counts(counts, self._insert_batch(batch_data, mode, batch_lines))
+                            batch_data, batch_lines = [], []
 
-                            if total_records % (batch_size * 10) == 0:
-                                logger.info(
-                                    "Processed %d records, inserted %d successfully",
-                                    total_records,
-                                    successful_inserts
-                                )
+                            if counts["processed"] % (batch_size * 10) == 0:
+                                logger.info("Processed %d records: %s", counts["processed"], counts)
 
                     except json.JSONDecodeError as exc:
                         logger.warning("Failed to parse JSON on line %d: %s", line_num, exc)
+                        parse_rejects.append((line_num, f"Invalid JSON: {exc}", line.strip()))
                         continue
                     except (KeyError, TypeError, ValueError) as exc:
                         logger.warning("Error processing line %d: %s", line_num, exc)
+                        parse_rejects.append((line_num, f"Invalid record: {exc}", line.strip()))
                         continue
 
-                # Insert remaining records in batch
+                # Write remaining records in batch
                 if batch_data:
-                    inserted = self._insert_batch(insert_sql, batch_data)
-                    successful_inserts += inserted
-
-            logger.info(
-                "Data loading completed. Total records processed: %d, "
-                "Successfully inserted: %d",
-                total_records,
-                successful_inserts
-            )
+                    _add_counts(counts, self._insert_batch(batch_data, mode, batch_lines))
 
-            return successful_inserts > 0
+            if parse_rejects:
+                counts["rejected"] += len(parse_rejects)
+                self._record_rejects(parse_rejects)
+
+            logger.info("Data loading completed: %s", counts)
+            return counts
 
         except FileNotFoundError:
             logger.error("File not found: %s", file_path)
-            return False
+            return None
         except IOError as exc:
             logger.error("Unexpected error during data loading: %s", exc)
-            return False
+            return None
 
-    def _insert_batch(self, insert_sql: str, batch_data: List[Tuple]) -> int:
+    def update_llm_fields_from_jsonl(self, file_path: str) -> int:
         """
-        Insert a batch of records into the database.
+        Apply re-standardized LLM fields to rows already in the database.
 
-        :param insert_sql: Parameterized INSERT SQL statement.
-        :type insert_sql: str
-        :param batch_data: List of tuples to insert.
-        :type batch_data: list[tuple]
-        :return: Number of records inserted (len(batch_data)) on success, 0 on failure.
+        Each line is a correction written by ``llm_hosting/cli.py --repass``
+        (``url`` plus the new ``llm-generated-*`` fields) for a row that was
+        loaded with the degraded, rules-only answer. Rows are matched by URL.
+
+        Corrections are staged into a temporary table and applied with a single
+        ``UPDATE ... FROM``; when a URL appears more than once the last line wins.
+
+        :param file_path: Path to the corrections JSONL file.
+        :type file_path: str
+        :return: Number of database rows updated (0 on error).
         :rtype: int
         """
+        try:
+            with open(file_path, "r", encoding="utf-8") as file:
+                updates = []
+                for line_num, line in enumerate(file, 1):
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError as exc:
+                        logger.warning("Failed to parse JSON on line %d: %s", line_num, exc)
+                        continue
+                    if record.get("url"):
+                        updates.append(
+                            (
+                                line_num,
+                                record["url"],
+                                record.get("llm-generated-program", ""),
+                                record.get("llm-generated-university", ""),
+                            )
+                        )
+        except IOError as exc:
+            logger.error("Failed to read updates from %s: %s", file_path, exc)
+            return 0
+
         try:
             # pylint: disable=no-member
             cursor = self.connection.cursor()
-            cursor.executemany(insert_sql, batch_data)
+            cursor.execute(LLM_UPDATES_STAGING_SQL)
+            cursor.executemany(
+                "INSERT INTO llm_field_updates (line_number, url, llm_generated_program, "
+                "llm_generated_university) VALUES (%s, %s, %s, %s)",
+                updates,
+            )
+            cursor.execute(APPLY_LLM_UPDATES_SQL)
+            updated = cursor.rowcount
             self.connection.commit()
             # pylint: enable=no-member
-            return len(batch_data)
         except psycopg.Error as exc:
-            logger.error("Failed to insert batch: %s", exc)
+            logger.error("Failed to apply LLM field updates: %s", exc)
+            self.connection.rollback()  # pylint: disable=no-member
+            return 0
+        logger.info("Updated LLM fields on %d rows from %s", updated, file_path)
+        return updated
+
+    def _stage_batch(self, cursor: Any, mode: str, batch_data: List[Tuple]) -> None:
+        """
+        Write a batch of records into the staging table with the given load mode.
+
+        ``row`` executes one INSERT per row and waits for each; ``executemany``
+        sends the same INSERTs, which psycopg 3 pipelines so the batch costs one
+        round trip; the COPY modes stream the batch through one ``COPY FROM STDIN``.
+        Each batch is its own COPY, so a larger ``batch_size`` gets closer to one
+        COPY for the whole file, at the cost of a larger transaction.
+
+        :param cursor: Cursor of the loader's connection.
+        :type cursor: psycopg.Cursor
+        :param mode: One of :data:`LOAD_MODES`.
+        :type mode: str
+        :param batch_data: List of tuples in :data:`INSERT_COLUMNS` order.
+        :type batch_data: list[tuple]
+        """
+        staging = sql.Identifier(STAGING_TABLE)
+        columns = sql.SQL(", ").join(map(sql.Identifier, INSERT_COLUMNS))
+        if mode in ("row", "executemany"):
+            insert_sql = sql.SQL("INSERT INTO {staging} ({columns}) VALUES ({values})").format(
+                staging=staging,
+                columns=columns,
+                values=sql.SQL(", ").join(sql.Placeholder() * len(INSERT_COLUMNS)),
+            )
+            if mode == "row":
+                for row in batch_data:
+                    cursor.execute(insert_sql, row)
+            else:
+                cursor.executemany(insert_sql, batch_data)
+            return
+
+        binary = mode == "copy-binary"
+        copy_sql = sql.SQL("COPY {staging} ({columns}) FROM STDIN{binary}").format(
+            staging=staging,
+            columns=columns,
+            binary=sql.SQL(" (FORMAT BINARY)" if binary else ""),
+        )
+        with cursor.copy(copy_sql) as copy:
+            if binary:
+                copy.set_types(COPY_TYPES)
+            for row in batch_data:
+                copy.write_row(row)
+
+    def _insert_batch(
+        self,
+        batch_data: List[Tuple],
+        mode: str = "executemany",
+        lines: Optional[List[Tuple[int, str]]] = None,
+    ) -> Dict[str, int]:
+        """
+        Stage a batch of records and merge it into ``applicant_data``.
+
+        The batch is one transaction: it is staged, merged on ``result_id`` and
+        committed, or rolled back as a whole. When the database refuses it
+        because of the data in some row, the batch is split in half and each
+        half retried, so good rows still load in bulk and only the offending
+        rows end up (one by one) in ``load_rejects``. Other database errors fail
+        the whole batch.
+
+        :param batch_data: List of tuples to insert.
+        :type batch_data: list[tuple]
+        :param mode: One of :data:`LOAD_MODES` (default: ``executemany``).
+        :type mode: str
+        :param lines: ``(line_number, source_line)`` of each record, for rejects.
+        :type lines: list[tuple[int, str]] | None
+        :return: Counts ``inserted``, ``updated``, ``unchanged``, ``rejected`` and
+                 ``failed`` for the batch.
+        :rtype: dict[str, int]
+        """
+        if lines is None:
+            lines = [(None, json.dumps(row, default=str)) for row in batch_data]
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0, "rejected": 0, "failed": 0}
+        rejects: List[Tuple[Optional[int], str, str]] = []
+        pending = [(batch_data, lines)]
+        while pending:
+            rows, row_lines = pending.pop()
+            try:
+                _add_counts(counts, self._merge_batch(rows, mode))
+            except ROW_ERRORS as exc:
+                self.connection.rollback()  # pylint: disable=no-member
+                if len(rows) == 1:
+                    line_num, source = row_lines[0]
+                    logger.warning("Rejected row on line %s: %s", line_num, exc)
+                    rejects.append((line_num, str(exc).strip(), source))
+                    continue
+                mid = len(rows) // 2
+                # Second half first on the stack, so rows are retried in file order
+                pending.append((rows[mid:], row_lines[mid:]))
+                pending.append((rows[:mid], row_lines[:mid]))
+            except psycopg.Error as exc:
+                logger.error("Failed to insert batch: %s", exc)
+                # pylint: disable=no-member
+                self.connection.rollback()
+                # pylint: enable=no-member
+                counts["failed"] += len(rows)
+
+        if rejects:
+            counts["rejected"] = len(rejects)
+            self._record_rejects(rejects)
+        return counts
+
+    def _merge_batch(self, batch_data: List[Tuple], mode: str) -> Dict[str, int]:
+        """
+        Stage, merge and commit one batch (no error handling).
+
+        The batch's programs are registered in ``program_canonical`` in the same
+        transaction, so ``canonicalize.py`` picks up the new ones without the
+        loader scanning ``applicant_data``.
+
+        :param batch_data: List of tuples to insert.
+        :type batch_data: list[tuple]
+        :param mode: One of :data:`LOAD_MODES`.
+        :type mode: str
+        :return: Counts ``inserted``, ``updated`` and ``unchanged``.
+        :rtype: dict[str, int]
+        :raises psycopg.Error: If staging, merging or committing fails.
+        """
+        # pylint: disable=no-member
+        cursor = self.connection.cursor()
+        cursor.execute(_staging_sql())
+        self._stage_batch(cursor, mode, batch_data)
+        cursor.execute(_merge_sql())
+        flags = [row[0] for row in cursor.fetchall()]
+        cursor.execute(_register_programs_sql())
+        self.connection.commit()
+        # pylint: enable=no-member
+        inserted = sum(1 for flag in flags if flag)
+        updated = len(flags) - inserted
+        return {
+            "inserted": inserted,
+            "updated": updated,
+            "unchanged": len(batch_data) - inserted - updated,
+        }
+
+    def _record_rejects(self, rejects: List[Tuple[Optional[int], str, str]]) -> None:
+        """
+        Write rejected lines to ``load_rejects``.
+
+        Failures are logged; the rejects are also in the log.
+
+        :param rejects: ``(line_number, error, source_line)`` per rejected row.
+        :type rejects: list[tuple[int | None, str, str]]
+        """
+        try:
             # pylint: disable=no-member
-            self.connection.rollback()
+            cursor = self.connection.cursor()
+            cursor.execute(LOAD_REJECTS_SQL)
+            cursor.executemany(
+                "INSERT INTO load_rejects (source_file, line_number, error, record) "
+                "VALUES (%s, %s, %s, %s)",
+                [(self._reject_source, line, error, source) for line, error, source in rejects],
+            )
+            self.connection.commit()
             # pylint: enable=no-member
-            return 0
+        except psycopg.Error as exc:
+            logger.error("Failed to record %d rejected rows: %s", len(rejects), exc)
+            self.connection.rollback()  # pylint: disable=no-member
 
     def get_table_stats(self) -> Dict[str, Any]:
         """
@@ -374,7 +882,8 @@ def main():
     Steps:
       1) Connect to the database
       2) Create the target table if needed
-      3) Load JSONL data with batch inserts
+      3) Load JSONL data with batch inserts (or, with ``--updates``, apply
+         re-pass corrections to rows already loaded)
       4) Print basic statistics
 
     :return: True if the load succeeded, False otherwise.
@@ -390,13 +899,30 @@ def main():
         default="llm_extend_applicant_data.jsonl",
         help="Input JSONL file (default: llm_extend_applicant_data.jsonl)",
     )
+    parser.add_argument(
+        "--updates",
+        default=None,
+        help="Apply re-pass corrections (llm_hosting/cli.py --repass output) instead of loading",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=LOAD_MODES,
+        default="executemany",
+        help="Write path: row, executemany, copy or copy-binary (default: executemany)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Rows staged, merged and committed per batch (default: 1000)",
+    )
 
     args = parser.parse_args()
 
     logger.info("Starting grad cafe data loading process")
 
     # Initialize data loader
-    loader = GradCafeDataLoader(DB_CONFIG)
+    loader = GradCafeDataLoader(DB_CONFIG, load_mode=args.mode)
 
     try:
         # Connect to database
@@ -409,9 +935,15 @@ def main():
             logger.error("Failed to create table. Exiting.")
             return False
 
+        # Re-pass corrections only update rows that are already loaded
+        if args.updates:
+            updated = loader.update_llm_fields_from_jsonl(args.updates)
+            logger.info("Applied re-pass corrections to %d rows", updated)
+            return True
+
         # Load data from specified file
         jsonl_file = args.input
-        if not loader.load_data_from_jsonl(jsonl_file):
+        if not loader.load_data_from_jsonl(jsonl_file, batch_size=args.batch_size):
             logger.error("Failed to load data. Exiting.")
             return False
 
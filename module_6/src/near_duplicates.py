@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+MinHash helpers for near-duplicate detection in cleaned Grad Cafe data.
+
+This module builds the character shingles and MinHash signatures used by
+:meth:`clean.GradCafeDataCleaner.find_near_duplicates`.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# pylint: disable=import-error
+from data_statistics import stable_hash64
+# pylint: enable=import-error
+
+# Fields compared by the optional near-duplicate (MinHash/LSH) pass
+NEAR_DUP_FIELDS = ("school", "major", "degree", "status", "date_added", "comments")
+
+
+def near_dup_shingles(entry: Dict[str, Any], size: int = 5) -> Set[str]:
+    """
+    Build character shingles over the fields used for near-duplicate detection.
+
+    :param entry: Cleaned entry dictionary.
+    :type entry: dict
+    :param size: Shingle length in characters (default: 5).
+    :type size: int
+    :return: Set of character shingles (empty if all fields are empty).
+    :rtype: set[str]
+    """
+    text = " | ".join(str(entry.get(field) or "").lower() for field in NEAR_DUP_FIELDS)
+    text = re.sub(r"\s+", " ", text).strip()
+    if not text.replace("|", "").strip():
+        return set()
+    if len(text) <= size:
+        return {text}
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+def minhash_signature(shingles: Set[str], num_perm: int) -> Tuple[int, ...]:
+    """
+    Compute a MinHash signature using one-permutation hashing.
+
+    Each shingle is hashed once and routed to one of ``num_perm`` bins, keeping the
+    minimum per bin; empty bins borrow from the next non-empty bin (rotation
+    densification). This costs O(shingles + num_perm) per entry instead of
+    O(shingles * num_perm) for classic MinHash.
+
+    :param shingles: Shingle set of the entry.
+    :type shingles: set[str]
+    :param num_perm: Signature length.
+    :type num_perm: int
+    :return: Signature tuple of length ``num_perm``.
+    :rtype: tuple[int, ...]
+    """
+    bins: List[Optional[int]] = [None] * num_perm
+    for shingle in shingles:
+        hashed = stable_hash64(shingle)
+        idx, value = hashed % num_perm, hashed // num_perm
+        if bins[idx] is None or value < bins[idx]:
+            bins[idx] = value
+
+    if None not in bins:
+        return tuple(bins)
+    if all(value is None for value in bins):
+        return tuple([0] * num_perm)
+
+    offset = 1 << 60
+    signature = []
+    for i in range(num_perm):
+        distance = 0
+        while bins[(i + distance) % num_perm] is None:
+            distance += 1
+        signature.append(bins[(i + distance) % num_perm] + distance * offset)
+    return tuple(signature)
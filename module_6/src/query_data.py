@@ -21,6 +21,42 @@ from config import DB_CONFIG
 # pylint: enable=import-error
 
 
+def canonical_source() -> sql.Composed:
+    """
+    ``applicant_data`` left-joined to its offline ``program_canonical`` mapping.
+
+    Columns present in both tables (``program``) must be qualified with
+    ``applicant_data`` when selecting from this source.
+
+    :return: Composable ``FROM`` clause body.
+    :rtype: psycopg.sql.Composed
+    """
+    return sql.SQL("{data} LEFT JOIN {canon} ON {canon_program} = {data_program}").format(
+        data=sql.Identifier('applicant_data'),
+        canon=sql.Identifier('program_canonical'),
+        canon_program=sql.Identifier('program_canonical', 'program'),
+        data_program=sql.Identifier('applicant_data', 'program'),
+    )
+
+
+def canonical_column(field: str) -> sql.Composed:
+    """
+    Canonical ``program`` or ``university`` for a row of :func:`canonical_source`.
+
+    Falls back to the row's own ``llm_generated_*`` value while its program is
+    still pending in ``program_canonical``.
+
+    :param field: ``"program"`` or ``"university"``.
+    :type field: str
+    :return: Composable ``COALESCE`` expression.
+    :rtype: psycopg.sql.Composed
+    """
+    return sql.SQL("COALESCE({canonical}, {generated})").format(
+        canonical=sql.Identifier('program_canonical', f'canonical_{field}'),
+        generated=sql.Identifier('applicant_data', f'llm_generated_{field}'),
+    )
+
+
 class GradCafeQueryAnalyzer:
     """
     Run predefined SQL analytics queries on Grad Café data.
@@ -164,7 +200,10 @@ class GradCafeQueryAnalyzer:
         """
         Q3: Average GPA, GRE, GRE V, GRE AW for applicants who provided them.
 
-        Applies sanity caps (GRE≤170, GRE V≤170, GRE AW≤6) and rounds to 2 decimals.
+        Filters out nonsense scores with the indexed validity flags computed at
+        clean time (current GRE scale, AW on the 0-6 scale) and rounds to 2 decimals.
+        ``gre`` also holds combined totals (260-340 on the current scale), so it is
+        additionally bounded to section scores to keep the average on one scale.
 
         :return: Row with ``(avg_gpa, avg_gre, avg_gre_v, avg_gre_aw)``.
         :rtype: tuple | None
@@ -178,9 +217,9 @@ class GradCafeQueryAnalyzer:
             ROUND(AVG({gre_aw_col})::numeric, 2) as avg_gre_aw
         FROM {table} 
         WHERE ({gpa_col} IS NOT NULL OR {gre_col} IS NOT NULL OR {gre_v_col} IS NOT NULL OR {gre_aw_col} IS NOT NULL)
-        AND ({gre_col} IS NULL OR {gre_col} <= {gre_max})
-        AND ({gre_v_col} IS NULL OR {gre_v_col} <= {gre_v_max})
-        AND ({gre_aw_col} IS NULL OR {gre_aw_col} <= {gre_aw_max})
+        AND ({gre_scale_col} IS NULL OR {gre_scale_col} = {gre_scale_new})
+        AND ({gre_col} IS NULL OR {gre_col} <= {gre_section_max})
+        AND {gre_aw_valid_col} IS NOT FALSE
         LIMIT {limit}
         """).format(
             table=sql.Identifier('applicant_data'),
@@ -188,9 +227,10 @@ class GradCafeQueryAnalyzer:
             gre_col=sql.Identifier('gre'),
             gre_v_col=sql.Identifier('gre_v'),
             gre_aw_col=sql.Identifier('gre_aw'),
-            gre_max=sql.Literal(170),
-            gre_v_max=sql.Literal(170),
-            gre_aw_max=sql.Literal(6),
+            gre_scale_col=sql.Identifier('gre_scale'),
+            gre_aw_valid_col=sql.Identifier('gre_aw_valid'),
+            gre_scale_new=sql.Literal('new'),
+            gre_section_max=sql.Literal(170),
             limit=sql.Literal(1)
         )
 
@@ -298,7 +338,7 @@ class GradCafeQueryAnalyzer:
         """
         Q7: Count of JHU Computer Science Masters applications.
 
-        Matches by program/university name or LLM-generated fields.
+        Matches by raw program name or the canonical names from ``program_canonical``.
 
         :return: Integer count.
         :rtype: int | None
@@ -320,10 +360,10 @@ class GradCafeQueryAnalyzer:
         AND {degree_col} ILIKE {masters_pattern}
         LIMIT {limit}
         """).format(
-            table=sql.Identifier('applicant_data'),
-            program_col=sql.Identifier('program'),
-            llm_univ_col=sql.Identifier('llm_generated_university'),
-            llm_prog_col=sql.Identifier('llm_generated_program'),
+            table=canonical_source(),
+            program_col=sql.Identifier('applicant_data', 'program'),
+            llm_univ_col=canonical_column('university'),
+            llm_prog_col=canonical_column('program'),
             degree_col=sql.Identifier('degree'),
             jh_pattern=sql.Literal('%Johns Hopkins%'),
             jhu_pattern=sql.Literal('%JHU%'),
@@ -364,10 +404,10 @@ class GradCafeQueryAnalyzer:
         AND {date_col} >= {date_2025}
         LIMIT {limit}
         """).format(
-            table=sql.Identifier('applicant_data'),
-            program_col=sql.Identifier('program'),
-            llm_univ_col=sql.Identifier('llm_generated_university'),
-            llm_prog_col=sql.Identifier('llm_generated_program'),
+            table=canonical_source(),
+            program_col=sql.Identifier('applicant_data', 'program'),
+            llm_univ_col=canonical_column('university'),
+            llm_prog_col=canonical_column('program'),
             degree_col=sql.Identifier('degree'),
             status_col=sql.Identifier('status'),
             date_col=sql.Identifier('date_added'),
@@ -412,11 +452,11 @@ class GradCafeQueryAnalyzer:
         AND {us_intl_col} != {empty_str}
         LIMIT {limit}
         """).format(
-            table=sql.Identifier('applicant_data'),
+            table=canonical_source(),
             us_intl_col=sql.Identifier('us_or_international'),
             term_col=sql.Identifier('term'),
-            program_col=sql.Identifier('program'),
-            llm_univ_col=sql.Identifier('llm_generated_university'),
+            program_col=sql.Identifier('applicant_data', 'program'),
+            llm_univ_col=canonical_column('university'),
             intl_pattern=sql.Literal('%International%'),
             term_pattern=sql.Literal('%Fall 2025%'),
             penn_state_pattern=sql.Literal('%Pennsylvania State%'),
@@ -454,9 +494,9 @@ class GradCafeQueryAnalyzer:
         AND {date_col} >= {date_2025}
         LIMIT {limit}
         """).format(
-            table=sql.Identifier('applicant_data'),
-            program_col=sql.Identifier('program'),
-            llm_univ_col=sql.Identifier('llm_generated_university'),
+            table=canonical_source(),
+            program_col=sql.Identifier('applicant_data', 'program'),
+            llm_univ_col=canonical_column('university'),
             status_col=sql.Identifier('status'),
             date_col=sql.Identifier('date_added'),
             penn_state_pattern=sql.Literal('%Pennsylvania State%'),
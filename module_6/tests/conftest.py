@@ -156,7 +156,10 @@ def mock_db_connection():
             gre_aw REAL,
             degree TEXT,
             llm_generated_program TEXT,
-            llm_generated_university TEXT
+            llm_generated_university TEXT,
+            gpa_scale TEXT,
+            gre_scale TEXT,
+            gre_aw_valid BOOLEAN
         )
     """
     )
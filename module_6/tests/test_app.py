@@ -0,0 +1,487 @@
+"""
+Test suite for llm_hosting/app.py: HTTP endpoints and the standardization pipeline
+(scripted and fake backends, no model download)
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+LLM_DIR = os.path.join(os.path.dirname(__file__), "..", "src", "llm_hosting")
+sys.path.insert(0, LLM_DIR)
+
+# Configuration is read at import: a deterministic instant backend and no on-disk stores.
+# The variables are set only while app.py is imported, so later tests see the real env
+APP_ENV = {
+    "LLM_BACKEND": "fake",
+    "FAKE_CALL_LATENCY_MS": "0",
+    "FAKE_ROW_LATENCY_MS": "0",
+    "LLM_CACHE_PATH": "",
+    "REPASS_DB_PATH": "",
+    "CLASSIFIER": "0",
+    "CANON_UNIS_PATH": os.path.join(LLM_DIR, "canon_universities.txt"),
+    "CANON_PROGS_PATH": os.path.join(LLM_DIR, "canon_programs.txt"),
+}
+ENV_BEFORE = {name: os.environ.get(name) for name in APP_ENV}
+with pytest.MonkeyPatch.context() as env:
+    for name, value in APP_ENV.items():
+        env.setenv(name, value)
+    # pylint: disable=import-error,wrong-import-position
+    import app as service
+    from backends import Backend, FakeBackend
+    from llm_cache import LLMCache
+    from program_parts import split_halves
+    import worker_pool
+    from repass import RepassQueue
+    # pylint: enable=import-error,wrong-import-position
+
+# pylint: disable=protected-access,redefined-outer-name
+
+
+@pytest.fixture
+def client():
+    """Flask test client for the standardizer."""
+    return service.app.test_client()
+
+
+class ScriptedBackend(Backend):  # pylint: disable=too-few-public-methods
+    """Backend that returns a fixed reply and records each prompt."""
+
+    name = "scripted"
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+
+    def complete(self, kind, user_content, max_tokens):
+        """Record the call and return the scripted reply."""
+        self.calls.append((kind, json.loads(user_content), max_tokens))
+        return self.reply
+
+
+def _use_backend(monkeypatch, backend):
+    """Make ``backend`` the loaded model for this test."""
+    backend.usage_hook = service._record_usage
+    monkeypatch.setattr(service, "_BACKEND", backend)
+    return backend
+
+
+def _counting():
+    """Return a function giving the change of each runtime counter since this call."""
+    before = service._counts()
+    return lambda: {k: v - before[k] for k, v in service._counts().items() if v != before[k]}
+
+
+def _rules_answer(text):
+    """The rules-only (JSON fallback) answer for ``text``, as the pipeline returns it."""
+    answer = service._degrade(text)
+    del answer["degraded"]
+    return answer
+
+
+@pytest.mark.web
+def test_ready_reports_503_until_warmup_finishes(client):
+    """/ready is 503 while the model is not loaded, then 200 with load and warmup timings."""
+    with patch.dict(service._READY, ready=False, warmup_seconds=None):
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.get_json()["backend"] == "fake"
+
+        service.warm_up()
+
+        response = client.get("/ready")
+        body = response.get_json()
+        assert response.status_code == 200
+        assert body["ready"] is True and body["loading"] is False
+        assert body["error"] is None
+        assert body["load_seconds"] is not None and body["warmup_seconds"] is not None
+
+
+@pytest.mark.web
+def test_ready_records_warmup_errors(client):
+    """A failed load leaves /ready at 503 with the error reported."""
+    with patch.dict(service._READY, ready=False), patch.object(
+        service, "_worker_warmup", side_effect=RuntimeError("no model")
+    ):
+        service.warm_up()
+        response = client.get("/ready")
+    assert response.status_code == 503
+    assert "no model" in response.get_json()["error"]
+
+
+@pytest.mark.web
+def test_app_env_does_not_leak_into_other_tests():
+    """The fake-backend settings apply to app.py only, not to os.environ."""
+    assert service.LLM_BACKEND == "fake"
+    assert {name: os.environ.get(name) for name in APP_ENV} == ENV_BEFORE
+
+
+@pytest.mark.web
+def test_standardize_returns_rows_and_dedup_report_as_json(client):
+    """Without streaming, all rows come back in one JSON body with the dedup report."""
+    rows = [{"program": "Math, MIT"}, {"program": "Math, MIT"}, None]
+    response = client.post("/standardize", json={"rows": rows})
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [row["llm-generated-program"] for row in body["rows"]] == ["Math", "Math", ""]
+    assert body["dedup"] == {"total": 3, "distinct": 2, "distinct_ratio": 0.6667}
+    assert client.post("/standardize", data="not json").get_json() == {
+        "rows": [],
+        "dedup": {"total": 0, "distinct": 0, "distinct_ratio": 1.0},
+    }
+
+
+def _sample(text, name):
+    """Value of the first sample line starting with ``name`` in a Prometheus scrape."""
+    for line in text.splitlines():
+        if line.startswith(name + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{name} not in /metrics")
+
+
+@pytest.mark.web
+def test_metrics_exposes_counters_and_latency_histograms(client):
+    """/metrics serves Prometheus text whose counters move with the rows standardized."""
+    duplicate = 'standardizer_rows_total{path="duplicate"}'
+    llm_rows = 'standardizer_rows_total{path="llm"}'
+    before = client.get("/metrics").get_data(as_text=True)
+
+    rows = [{"program": "Math, MIT"}, {"program": "Math, MIT"}, {"program": "Art, UBC"}]
+    assert client.post("/standardize", json={"rows": rows}).status_code == 200
+
+    response = client.get("/metrics")
+    text = response.get_data(as_text=True)
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    assert _sample(text, duplicate) - _sample(before, duplicate) == 1
+    assert _sample(text, llm_rows) - _sample(before, llm_rows) == 2
+    assert "# TYPE standardizer_row_latency_seconds histogram" in text
+    assert 'standardizer_row_latency_seconds_bucket{path="llm",le="+Inf"}' in text
+    assert "standardizer_request_seconds_count" in text
+    assert 'standardizer_queue_rows{queue="llm"} 0' in text
+    assert 0 <= _sample(text, "standardizer_llm_fallback_ratio") <= 1
+
+
+@pytest.mark.web
+@pytest.mark.parametrize(
+    "url,headers",
+    [("/standardize?stream=1", {}), ("/standardize", {"Accept": "application/x-ndjson"})],
+    ids=["stream-param", "accept-header"],
+)
+def test_standardize_streams_ndjson_with_distinct_ratio(client, url, headers):
+    """Streaming returns one NDJSON line per row, in order, with the distinct ratio header."""
+    rows = [{"program": "Math, MIT"}, {"program": "Physics, UBC"}] * 2
+    response = client.post(url, json=rows, headers=headers)
+
+    assert response.mimetype == "application/x-ndjson"
+    assert response.headers["X-Distinct-Ratio"] == "0.5"
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line["program"] for line in lines] == [row["program"] for row in rows]
+    assert [line["llm-generated-university"] for line in lines] == [
+        "Mit", "University of British Columbia"
+    ] * 2
+
+
+@pytest.mark.analysis
+def test_rules_first_answers_canonical_rows_without_the_model(monkeypatch):
+    """Rows whose names map confidently to the canon lists never reach the backend."""
+    backend = _use_backend(monkeypatch, ScriptedBackend("unused"))
+    delta = _counting()
+
+    results = service._standardize_many(
+        ["Mathematics, McGill University", "Info Studies, McG", "physics, ubc"]
+    )
+
+    assert not backend.calls
+    assert [(r["standardized_program"], r["standardized_university"]) for r in results] == [
+        ("Mathematics", "McGill University"),
+        ("Information Studies", "McGill University"),
+        ("Physics", "University of British Columbia"),
+    ]
+    assert delta() == {"input_rows": 3, "rows": 3, "rules_resolved": 3}
+
+
+@pytest.mark.analysis
+@pytest.mark.parametrize(
+    "text",
+    ["Mathematics", "Underwater Basketry, McGill University", "Mathematics, Nowhere College"],
+    ids=["no-university", "unknown-program", "unknown-university"],
+)
+def test_rule_misses_fall_through_to_the_llm(monkeypatch, text):
+    """Rows the rules cannot settle confidently are answered by the model."""
+    _use_backend(monkeypatch, FakeBackend(split_halves, call_latency_s=0, row_latency_s=0))
+    delta = _counting()
+
+    assert service._rules_resolve(text) is None
+    service._standardize_many([text])
+
+    counts = delta()
+    assert "rules_resolved" not in counts
+    assert (counts["llm_calls"], counts["llm_rows"]) == (1, 1)
+    assert counts["prompt_tokens"] > 0 and counts["completion_tokens"] > 0
+
+
+@pytest.mark.analysis
+def test_rules_first_off_sends_canonical_rows_to_the_llm(monkeypatch):
+    """With RULES_FIRST=0 every row goes to the model."""
+    backend = _use_backend(monkeypatch, ScriptedBackend("{}"))
+    monkeypatch.setattr(service, "RULES_FIRST", False)
+
+    service._standardize("Mathematics, McGill University")
+
+    assert backend.calls == [
+        ("single", {"program": "Mathematics, McGill University"}, service.MAX_TOKENS_ROW)
+    ]
+
+
+@pytest.mark.analysis
+def test_single_row_reply_is_parsed_through_chatter_and_normalized(monkeypatch):
+    """A JSON object inside extra text is used, then mapped to the canon lists."""
+    reply = (
+        'Sure! {"standardized_program": "mathematics", '
+        '"standardized_university": "mcg"} Hope this helps.'
+    )
+    backend = _use_backend(monkeypatch, ScriptedBackend(reply))
+    delta = _counting()
+
+    result = service._standardize("Math at McGill")
+
+    assert backend.calls[0][0] == "single"
+    assert result == {
+        "standardized_program": "Mathematics",
+        "standardized_university": "McGill University",
+    }
+    assert "fallback_rows" not in delta()
+
+
+@pytest.mark.analysis
+@pytest.mark.parametrize(
+    "reply",
+    ["I cannot help with that.", '{"standardized_program": "Math"', "[1, 2]"],
+    ids=["no-json", "truncated-object", "not-an-object"],
+)
+def test_single_row_unparsable_reply_falls_back_to_rules(monkeypatch, reply):
+    """A reply that is not a JSON object gets the rules-only answer and is counted."""
+    _use_backend(monkeypatch, ScriptedBackend(reply))
+    delta = _counting()
+
+    result = service._standardize("Underwater Basketry, Nowhere College")
+
+    assert delta()["fallback_rows"] == 1
+    assert result == _rules_answer("Underwater Basketry, Nowhere College")
+
+
+BATCH = ["Underwater Basketry, Nowhere College", "Glass Blowing, Somewhere Institute"]
+GOOD_ROW = '{"standardized_program": "Basketry", "standardized_university": "Nowhere College"}'
+
+
+@pytest.mark.analysis
+@pytest.mark.parametrize(
+    "reply,fallback_rows",
+    [
+        ('[{"standardized_program": "Basketry", ', [0, 1]),
+        (f"[{GOOD_ROW}]", [0, 1]),
+        (GOOD_ROW, [0, 1]),
+        ('["Basketry", 7]', [0, 1]),
+        (f"Here you go: [{GOOD_ROW}, null]", [1]),
+        (f'[{GOOD_ROW}, {{"standardized_program": ""}}]', [1]),
+    ],
+    ids=[
+        "malformed-array",
+        "too-few-elements",
+        "object-not-array",
+        "non-dict-elements",
+        "one-null-element",
+        "one-empty-element",
+    ],
+)
+def test_batch_reply_falls_back_per_row(monkeypatch, reply, fallback_rows):
+    """Rows the batch reply does not answer get the rules answer; each one is counted."""
+    backend = _use_backend(monkeypatch, ScriptedBackend(reply))
+    delta = _counting()
+
+    results = service._standardize_many(BATCH, batch_size=2)
+
+    assert backend.calls == [
+        (
+            "batch",
+            [{"program": text} for text in BATCH],
+            service.MAX_TOKENS_BATCH_ROW * 2 + 16,
+        )
+    ]
+    counts = delta()
+    assert counts["fallback_rows"] == len(fallback_rows)
+    assert (counts["llm_calls"], counts["llm_rows"]) == (1, 2)
+    for i, result in enumerate(results):
+        if i in fallback_rows:
+            assert result == _rules_answer(BATCH[i])
+        else:
+            assert result == {
+                "standardized_program": "Basketry",
+                "standardized_university": "Nowhere College",
+            }
+
+
+SLOW_ROWS = ["Underwater Basketry, Nowhere College", "Glass Blowing, Somewhere Institute"]
+
+
+def _wait_for(condition, timeout=5.0):
+    """Poll ``condition`` until it is true (or fail after ``timeout`` seconds)."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting"
+        time.sleep(0.01)
+
+
+@pytest.mark.analysis
+def test_batch_timeout_is_the_rows_budget_capped_by_the_deadline():
+    """Each batch waits for its rows' budget, but never past the request deadline."""
+    now = time.monotonic()
+    assert service._batch_timeout(3, None, None) is None
+    assert service._batch_timeout(3, None, 0.5) == pytest.approx(1.5)
+    assert service._batch_timeout(3, now + 60, 0.5) == pytest.approx(1.5)
+    assert service._batch_timeout(3, now + 1, None) == pytest.approx(1, abs=0.1)
+    assert service._batch_timeout(3, now - 1, 0.5) == 0.0
+
+
+@pytest.mark.analysis
+@pytest.mark.parametrize(
+    "budget", [{"deadline": 0.05}, {"row_budget_s": 0.05}], ids=["deadline", "row-budget"]
+)
+def test_slow_model_degrades_rows_and_caches_the_late_answer(monkeypatch, tmp_path, budget):
+    """Rows past their budget get the rules answer now; the running batch still fills the cache.
+
+    Rows settled by the rules are unaffected, the batch still queued is dropped,
+    and the one already running finishes in the background into the cache.
+    """
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"), "test")
+    monkeypatch.setattr(service, "_CACHE", cache)
+    _use_backend(monkeypatch, FakeBackend(split_halves, call_latency_s=0.3, row_latency_s=0))
+    if "deadline" in budget:
+        budget = {"deadline": time.monotonic() + budget["deadline"]}
+    delta = _counting()
+
+    results = service._standardize_many(
+        ["Mathematics, McGill University"] + SLOW_ROWS, batch_size=1, **budget
+    )
+
+    assert results[0] == {
+        "standardized_program": "Mathematics",
+        "standardized_university": "McGill University",
+    }
+    assert results[1:] == [{**_rules_answer(text), "degraded": True} for text in SLOW_ROWS]
+    _wait_for(lambda: delta().get("late_rows"))
+    counts = delta()
+    assert (counts["shed_rows"], counts["late_rows"], counts["rules_resolved"]) == (2, 1, 1)
+    assert "llm_calls" not in counts and counts.get("llm_queued_rows", 0) == 0
+    assert cache.get(SLOW_ROWS[0]) == {
+        "standardized_program": "Underwater Basketry",
+        "standardized_university": "Nowhere College",
+    }
+    assert cache.get(SLOW_ROWS[1]) is None
+    cache.close()
+
+
+@pytest.mark.analysis
+def test_degraded_rows_are_flagged_and_queued_for_the_repass(monkeypatch, tmp_path):
+    """Degraded rows carry llm-degraded and land in the re-pass queue, reported in /stats."""
+    _use_backend(monkeypatch, FakeBackend(split_halves, call_latency_s=0.2, row_latency_s=0))
+    monkeypatch.setattr(service, "REPASS_DB_PATH", str(tmp_path / "repass.sqlite3"))
+    monkeypatch.setitem(service._QUEUES, "repass", RepassQueue(service.REPASS_DB_PATH))
+    rows = [{"program": SLOW_ROWS[0], "url": "u1"}, {"program": "Physics, UBC", "url": "u2"}]
+    delta = _counting()
+
+    out = service.standardize_rows(rows, 1, time.monotonic() + 0.02)
+    _wait_for(lambda: delta().get("late_rows"))
+
+    assert out[0]["llm-degraded"] is True
+    assert "llm-degraded" not in out[1]
+    assert service._get_repass().pending(10) == [("url:u1", SLOW_ROWS[0])]
+    assert service.stats()["shedding"]["repass"] == {
+        "queued": 1, "done": 0, "exported": 0, "failures": 0
+    }
+    assert "standardizer_repass_failures_total 0" in service._metrics_text()
+
+
+@pytest.mark.analysis
+def test_cache_late_ignores_failed_and_cancelled_batches(monkeypatch, tmp_path):
+    """Only batches that finished with results are kept."""
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"), "test")
+    monkeypatch.setattr(service, "_CACHE", cache)
+    failed, cancelled = Future(), Future()
+    failed.set_exception(RuntimeError("model crashed"))
+    cancelled.cancel()
+    delta = _counting()
+
+    service._cache_late(SLOW_ROWS[:1], failed)
+    service._cache_late(SLOW_ROWS[:1], cancelled)
+
+    assert not delta()
+    assert cache.stats()["entries"] == 0
+    cache.close()
+
+
+@pytest.mark.analysis
+def test_worker_batch_returns_the_counters_it_moved(monkeypatch):
+    """A pool worker reports its own counter deltas so the parent can add them up."""
+    _use_backend(monkeypatch, ScriptedBackend("not json"))
+    delta = _counting()
+
+    results, deltas, seconds = service._worker_batch(["Physics, Nowhere College"])
+
+    assert deltas == delta() and deltas["fallback_rows"] == 1
+    assert results == [_rules_answer("Physics, Nowhere College")]
+    assert seconds >= 0
+
+
+@pytest.mark.analysis
+def test_worker_pool_splits_threads_warms_each_worker_and_runs_batches(monkeypatch):
+    """With LLM_WORKERS > 1 batches go to the pool, started once with a thread share each.
+
+    The workers run as threads of this process (an injected executor) so the
+    worker-side code is exercised here too.
+    """
+
+    def in_process_executor(max_workers, mp_context, initializer, initargs):
+        del mp_context
+        return ThreadPoolExecutor(max_workers, initializer=initializer, initargs=initargs)
+
+    budgets = {}
+    init_worker = service._init_worker
+
+    def record_budget(n_threads):
+        budgets[threading.get_ident()] = n_threads
+        init_worker(n_threads)
+
+    monkeypatch.setattr(worker_pool, "ProcessPoolExecutor", in_process_executor)
+    monkeypatch.setattr(service, "_init_worker", record_budget)
+    monkeypatch.setattr(service, "LLM_WORKERS", 2)
+    monkeypatch.setattr(service, "N_THREADS", 5)
+    monkeypatch.setitem(service._WORKERS, "pool", None)
+    monkeypatch.setitem(service._WORKERS, "n_threads", 5)
+    monkeypatch.setitem(service._READY, "ready", False)
+    monkeypatch.setitem(service._READY, "warmup_seconds", None)
+    _use_backend(monkeypatch, FakeBackend(split_halves, call_latency_s=0, row_latency_s=0))
+    rows = [{"program": text} for text in SLOW_ROWS + ["Weaving, Elsewhere University"]]
+    try:
+        service.warm_up()
+        delta = _counting()
+        out = service.standardize_rows(rows, batch_size=2)
+        pool = service._WORKERS["pool"]
+    finally:
+        if service._WORKERS["pool"] is not None:
+            service._WORKERS["pool"].shutdown()
+
+    assert sorted(budgets.values()) == [2, 3] and pool.threads == [3, 2]
+    assert service._READY["ready"] is True and service._READY["warmup_seconds"] is not None
+    assert [row["llm-generated-program"] for row in out] == [
+        "Underwater Basketry", "Glass Blowing", "Weaving"
+    ]
+    # Exact LLM counts are not checked: in-process workers share (and re-add) the parent's
+    assert delta()["input_rows"] == 3 and delta()["llm_calls"] >= 2
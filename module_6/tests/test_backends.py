@@ -0,0 +1,134 @@
+"""
+Test suite for llm_hosting/backends.py module
+"""
+
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "llm_hosting"))
+
+# pylint: disable=import-error,wrong-import-position
+from backends import FakeBackend, LlamaCppBackend, RulesBackend, create_backend
+from program_parts import split_halves
+# pylint: enable=import-error,wrong-import-position
+
+# pylint: disable=protected-access
+
+PREFIXES = {
+    "single": [{"role": "system", "content": "one"}],
+    "batch": [{"role": "system", "content": "many"}],
+}
+CHAT_TURN = "<|{role}|>{content}<|end|>"
+
+
+def _llama(prefix_cache=True):
+    """A llama.cpp backend wired to a stub model instead of a downloaded GGUF."""
+    backend = LlamaCppBackend(
+        repo="repo",
+        filename="model.gguf",
+        n_ctx=512,
+        n_threads=1,
+        n_gpu_layers=0,
+        prefix_messages=PREFIXES,
+        chat_turn=CHAT_TURN,
+        chat_stop=["<|end|>"],
+        grammars=None,
+        prefix_cache=prefix_cache,
+    )
+    llm = MagicMock()
+    llm.tokenize.side_effect = lambda text, add_bos, special: [len(text), int(add_bos)]
+    llm.save_state.side_effect = lambda: f"state-{llm.eval.call_count}"
+    usage = {"prompt_tokens": 5, "completion_tokens": 2}
+    llm.create_completion.return_value = {"choices": [{"text": " {} "}], "usage": usage}
+    llm.create_chat_completion.return_value = {
+        "choices": [{"message": {"content": "[]"}}],
+        "usage": usage,
+    }
+    backend._llm = llm
+    return backend, llm
+
+
+@pytest.mark.analysis
+def test_create_backend_selects_by_name():
+    """LLM_BACKEND names map to backends; only the selected one's options are used."""
+    assert isinstance(create_backend("rules", split_halves), RulesBackend)
+    fake = create_backend("fake", split_halves, fake={"call_latency_s": 0, "row_latency_s": 0})
+    assert isinstance(fake, FakeBackend) and fake.call_latency_s == 0
+    llama = create_backend(
+        "llama",
+        split_halves,
+        llama={
+            "repo": "r", "filename": "f.gguf", "n_ctx": 64, "n_threads": 2, "n_gpu_layers": 0,
+            "prefix_messages": PREFIXES, "chat_turn": CHAT_TURN, "chat_stop": [],
+            "grammars": None,
+        },
+    )
+    assert isinstance(llama, LlamaCppBackend)
+    assert llama.llama_options["n_threads"] == 2
+    assert llama._llm is None  # nothing is imported or downloaded until load()
+    with pytest.raises(ValueError, match="unknown LLM_BACKEND"):
+        create_backend("gpt", split_halves)
+
+
+@pytest.mark.analysis
+def test_fake_backend_replies_like_the_model_and_reports_usage():
+    """The fake backend answers single and batch prompts in the model's JSON format."""
+    usage = []
+    backend = FakeBackend(split_halves, call_latency_s=0, row_latency_s=0)
+    backend.usage_hook = lambda prompt, completion: usage.append((prompt, completion))
+
+    single = json.loads(backend.complete("single", json.dumps({"program": "Math at MIT"}), 64))
+    batch = json.loads(
+        backend.complete("batch", json.dumps([{"program": "CS, UBC"}, {"program": "X"}]), 64)
+    )
+
+    assert single == {"standardized_program": "Math", "standardized_university": "MIT"}
+    assert [row["standardized_university"] for row in batch] == ["UBC", ""]
+    assert len(usage) == 2 and all(p > 0 and c > 0 for p, c in usage)
+
+
+@pytest.mark.analysis
+def test_llama_prefix_state_is_saved_once_and_restored_per_completion():
+    """Each prefix is evaluated once; later completions restore its saved state."""
+    backend, llm = _llama()
+
+    backend.complete("single", '{"program": "a"}', max_tokens=16)
+    backend.complete("single", '{"program": "b"}', max_tokens=16)
+    backend.complete("batch", '[{"program": "c"}]', max_tokens=16)
+
+    # One reset+eval per prefix kind, not per completion
+    assert llm.eval.call_count == 2
+    restored = [c[0][0] for c in llm.load_state.call_args_list]
+    assert restored == ["state-1", "state-1", "state-2"]
+    prompt = llm.create_completion.call_args_list[0][1]["prompt"]
+    prefix_tokens = llm.eval.call_args_list[0][0][0]
+    assert prompt[: len(prefix_tokens)] == prefix_tokens
+    assert llm.create_completion.call_args[1]["stop"] == ["<|end|>"]
+
+
+@pytest.mark.analysis
+def test_llama_without_prefix_cache_sends_full_chat():
+    """With the prefix cache off every call sends the whole chat and saves no state."""
+    usage = []
+    backend, llm = _llama(prefix_cache=False)
+    backend.usage_hook = lambda prompt, completion: usage.append((prompt, completion))
+
+    assert backend.complete("batch", "[]", max_tokens=8) == "[]"
+
+    messages = llm.create_chat_completion.call_args[1]["messages"]
+    assert messages == PREFIXES["batch"] + [{"role": "user", "content": "[]"}]
+    llm.save_state.assert_not_called()
+    assert usage == [(5, 2)]
+
+
+@pytest.mark.analysis
+def test_llama_warmup_evaluates_every_prefix():
+    """Warmup saves both prefix states before the first real request."""
+    backend, llm = _llama()
+    backend.warmup('{"program": "x"}')
+    assert llm.eval.call_count == 2
+    assert llm.create_completion.call_args[1]["max_tokens"] == 8
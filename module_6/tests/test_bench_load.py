@@ -0,0 +1,114 @@
+"""
+Test suite for bench_load.py module
+Runs the benchmark against a mocked database connection
+"""
+
+import json
+import os
+import runpy
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# pylint: disable=import-error,wrong-import-position
+import bench_load
+# pylint: enable=import-error,wrong-import-position
+
+BENCH_PATH = os.path.join(os.path.dirname(__file__), "..", "src", "bench_load.py")
+
+
+def _loader(connects=True, creates=True, loads=True):
+    """Mocked GradCafeDataLoader instance with the given outcomes."""
+    loader = MagicMock()
+    loader.connect_to_database.return_value = connects
+    loader.create_table.return_value = creates
+    loader.load_data_from_jsonl.return_value = loads
+    return loader
+
+
+@pytest.mark.db
+def test_write_jsonl_writes_synthetic_records(tmp_path):
+    """Synthetic rows are valid JSONL shaped like the scraper output."""
+    path = tmp_path / "rows.jsonl"
+    bench_load.write_jsonl(str(path), 5)
+
+    rows = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert len(rows) == 5
+    assert rows[0] == bench_load.synthetic_record(0)
+    assert len({row["url"] for row in rows}) == 5
+    assert {"llm-generated-program", "llm-generated-university"} <= set(rows[1])
+
+
+@pytest.mark.db
+def test_time_load_uses_scratch_schema_and_drops_it(tmp_path):
+    """The load runs in a fresh scratch schema, which is dropped afterwards."""
+    loader = _loader()
+    with patch.object(bench_load, "GradCafeDataLoader", return_value=loader) as cls:
+        elapsed = bench_load.time_load(str(tmp_path / "rows.jsonl"), "copy", 500)
+
+    assert elapsed >= 0
+    cls.assert_called_once_with(bench_load.DB_CONFIG, load_mode="copy")
+    loader.load_data_from_jsonl.assert_called_once_with(
+        str(tmp_path / "rows.jsonl"), batch_size=500
+    )
+    statements = [c[0][0] for c in loader.connection.execute.call_args_list]
+    assert [statement.as_string(None) for statement in statements] == [
+        'DROP SCHEMA IF EXISTS "bench_load" CASCADE',
+        'CREATE SCHEMA "bench_load"',
+        'SET search_path TO "bench_load"',
+        'DROP SCHEMA IF EXISTS "bench_load" CASCADE',
+    ]
+    loader.connection.rollback.assert_called_once()
+    loader.close_connection.assert_called_once()
+
+
+@pytest.mark.db
+@pytest.mark.parametrize(
+    "outcomes,message",
+    [
+        ({"connects": False}, "Failed to connect to database"),
+        ({"creates": False}, "Failed to create table"),
+        ({"loads": False}, "Load failed in mode row"),
+    ],
+    ids=["connect", "create", "load"],
+)
+def test_time_load_raises_on_failures(outcomes, message):
+    """Connection, schema and load failures raise; the scratch schema is still cleaned up."""
+    loader = _loader(**outcomes)
+    with patch.object(bench_load, "GradCafeDataLoader", return_value=loader):
+        with pytest.raises(RuntimeError, match=message):
+            bench_load.time_load("rows.jsonl", "row", 10)
+    if outcomes.get("connects", True):
+        loader.close_connection.assert_called_once()
+    else:
+        loader.connection.execute.assert_not_called()
+
+
+@pytest.mark.db
+def test_main_prints_one_line_per_mode_and_size(capsys):
+    """Running the script times every mode at every row count and prints rows/sec."""
+    argv = ["bench_load.py", "--rows", "3", "4", "--modes", "executemany", "copy"]
+    with patch("sys.argv", argv), patch("load_data.GradCafeDataLoader", return_value=_loader()):
+        runpy.run_path(BENCH_PATH, run_name="__main__")
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(line["rows"], line["mode"]) for line in lines] == [
+        (3, "executemany"), (3, "copy"), (4, "executemany"), (4, "copy")
+    ]
+    assert all(line["batch_size"] == 1000 and line["rows_per_sec"] > 0 for line in lines)
+
+
+@pytest.mark.db
+def test_main_sweeps_batch_sizes(capsys):
+    """Each mode is timed at every --batch-size given."""
+    argv = ["bench_load.py", "--rows", "3", "--modes", "copy", "--batch-size", "1", "50000"]
+    loader = _loader()
+    with patch("sys.argv", argv), patch("load_data.GradCafeDataLoader", return_value=loader):
+        runpy.run_path(BENCH_PATH, run_name="__main__")
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(line["mode"], line["batch_size"]) for line in lines] == [("copy", 1), ("copy", 50000)]
+    assert [c[1]["batch_size"] for c in loader.load_data_from_jsonl.call_args_list] == [1, 50000]
@@ -0,0 +1,189 @@
+"""
+Test suite for canonicalize.py module
+"""
+
+import json
+import os
+import runpy
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# pylint: disable=import-error,wrong-import-position
+import canonicalize
+from canonicalize import ProgramCanonicalizer, is_affected, main, read_canon_names
+# pylint: enable=import-error,wrong-import-position
+
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture
+def llm_dir(tmp_path):
+    """A directory with small canonical lists."""
+    (tmp_path / "canon_universities.txt").write_text(
+        "Johns Hopkins University\nMcGill University\n\n"
+    )
+    (tmp_path / "canon_programs.txt").write_text("Computer Science\nMathematics\n")
+    return str(tmp_path)
+
+
+@pytest.mark.db
+def test_read_canon_names(llm_dir):
+    """Canonical lists are read per kind, skipping blank lines."""
+    names = read_canon_names(llm_dir)
+    assert names == {
+        "university": ["Johns Hopkins University", "McGill University"],
+        "program": ["Computer Science", "Mathematics"],
+    }
+
+
+@pytest.mark.db
+def test_is_affected_only_for_misses_and_similar_names():
+    """Only non-canonical values and raw halves resembling a new name are recomputed."""
+    old = ["Johns Hopkins University"]
+    new = ["Georgetown University"]
+    assert is_affected("CS, Georgetown", "Johns Hopkins University", new, old, "university")
+    assert is_affected("CS, Gtown", "Unknown", new, old, "university")
+    assert not is_affected("CS, JHU", "Johns Hopkins University", new, old, "university")
+    assert not is_affected("CS, Georgetown", "Unknown", [], old, "university")
+    # Halves are split like the standardizer does: " at " separates too
+    assert is_affected("CS at Georgetown", "Johns Hopkins University", new, old, "university")
+    # No university half to compare
+    assert not is_affected("Computer Science", "Johns Hopkins University", new, old, "university")
+
+
+@pytest.mark.db
+def test_resolve_parses_cli_output_and_skips_degraded(llm_dir):
+    """Each program is resolved once through the CLI; degraded and non-JSON rows stay pending."""
+    output = "\n".join(
+        json.dumps(row)
+        for row in [
+            {
+                "program": "CS, JHU",
+                "llm-generated-program": "Computer Science",
+                "llm-generated-university": "Johns Hopkins University",
+            },
+            {"program": "Math, McG", "llm-degraded": True, "llm-generated-program": "Math"},
+        ]
+    ) + "\n\nllama_model_load: stray log line\n"
+    canonicalizer = ProgramCanonicalizer(MagicMock(), llm_dir)
+    with patch("canonicalize.subprocess.run") as mock_run:
+        mock_run.return_value = MagicMock(returncode=0, stdout=output, stderr="")
+        mappings = canonicalizer.resolve(["CS, JHU", "Math, McG"])
+
+    assert mappings == {"CS, JHU": ("Computer Science", "Johns Hopkins University")}
+    assert mock_run.call_args[1]["cwd"] == llm_dir
+    assert canonicalizer.resolve([]) == {}
+
+    with patch("canonicalize.subprocess.run") as mock_run:
+        mock_run.return_value = MagicMock(returncode=1, stdout="", stderr="boom")
+        with pytest.raises(RuntimeError):
+            canonicalizer.resolve(["CS, JHU"])
+
+
+@pytest.mark.db
+def test_refresh_resolves_pending_and_affected(llm_dir):
+    """A refresh resolves pending programs plus mappings touched by new names."""
+    cursor = MagicMock()
+    cursor.rowcount = 1
+    cursor.fetchall.side_effect = [
+        [("Math, McG",)],  # pending
+        [("university", "Johns Hopkins University"), ("program", "Computer Science"),
+         ("program", "Mathematics")],  # snapshot: McGill is new
+        [
+            ("CS, JHU", "Computer Science", "Johns Hopkins University"),
+            ("CS, McGill", "Computer Science", "Unknown"),
+        ],  # resolved mappings
+    ]
+    connection = MagicMock()
+    connection.cursor.return_value = cursor
+    canonicalizer = ProgramCanonicalizer(connection, llm_dir)
+    resolved = {
+        "Math, McG": ("Mathematics", "McGill University"),
+        "CS, McGill": ("Computer Science", "McGill University"),
+    }
+    with patch.object(canonicalizer, "resolve", return_value=resolved) as mock_resolve:
+        counts = canonicalizer.refresh()
+
+    mock_resolve.assert_called_once_with(["Math, McG", "CS, McGill"])
+    assert counts == {"registered": 1, "pending": 1, "affected": 1, "resolved": 2}
+    upserts = cursor.executemany.call_args_list[0][0][1]
+    assert ("CS, McGill", "Computer Science", "McGill University") in upserts
+    snapshot = cursor.executemany.call_args_list[1][0][1]
+    assert ("university", "McGill University") in snapshot
+
+
+@pytest.mark.db
+def test_refresh_keeps_snapshot_when_affected_rows_degrade(llm_dir):
+    """New names stay new until every affected mapping was recomputed."""
+    cursor = MagicMock()
+    cursor.fetchall.side_effect = [
+        [],
+        [],
+        [("CS, McGill", "Computer Science", "Unknown")],
+    ]
+    connection = MagicMock()
+    connection.cursor.return_value = cursor
+    canonicalizer = ProgramCanonicalizer(connection, llm_dir)
+    with patch.object(canonicalizer, "resolve", return_value={}):
+        counts = canonicalizer.refresh()
+
+    assert counts["affected"] == 1 and counts["resolved"] == 0
+    cursor.executemany.assert_not_called()
+
+
+@pytest.mark.db
+def test_refresh_full_recomputes_every_mapping(llm_dir):
+    """--full resolves every stored program, and nothing is affected without new names."""
+    cursor = MagicMock()
+    cursor.rowcount = 0
+    cursor.fetchall.side_effect = [[("Math, McG",)], [("CS, JHU",), ("Math, McG",)]]
+    connection = MagicMock()
+    connection.cursor.return_value = cursor
+    canonicalizer = ProgramCanonicalizer(connection, llm_dir)
+    resolved = {
+        "CS, JHU": ("Computer Science", "Johns Hopkins University"),
+        "Math, McG": ("Mathematics", "McGill University"),
+    }
+    with patch.object(canonicalizer, "resolve", return_value=resolved) as mock_resolve:
+        counts = canonicalizer.refresh(full=True)
+
+    mock_resolve.assert_called_once_with(["Math, McG", "CS, JHU"])
+    assert counts == {"registered": 0, "pending": 1, "affected": 2, "resolved": 2}
+    assert canonicalizer.affected_programs({"university": [], "program": []}, {}) == []
+
+
+@pytest.mark.db
+@pytest.mark.parametrize("full", [False, True], ids=["incremental", "full"])
+def test_main_prints_the_refresh_counts(capsys, full):
+    """main() refreshes over a DB_CONFIG connection and prints the counts as JSON."""
+    argv = ["canonicalize.py"] + (["--full"] if full else [])
+    counts = {"registered": 1, "pending": 1, "affected": 0, "resolved": 1}
+    with patch("sys.argv", argv), patch("canonicalize.psycopg.connect") as connect, patch.object(
+        ProgramCanonicalizer, "refresh", return_value=counts
+    ) as refresh:
+        assert main() is True
+
+    connect.assert_called_once_with(**canonicalize.DB_CONFIG)
+    refresh.assert_called_once_with(full=full)
+    assert json.loads(capsys.readouterr().out) == counts
+
+
+@pytest.mark.db
+def test_main_reports_failures_and_sets_the_exit_code():
+    """A failed refresh returns False, and the script exits with status 1."""
+    with patch("sys.argv", ["canonicalize.py"]), patch.object(
+        ProgramCanonicalizer, "refresh", side_effect=RuntimeError("LLM standardization failed")
+    ), patch("canonicalize.psycopg.connect"):
+        assert main() is False
+
+    path = os.path.join(os.path.dirname(__file__), "..", "src", "canonicalize.py")
+    with patch("sys.argv", ["canonicalize.py"]), patch(
+        "psycopg.connect", side_effect=canonicalize.psycopg.OperationalError("no database")
+    ):
+        with pytest.raises(SystemExit) as exit_info:
+            runpy.run_path(path, run_name="__main__")
+    assert exit_info.value.code == 1
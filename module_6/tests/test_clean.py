@@ -13,8 +13,17 @@ import pytest
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 # pylint: disable=import-error,wrong-import-position
-from clean import GradCafeDataCleaner, main
-# pylint: disable=protected-access,too-many-public-methods
+from clean import (
+    CLEAN_RULE_VERSIONS,
+    GradCafeDataCleaner,
+    classify_gpa_scale,
+    classify_gre_scale,
+    content_hash,
+    is_valid_gre_aw,
+    main,
+)
+from near_duplicates import minhash_signature, near_dup_shingles
+# pylint: disable=protected-access,too-many-public-methods,too-many-lines
 # pylint: enable=import-error,wrong-import-position
 
 
@@ -248,6 +257,75 @@ class TestGradCafeDataCleaner:
             cleaner._extract_gre_score("No score", "V") == "No score"
         )  # Returns original when no numeric match
 
+    def test_to_float(self, cleaner):
+        """Extracted score strings become floats; non-numeric values become None."""
+        assert cleaner._to_float("3.85") == 3.85  # pylint: disable=protected-access
+        assert cleaner._to_float("N/A") is None  # pylint: disable=protected-access
+        assert cleaner._to_float(None) is None  # pylint: disable=protected-access
+
+    def test_normalize_date(self, cleaner):
+        """Known date layouts are converted to ISO; unknown text is kept."""
+        assert cleaner._normalize_date("September 25, 2025") == "2025-09-25"  # pylint: disable=protected-access
+        assert cleaner._normalize_date("16 Mar 2025") == "2025-03-16"  # pylint: disable=protected-access
+        assert cleaner._normalize_date("2025-03-16") == "2025-03-16"  # pylint: disable=protected-access
+        assert cleaner._normalize_date("sometime") == "sometime"  # pylint: disable=protected-access
+        assert cleaner._normalize_date("") is None  # pylint: disable=protected-access
+
+    def test_normalize_status_date(self, cleaner):
+        """Status dates without a year take it from date_added."""
+        normalize = cleaner._normalize_status_date  # pylint: disable=protected-access
+        assert normalize("25 Sep", "2025-09-25") == "2025-09-25"
+        assert normalize("4 Apr", "2025-09-24") == "2025-04-04"
+        # A December decision posted in January belongs to the previous year
+        assert normalize("20 Dec", "2026-01-05") == "2025-12-20"
+        assert normalize("29 Feb", "2024-03-01") == "2024-02-29"
+        assert normalize("15 Mar 2025", None) == "2025-03-15"
+        # Unresolvable values are kept as text
+        assert normalize("25 Sep", None) == "25 Sep"
+        assert normalize("29 Feb", "2025-03-01") == "29 Feb"
+        assert normalize("soon", "2025-03-01") == "soon"
+        assert normalize("", "2025-03-01") is None
+
+    def test_classify_gpa_scale(self):
+        """GPAs are bucketed by reporting scale."""
+        assert classify_gpa_scale(3.85) == "4.0"
+        assert classify_gpa_scale(8.7) == "10"
+        assert classify_gpa_scale(91.0) == "100"
+        assert classify_gpa_scale(0.0) == "invalid"
+        assert classify_gpa_scale(420.0) == "invalid"
+        assert classify_gpa_scale(None) is None
+
+    def test_classify_gre_scale(self):
+        """GRE scores are classified as new, old, or invalid."""
+        assert classify_gre_scale(None, 165.0, 170.0) == "new"
+        assert classify_gre_scale(330.0, None, None) == "new"
+        assert classify_gre_scale(None, 600.0, 720.0) == "old"
+        assert classify_gre_scale(1400.0, None, None) == "old"
+        assert classify_gre_scale(None, 165.0, 720.0) == "invalid"  # mixed scales
+        assert classify_gre_scale(None, 90.0, None) == "invalid"
+        assert classify_gre_scale(None, None, None) is None
+
+    def test_is_valid_gre_aw(self):
+        """AW scores must be on the 0-6 half-point scale."""
+        assert is_valid_gre_aw(4.5) is True
+        assert is_valid_gre_aw(4.3) is False
+        assert is_valid_gre_aw(7.0) is False
+        assert is_valid_gre_aw(None) is None
+
+    def test_add_quality_flags(self, cleaner):
+        """Flags are added to every entry in one pass."""
+        data = [
+            {"gpa": 3.9, "gre_verbal": 160.0, "gre_quant": 168.0, "gre_aw": 4.0},
+            {"gpa": 85.0, "gre_total": 1400.0, "gre_aw": 12.0},
+            {"program": "CS"},
+        ]
+
+        cleaner.add_quality_flags(data)
+
+        assert [entry["gpa_scale"] for entry in data] == ["4.0", "100", None]
+        assert [entry["gre_scale"] for entry in data] == ["new", "old", None]
+        assert [entry["gre_aw_valid"] for entry in data] == [True, False, None]
+
     def test_clean_program_field(self, cleaner):
         """Test test_clean_program_field."""
         # Test HTML removal
@@ -278,15 +356,15 @@ class TestGradCafeDataCleaner:
         assert cleaned["degree"] == "PhD"
         assert cleaned["semester"] == "Fall 2025"
         assert "Accepted" in cleaned["status"]
-        assert cleaned["status_date"] == "15 Mar 2025"
-        assert cleaned["date_added"] == "16 Mar 2025"
+        assert cleaned["status_date"] == "2025-03-15"
+        assert cleaned["date_added"] == "2025-03-16"
         assert cleaned["url"] == "http://example.com/result/123"
         assert cleaned["applicant_type"] == "International"
-        assert cleaned["gpa"] == "3.85"
-        assert cleaned["gre_total"] == "335"
-        assert cleaned["gre_verbal"] == "165"
-        assert cleaned["gre_quant"] == "170"
-        assert cleaned["gre_aw"] == "4.5"
+        assert cleaned["gpa"] == 3.85
+        assert cleaned["gre_total"] == 335.0
+        assert cleaned["gre_verbal"] == 165.0
+        assert cleaned["gre_quant"] == 170.0
+        assert cleaned["gre_aw"] == 4.5
         assert cleaned["comments"] == "Great program!"
 
     def test_clean_single_entry_minimal(self, cleaner):
@@ -323,7 +401,7 @@ class TestGradCafeDataCleaner:
         assert cleaned["program"] == ""
         assert cleaned["gpa"] is None
         assert cleaned["gre_total"] is None
-        assert cleaned["gre_verbal"] == "N/A"  # Returns 'N/A' when text doesn't have numeric value
+        assert cleaned["gre_verbal"] is None  # Non-numeric scores are dropped
         assert cleaned["comments"] is None
 
     def test_clean_data(self, cleaner, sample_data):
@@ -332,6 +410,7 @@ class TestGradCafeDataCleaner:
 
         assert len(cleaned) == 3
         assert all("program" in entry for entry in cleaned)
+        assert all(entry["gre_scale"] == "new" for entry in cleaned)
         assert cleaner.cleaned_data == cleaned
 
     def test_clean_data_filters_empty_program(self, cleaner):
@@ -414,6 +493,136 @@ class TestGradCafeDataCleaner:
         unique = cleaner.remove_duplicates([])
         assert unique == []
 
+    @pytest.fixture
+    def repost_data(self):
+        """Entries where the second one is a repost of the first with an edited comment."""
+        base = {
+            "school": "MIT",
+            "major": "Computer Science",
+            "degree": "PhD",
+            "status": "Accepted",
+            "date_added": "March 1, 2025",
+            "comments": "Email from the POI, very excited about the lab and the funding!",
+            "url": "url1",
+            "gpa": None,
+        }
+        return [
+            base,
+            {
+                **base,
+                "comments": "Email from the POI, very excited about the lab and the funding!!",
+                "url": "url2",
+                "gpa": "3.9",
+            },
+            {
+                **base,
+                "school": "Stanford University",
+                "comments": "Phone call from the department chair",
+                "url": "url3",
+            },
+        ]
+
+    def test_find_near_duplicates(self, cleaner, repost_data):
+        """Reposts with small edits map to the earliest entry; distinct ones do not."""
+        assert cleaner.find_near_duplicates(repost_data) == [None, 0, None]
+
+    def test_find_near_duplicates_empty_fields(self, cleaner):
+        """Entries without any comparable text are never flagged."""
+        assert cleaner.find_near_duplicates([{"url": "a"}, {"url": "b"}]) == [None, None]
+
+    def test_find_near_duplicates_invalid_bands(self, cleaner, repost_data):
+        """Bands must divide the signature length."""
+        with pytest.raises(ValueError):
+            cleaner.find_near_duplicates(repost_data, num_perm=64, bands=10)
+
+    def test_content_hash_is_stable(self):
+        """Hashes ignore key order but change with content."""
+        assert content_hash({"a": 1, "b": 2}) == content_hash({"b": 2, "a": 1})
+        assert content_hash({"a": 1}) != content_hash({"a": 2})
+
+    def test_clean_single_entry_records_hash_and_rules(self, cleaner):
+        """Cleaned entries carry the raw hash and the rule versions applied."""
+        raw = {"school": "MIT", "url": "url1"}
+        result = cleaner._clean_single_entry(raw)
+        assert result["raw_hash"] == content_hash(raw)
+        assert result["clean_rules"] == CLEAN_RULE_VERSIONS
+
+    def test_clean_changed_reuses_unchanged(self, cleaner):
+        """Unchanged rows are reused; new and edited rows are re-cleaned."""
+        raw = [
+            {"school": "MIT", "program": "CS", "status": "Accepted", "url": "url1"},
+            {"school": "Stanford", "program": "EE", "status": "Rejected", "url": "url2"},
+        ]
+        previous = GradCafeDataCleaner().clean_data(raw)
+        previous[0]["school"] = "sentinel"
+
+        new_entry = {"school": "CMU", "program": "ML", "url": "url3"}
+        edited = [raw[0], {**raw[1], "status": "Accepted"}, new_entry]
+        everything, delta, report = cleaner.clean_changed(edited, previous)
+
+        assert everything[0]["school"] == "sentinel"
+        assert [entry["url"] for entry in delta] == ["url2", "url3"]
+        assert report["unchanged"] == 1
+        assert report["raw_changed"] == 1
+        assert report["new"] == 1
+        assert report["removed"] == 0
+        assert cleaner.get_data_statistics(everything)["total_entries"] == 3
+
+    def test_clean_changed_counts_removed_by_url_and_skips_non_dicts(self, cleaner):
+        """Edited rows count as raw_changed, dropped rows as removed, non-dicts as skipped."""
+        raw = [{"school": "MIT", "program": "CS", "url": "url0"}, {"program": "EE", "url": "url1"}]
+        previous = GradCafeDataCleaner().clean_data(raw)
+        edited = {**raw[0], "gpa": "3.9"}
+
+        _, delta, report = cleaner.clean_changed([edited, raw[1], "garbage", None], previous)
+        assert [entry["url"] for entry in delta] == ["url0"]
+        assert (report["raw_changed"], report["removed"], report["skipped"]) == (1, 0, 2)
+
+        _, _, report = cleaner.clean_changed([edited], previous)
+        assert (report["raw_changed"], report["removed"]) == (1, 1)
+
+    def test_clean_changed_rule_bump(self, cleaner):
+        """Bumping a rule group re-cleans only rows that group applies to."""
+        raw = [
+            {"school": "MIT", "program": "CS", "gpa": "GPA 3.9", "url": "url1"},
+            {"school": "Stanford", "program": "EE", "url": "url2"},
+        ]
+        previous = GradCafeDataCleaner().clean_data(raw)
+        with patch.dict("clean.CLEAN_RULE_VERSIONS", {"scores": 2}):
+            _, delta, report = cleaner.clean_changed(raw, previous)
+            assert delta[0]["clean_rules"]["scores"] == 2
+
+        assert [entry["url"] for entry in delta] == ["url1"]
+        assert report["rules_changed"] == 1
+        assert report["unchanged"] == 1
+        assert report["stale_rule_groups"] == ["scores"]
+
+    def test_minhash_signature_is_stable(self):
+        """Signatures are deterministic and densified to the requested length."""
+        shingles = near_dup_shingles({"school": "MIT"})
+        first = minhash_signature(shingles, 64)
+        second = minhash_signature(shingles, 64)
+        assert first == second
+        assert len(first) == 64
+
+    def test_remove_near_duplicates_flag(self, cleaner, repost_data):
+        """Flag mode keeps every entry and points duplicates at the original."""
+        result = cleaner.remove_near_duplicates(repost_data, mode="flag")
+        assert len(result) == 3
+        assert "near_duplicate_of" not in result[0]
+        assert result[1]["near_duplicate_of"] == "url1"
+
+    def test_remove_near_duplicates_merge(self, cleaner, repost_data):
+        """Merge mode drops duplicates and backfills missing fields."""
+        result = cleaner.remove_near_duplicates(repost_data, mode="merge")
+        assert [entry["url"] for entry in result] == ["url1", "url3"]
+        assert result[0]["gpa"] == "3.9"
+
+    def test_remove_near_duplicates_invalid_mode(self, cleaner, repost_data):
+        """Unknown modes are rejected."""
+        with pytest.raises(ValueError):
+            cleaner.remove_near_duplicates(repost_data, mode="drop")
+
     def test_save_data_success(self, cleaner, sample_data, tmp_path):
         """Test test_save_data_success."""
         test_file = tmp_path / "test_cleaned.json"
@@ -552,6 +761,25 @@ class TestGradCafeDataCleaner:
         assert stats["unique_programs"] == 0
         assert stats["unique_schools"] == 0
 
+    def test_get_data_statistics_numeric_and_top_values(self, cleaner):
+        """Numeric summaries and top values are computed in the same pass."""
+        data = [
+            {"school": "MIT", "program": "CS", "gpa": "3.5", "degree": "PhD"},
+            {"school": "MIT", "program": "AI", "gpa": 3.9, "degree": "PhD"},
+            {"school": "Yale", "program": "Math", "gpa": "N/A", "degree": "Masters"},
+        ]
+
+        stats = cleaner.get_data_statistics(data)
+
+        assert stats["numeric"]["gpa"] == {"count": 2, "min": 3.5, "max": 3.9, "mean": 3.7}
+        assert stats["top_values"]["school"][0] == ("MIT", 2)
+        assert stats["top_values"]["degree"] == [("PhD", 2), ("Masters", 1)]
+
+    def test_clean_data_streams_statistics(self, cleaner, sample_data):
+        """clean_data updates the streaming accumulator for kept entries."""
+        cleaned = cleaner.clean_data(sample_data)
+        assert cleaner.statistics.to_dict() == cleaner.get_data_statistics(cleaned)
+
 
 @pytest.mark.analysis
 class TestMainFunction:
@@ -595,6 +823,68 @@ class TestMainFunction:
         assert "Data Statistics:" in captured.out
         assert "Data cleaning complete!" in captured.out
 
+    @pytest.mark.analysis
+    def test_main_near_dedup_merge(self, tmp_path, capsys):  # pylint: disable=unused-argument
+        """Test main with the near-duplicate merge pass enabled."""
+        input_file = tmp_path / "applicant_data.json"
+        entry = {
+            "school": "MIT",
+            "program": "CS",
+            "major": "Computer Science",
+            "status": "Accepted",
+            "comments": "Got the email this morning, still in shock about it",
+            "url": "url1",
+        }
+        raw_data = [entry, {**entry, "comments": entry["comments"] + "!", "url": "url2"}]
+        with open(input_file, "w", encoding="utf-8") as f:
+            json.dump(raw_data, f)
+
+        output_file = tmp_path / "cleaned_applicant_data.json"
+        argv = [
+            "clean.py",
+            "--input",
+            str(input_file),
+            "--output",
+            str(output_file),
+            "--near-dedup",
+            "merge",
+        ]
+        with patch("sys.argv", argv):
+            main()
+
+        with open(output_file, "r", encoding="utf-8") as f:
+            assert len(json.load(f)) == 1
+        assert "Merged 1 near-duplicate" in capsys.readouterr().out
+
+    def test_main_changed_only(self, tmp_path, capsys):
+        """Test main re-cleaning only changed rows against the existing output."""
+        input_file = tmp_path / "applicant_data.json"
+        output_file = tmp_path / "cleaned_applicant_data.json"
+        delta_file = tmp_path / "delta.json"
+        raw_data = [
+            {"school": "MIT", "program": "CS", "url": "url1"},
+            {"school": "Stanford", "program": "EE", "url": "url2"},
+        ]
+        with open(input_file, "w", encoding="utf-8") as f:
+            json.dump(raw_data, f)
+        argv = ["clean.py", "--input", str(input_file), "--output", str(output_file)]
+        with patch("sys.argv", argv):
+            main()
+
+        raw_data.append({"school": "CMU", "program": "ML", "url": "url3"})
+        with open(input_file, "w", encoding="utf-8") as f:
+            json.dump(raw_data, f)
+        with patch("sys.argv", argv + ["--changed-only", "--delta-output", str(delta_file)]):
+            main()
+
+        with open(output_file, "r", encoding="utf-8") as f:
+            assert len(json.load(f)) == 3
+        with open(delta_file, "r", encoding="utf-8") as f:
+            assert [entry["url"] for entry in json.load(f)] == ["url3"]
+        output = capsys.readouterr().out
+        assert "Change Report:" in output
+        assert "unchanged: 2" in output
+
     @pytest.mark.analysis
     def test_main_default_args(self, tmp_path, capsys):  # pylint: disable=unused-argument
         """Test test_main_default_args."""
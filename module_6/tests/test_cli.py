@@ -0,0 +1,211 @@
+"""
+Test suite for llm_hosting/cli.py: file runs (fresh, interrupted and resumed),
+the re-pass export and argument handling, on the instant fake backend
+"""
+
+import json
+import os
+import runpy
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+LLM_DIR = os.path.join(os.path.dirname(__file__), "..", "src", "llm_hosting")
+sys.path.insert(0, LLM_DIR)
+
+# Same import-time configuration as test_app.py, applied only while app.py is imported
+APP_ENV = {
+    "LLM_BACKEND": "fake",
+    "FAKE_CALL_LATENCY_MS": "0",
+    "FAKE_ROW_LATENCY_MS": "0",
+    "LLM_CACHE_PATH": "",
+    "REPASS_DB_PATH": "",
+    "CLASSIFIER": "0",
+    "CANON_UNIS_PATH": os.path.join(LLM_DIR, "canon_universities.txt"),
+    "CANON_PROGS_PATH": os.path.join(LLM_DIR, "canon_programs.txt"),
+}
+with pytest.MonkeyPatch.context() as env:
+    for name, value in APP_ENV.items():
+        env.setenv(name, value)
+    # pylint: disable=import-error,wrong-import-position
+    import app as service
+    import cli
+    from repass import RepassQueue
+    # pylint: enable=import-error,wrong-import-position
+
+# pylint: disable=redefined-outer-name
+
+ROWS = [{"url": f"u{i}", "program": f"Subject {i}, Nowhere College"} for i in range(10)]
+
+
+@pytest.fixture
+def in_path(tmp_path):
+    """JSON input file holding ROWS."""
+    path = tmp_path / "rows.json"
+    path.write_text(json.dumps(ROWS), encoding="utf-8")
+    return str(path)
+
+
+def _lines(path):
+    """Parsed JSON lines of ``path``."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.analysis
+def test_process_file_overwrites_the_output_and_reports_stats(in_path, tmp_path, capsys):
+    """Without --append the output is truncated; the run summary goes to stderr."""
+    out_path = tmp_path / "out.jsonl"
+    out_path.write_text('{"stale": true}\n', encoding="utf-8")
+
+    cli.process_file(in_path, str(out_path), append=False, to_stdout=False, batch_size=2)
+
+    lines = _lines(out_path)
+    assert [line["url"] for line in lines] == [row["url"] for row in ROWS]
+    assert lines[3]["llm-generated-program"] == "Subject 3"
+    summary = json.loads(capsys.readouterr().err.splitlines()[-1])
+    assert summary["run_dedup"]["total"] == 10
+
+
+@pytest.mark.analysis
+def test_process_file_defaults_the_output_path_and_writes_stdout(in_path, capsys):
+    """The output defaults to <input>.jsonl; --stdout writes the rows there instead."""
+    cli.process_file(in_path, None, append=False, to_stdout=False)
+    assert len(_lines(in_path + ".jsonl")) == 10
+
+    cli.process_file(in_path, None, append=False, to_stdout=True)
+    out = capsys.readouterr().out
+    assert [json.loads(line)["url"] for line in out.splitlines()] == [r["url"] for r in ROWS]
+
+
+@pytest.mark.analysis
+def test_cli_script_is_the_entry_point(in_path, monkeypatch, capsys):
+    """``python cli.py --file ... --stdout`` runs the standardizer in this process's app."""
+    monkeypatch.setattr(service, "EAGER_LOAD", False)
+    monkeypatch.setattr(sys, "argv", ["cli.py", "--file", in_path, "--stdout"])
+
+    runpy.run_path(os.path.join(LLM_DIR, "cli.py"), run_name="__main__")
+
+    assert len(capsys.readouterr().out.splitlines()) == 10
+
+
+@pytest.mark.analysis
+def test_interrupted_run_resumes_without_duplicates(in_path, tmp_path, monkeypatch, capsys):
+    """An interrupted run keeps its finished windows; --append does only the rest."""
+    out_path = str(tmp_path / "out.jsonl")
+    standardize_rows = service.standardize_rows
+    windows = []
+
+    def interrupted(rows, *args):
+        windows.append(len(rows))
+        if len(windows) == 2:
+            raise KeyboardInterrupt
+        return standardize_rows(rows, *args)
+
+    monkeypatch.setattr(service, "standardize_rows", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        cli.process_file(in_path, out_path, append=False, to_stdout=False, batch_size=1)
+    # batch_size 1 with one worker gives windows of four rows
+    assert len(_lines(out_path)) == 4
+    with open(out_path, "a", encoding="utf-8") as f:
+        f.write('{"url": "u4", "prog')  # a line cut short by the crash
+
+    monkeypatch.setattr(service, "standardize_rows", standardize_rows)
+    capsys.readouterr()
+    cli.process_file(in_path, out_path, append=True, to_stdout=False, batch_size=1)
+
+    assert [line["url"] for line in _lines(out_path)] == [row["url"] for row in ROWS]
+    assert "resume: 4 rows already in" in capsys.readouterr().err
+
+
+@pytest.mark.analysis
+@pytest.mark.parametrize("to_stdout", [False, True], ids=["file", "stdout"])
+def test_repass_drains_the_queue_and_exports_corrections(tmp_path, monkeypatch, capsys, to_stdout):
+    """Queued degraded rows are re-standardized now and written once as corrections."""
+    queue = RepassQueue(str(tmp_path / "repass.sqlite3"), batch=1)
+    queue.add([("url:u1", "u1", "Subject 1, Nowhere College")])
+    monkeypatch.setattr(service, "REPASS_DB_PATH", str(tmp_path / "repass.sqlite3"))
+    monkeypatch.setitem(service._QUEUES, "repass", queue)  # pylint: disable=protected-access
+    out_path = str(tmp_path / "repass.jsonl")
+
+    cli.repass(out_path, to_stdout)
+    cli.repass(out_path, to_stdout)
+
+    captured = capsys.readouterr()
+    lines = captured.out.splitlines() if to_stdout else _lines(out_path)
+    corrections = [json.loads(line) for line in lines] if to_stdout else lines
+    assert corrections == [
+        {
+            "url": "u1",
+            "program": "Subject 1, Nowhere College",
+            "llm-generated-program": "Subject 1",
+            "llm-generated-university": "Nowhere College",
+        }
+    ]
+    assert json.loads(captured.err.splitlines()[-1])["shedding"]["repass"]["exported"] == 1
+
+
+@pytest.mark.analysis
+def test_serve_resumes_background_work_then_runs_the_server(monkeypatch):
+    """--serve starts the job and re-pass workers before listening on PORT."""
+    monkeypatch.setenv("PORT", "8123")
+    with patch.object(service, "start_background") as background, patch.object(
+        service.app, "run"
+    ) as run:
+        cli.serve()
+    background.assert_called_once_with()
+    run.assert_called_once_with(host="0.0.0.0", port=8123, debug=False)
+
+
+@pytest.mark.analysis
+@pytest.mark.parametrize(
+    "argv,called,kwargs",
+    [
+        (
+            ["--file", "in.json", "--out", "o.jsonl", "--append", "--batch-size", "3"],
+            "process_file",
+            {
+                "in_path": "in.json",
+                "out_path": "o.jsonl",
+                "append": True,
+                "to_stdout": False,
+                "batch_size": 3,
+            },
+        ),
+        (["--repass", "--stdout"], "repass", None),
+        (["--serve"], "serve", None),
+        ([], "serve", None),
+    ],
+    ids=["file", "repass", "serve", "no-file"],
+)
+def test_main_dispatches_on_the_arguments(monkeypatch, argv, called, kwargs):
+    """main() picks the file run, the re-pass export or the server, warming up eagerly."""
+    monkeypatch.setattr(service, "EAGER_LOAD", True)
+    mocks = {name: MagicMock() for name in ("process_file", "repass", "serve")}
+    for name, mock in mocks.items():
+        monkeypatch.setattr(cli, name, mock)
+
+    with patch.object(service, "start_warmup") as warmup:
+        cli.main(argv)
+
+    assert [name for name, mock in mocks.items() if mock.called] == [called]
+    if kwargs:
+        mocks[called].assert_called_once_with(**kwargs)
+    if called == "repass":
+        mocks["repass"].assert_called_once_with(None, True)
+    assert warmup.called is (called != "repass")
+
+
+@pytest.mark.analysis
+def test_main_overrides_the_budgets_from_the_command_line(monkeypatch):
+    """--row-budget-ms and --deadline-s replace the env defaults for this run."""
+    monkeypatch.setattr(service, "EAGER_LOAD", False)
+    monkeypatch.setattr(service, "ROW_BUDGET_MS", 0)
+    monkeypatch.setattr(service, "DEADLINE_S", 0)
+    monkeypatch.setattr(cli, "process_file", MagicMock())
+
+    cli.main(["--file", "in.json", "--row-budget-ms", "250", "--deadline-s", "30"])
+
+    assert (service.ROW_BUDGET_MS, service.DEADLINE_S) == (250, 30)
+    assert service.request_budget()[1] == pytest.approx(0.25)
@@ -0,0 +1,120 @@
+"""
+Test suite for data_statistics.py module
+"""
+
+import os
+import pickle
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# pylint: disable=import-error,wrong-import-position
+from data_statistics import HyperLogLog, MisraGries, StreamingStatistics, stable_hash64
+# pylint: enable=import-error,wrong-import-position
+
+
+@pytest.mark.analysis
+class TestStreamingStatistics:
+    """Tests for the mergeable statistics accumulator."""
+
+    @staticmethod
+    def _rows(start, stop):
+        """Build simple rows with distinct programs."""
+        return [
+            {"program": f"Program {i}", "school": f"School {i % 7}", "gre_aw": str(i % 6)}
+            for i in range(start, stop)
+        ]
+
+    def test_merge_matches_single_pass(self):
+        """Merging shard accumulators equals accumulating everything at once."""
+        whole = StreamingStatistics()
+        for row in self._rows(0, 100):
+            whole.update(row)
+
+        left, right = StreamingStatistics(), StreamingStatistics()
+        for row in self._rows(0, 40):
+            left.update(row)
+        for row in self._rows(40, 100):
+            right.update(row)
+
+        # Accumulators cross process boundaries by pickling
+        right = pickle.loads(pickle.dumps(right))
+        assert left.merge(right).to_dict() == whole.to_dict()
+
+    def test_switches_to_hyperloglog(self):
+        """Distinct counts fall back to HyperLogLog past the exact limit."""
+        stats = StreamingStatistics(exact_limit=100)
+        for row in self._rows(0, 5000):
+            stats.update(row)
+
+        assert isinstance(stats.distinct["program"], HyperLogLog)
+        assert abs(stats.to_dict()["unique_programs"] - 5000) < 5000 * 0.05
+        assert stats.to_dict()["unique_schools"] == 7
+
+    def test_merge_exact_into_sketch(self):
+        """Merging exact sets with sketches keeps the estimate close."""
+        big = StreamingStatistics(exact_limit=100)
+        for row in self._rows(0, 3000):
+            big.update(row)
+        small = StreamingStatistics(exact_limit=100)
+        for row in self._rows(3000, 3050):
+            small.update(row)
+
+        merged = small.merge(big).to_dict()
+        assert abs(merged["unique_programs"] - 3050) < 3050 * 0.05
+
+    def test_merge_exact_set_and_new_numeric_fields_into_sketch(self):
+        """A sketch absorbs an exact shard; numeric fields only the other side saw are copied."""
+        big = StreamingStatistics(exact_limit=100)
+        for row in self._rows(0, 3000):
+            big.update({"program": row["program"]})
+        small = StreamingStatistics(exact_limit=100)
+        for row in self._rows(3000, 3050):
+            small.update(row)
+        small.update({"gre_aw": "n/a"})  # not a number: ignored
+
+        merged = big.merge(small).to_dict()
+        assert abs(merged["unique_programs"] - 3050) < 3050 * 0.05
+        assert merged["numeric"]["gre_aw"] == small.to_dict()["numeric"]["gre_aw"]
+
+    def test_top_values_stay_bounded_on_a_long_tail(self):
+        """Top values keep at most top_capacity counters per field yet find the heavy hitter."""
+        stats = StreamingStatistics(top_capacity=50)
+        for i in range(20000):
+            stats.update({"program": "Computer Science" if i % 4 == 0 else f"Program {i}"})
+
+        sketch = stats.top_values["program"]
+        assert len(sketch) <= 50
+        (value, count), = sketch.most_common(1)
+        # Misra-Gries undercounts by at most total / (capacity + 1)
+        assert value == "Computer Science" and 5000 - 20000 / 51 <= count <= 5000
+
+    def test_misra_gries_is_exact_within_capacity_and_merges_bounded(self):
+        """Counts are exact up to capacity; a merge keeps at most capacity counters."""
+        left, right = MisraGries(capacity=3), MisraGries(capacity=3)
+        for value in "aabbbc":
+            left.add(value)
+        assert left.most_common(2) == [("b", 3), ("a", 2)]
+
+        for value in "bbbbdde":
+            right.add(value)
+        left.merge(right)
+        assert len(left) <= 3
+        assert left.most_common(1)[0][0] == "b"
+        assert 7 - 13 / 4 <= left.most_common(1)[0][1] <= 7
+
+    def test_hyperloglog_merge_precision_mismatch(self):
+        """Sketches with different precision cannot be merged."""
+        with pytest.raises(ValueError):
+            HyperLogLog(precision=10).merge(HyperLogLog(precision=12))
+
+    def test_empty(self):
+        """An empty accumulator renders as an empty dict."""
+        assert not StreamingStatistics().to_dict()
+
+    def test_stable_hash64(self):
+        """Hashes are deterministic 64-bit integers."""
+        assert stable_hash64("MIT") == stable_hash64("MIT")
+        assert 0 <= stable_hash64("MIT") < 1 << 64
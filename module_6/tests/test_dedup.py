@@ -0,0 +1,75 @@
+"""
+Test suite for llm_hosting/dedup.py module
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "llm_hosting"))
+
+# pylint: disable=import-error,wrong-import-position
+from dedup import RequestDedup
+# pylint: enable=import-error,wrong-import-position
+
+
+def _answer(texts, todo):
+    """Answer the representative rows, recording what was asked."""
+    return {i: {"standardized_program": texts[i].split(",")[0].strip()} for i in todo}
+
+
+@pytest.mark.analysis
+def test_plan_picks_one_row_per_normalized_input():
+    """Whitespace, case and stray commas do not make an input distinct."""
+    dedup = RequestDedup()
+    texts = ["Math, MIT", " math,  mit ,", "Physics, UBC", "Math, MIT"]
+    keys, todo = dedup.plan(texts)
+    assert todo == [0, 2]
+    assert keys[0] == keys[1] == keys[3]
+
+
+@pytest.mark.analysis
+def test_fan_out_fills_every_row():
+    """Each repeat gets its representative's answer."""
+    dedup = RequestDedup()
+    texts = ["Math, MIT", "math, mit", "Physics, UBC"]
+    keys, todo = dedup.plan(texts)
+    results = dedup.fan_out(keys, _answer(texts, todo))
+    assert [r["standardized_program"] for r in results] == ["Math", "Math", "Physics"]
+    assert dedup.report() == {"total": 3, "distinct": 2, "distinct_ratio": 0.6667}
+
+
+@pytest.mark.analysis
+def test_answers_carry_over_to_later_windows():
+    """A later window of the same run reuses earlier answers without asking again."""
+    dedup = RequestDedup()
+    first = ["Math, MIT"]
+    keys, todo = dedup.plan(first)
+    dedup.fan_out(keys, _answer(first, todo))
+
+    second = ["MATH, MIT", "Physics, UBC"]
+    keys, todo = dedup.plan(second)
+    assert todo == [1]
+    results = dedup.fan_out(keys, _answer(second, todo))
+    assert results[0]["standardized_program"] == "Math"
+    assert dedup.report()["distinct"] == 2
+
+
+@pytest.mark.analysis
+def test_degraded_answers_are_not_remembered():
+    """Degraded answers are shared within a window but retried in the next one."""
+    dedup = RequestDedup()
+    texts = ["Math, MIT", "math, mit"]
+    keys, todo = dedup.plan(texts)
+    degraded = {todo[0]: {"standardized_program": "Math", "degraded": True}}
+    assert all(r.get("degraded") for r in dedup.fan_out(keys, degraded))
+
+    _, todo = dedup.plan(["Math, MIT"])
+    assert todo == [0]
+
+
+@pytest.mark.analysis
+def test_empty_report():
+    """No rows means a ratio of 1."""
+    assert RequestDedup().report() == {"total": 0, "distinct": 0, "distinct_ratio": 1.0}
@@ -309,7 +309,7 @@ class TestFlaskApp100Coverage:
                     if "clean.py" in args[0]:
                         return Mock(returncode=0, stdout="Cleaned", stderr="")
                     # LLM fails
-                    if "app.py" in args[0]:
+                    if "cli.py" in args[0]:
                         return Mock(returncode=1, stdout="", stderr="LLM error")
                     return Mock(returncode=0, stdout="", stderr="")
 
@@ -363,21 +363,17 @@ class TestFlaskApp100Coverage:
                     with patch("load_data.GradCafeDataLoader") as mock_loader_class:
                         mock_loader = mock_loader_class.return_value
                         mock_loader.connect_to_database.return_value = True
-                        mock_loader.load_data_from_jsonl.return_value = True
+                        mock_loader.upsert_from_jsonl.return_value = {
+                            "processed": 12,
+                            "inserted": 10,
+                            "updated": 2,
+                            "unchanged": 0,
+                            "failed": 0,
+                        }
                         mock_loader.close_connection.return_value = None
 
-                        # Mock psycopg connection for counting
+                        # Counts come from the loader; no separate DB connection
                         with patch("psycopg.connect") as mock_connect:
-                            mock_conn = Mock()
-                            mock_cursor = Mock()
-                            mock_cursor.fetchone.side_effect = [
-                                (100,),
-                                (110,),
-                            ]  # Initial and final counts
-                            mock_cursor.execute = Mock()
-                            mock_conn.cursor.return_value = mock_cursor
-                            mock_conn.close = Mock()
-                            mock_connect.return_value = mock_conn
 
                             with patch("threading.Thread") as mock_thread_class:
 
@@ -402,6 +398,8 @@ class TestFlaskApp100Coverage:
                                 assert (
                                     "Complete! Added 10 new records" in scraping_status["progress"]
                                 )
+                                assert "2 updated" in scraping_status["progress"]
+                                mock_connect.assert_not_called()
 
     @pytest.mark.integration
     def test_load_new_data_database_connection_failure(self):
@@ -464,7 +462,7 @@ class TestFlaskApp100Coverage:
                     with patch("load_data.GradCafeDataLoader") as mock_loader_class:
                         mock_loader = mock_loader_class.return_value
                         mock_loader.connect_to_database.return_value = True
-                        mock_loader.load_data_from_jsonl.return_value = False  # Loading fails
+                        mock_loader.upsert_from_jsonl.return_value = None  # Loading fails
 
                         with patch("threading.Thread") as mock_thread_class:
 
@@ -53,7 +53,13 @@ def test_load_new_data_with_successful_connection():
                 with patch("load_data.GradCafeDataLoader") as mock_loader_class:
                     mock_loader = mock_loader_class.return_value
                     mock_loader.connect_to_database.return_value = True
-                    mock_loader.load_data_from_jsonl.return_value = True
+                    mock_loader.upsert_from_jsonl.return_value = {
+                        "processed": 10,
+                        "inserted": 10,
+                        "updated": 0,
+                        "unchanged": 0,
+                        "failed": 0,
+                    }
                     mock_loader.close_connection.return_value = None
 
                     # Mock psycopg connection for counting - need two successful connections
@@ -94,9 +100,9 @@ def test_load_new_data_with_successful_connection():
                             response = client.post("/pull-data")
                             assert response.status_code == 202
 
-                            # Verify both connections were closed
-                            mock_conn1.close.assert_called_once()  # Line 227
-                            mock_conn2.close.assert_called_once()  # Line 239
+                            # New-row counts come from the upsert, not before/after COUNT(*)
+                            mock_connect.assert_not_called()
+                            mock_loader.close_connection.assert_called_once()
 
                             # Check success status
                             assert scraping_status["error"] is None
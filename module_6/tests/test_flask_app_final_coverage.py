@@ -234,7 +234,7 @@ class TestFlaskAppFinalCoverage:
 
     @pytest.mark.integration
     def test_complete_data_pipeline_with_db_success(self):
-        """Test complete pipeline including successful database operations - ensures lines 67-69 are covered"""  # pylint: disable=line-too-long
+        """Test complete pipeline including a successful database load with exact counts"""
         with patch("flask_app.psycopg") as mock_psycopg:
             # Create mock connection
             mock_conn = Mock()
@@ -262,7 +262,13 @@ class TestFlaskAppFinalCoverage:
                         with patch("load_data.GradCafeDataLoader") as mock_loader_class:
                             mock_loader = mock_loader_class.return_value
                             mock_loader.connect_to_database.return_value = True
-                            mock_loader.load_data_from_jsonl.return_value = True
+                            mock_loader.upsert_from_jsonl.return_value = {
+                                "processed": 10,
+                                "inserted": 10,
+                                "updated": 0,
+                                "unchanged": 0,
+                                "failed": 0,
+                            }
                             mock_loader.close_connection.return_value = None
 
                             with patch("threading.Thread") as mock_thread_class:
@@ -283,10 +289,10 @@ class TestFlaskAppFinalCoverage:
                                 response = client.post("/pull-data")
                                 assert response.status_code == 202
 
-                                # Verify database connection was made successfully
-                                mock_psycopg.connect.assert_called()
-                                assert mock_conn.cursor.called
-                                assert mock_conn.close.called
+                                # Schema is migrated first; the loader reports exact counts
+                                mock_loader.create_table.assert_called_once()
+                                mock_loader.upsert_from_jsonl.assert_called_once()
+                                mock_loader.close_connection.assert_called_once()
 
                                 # Check success
                                 assert scraping_status["error"] is None
@@ -19,7 +19,7 @@ from flask_app import create_app, scraping_status
 
 @pytest.mark.integration
 def test_load_new_data_failure_raises_exception():
-    """Test that line 239 (raise Exception) is executed when load_data_from_jsonl fails"""
+    """Test that line 239 (raise Exception) is executed when upsert_from_jsonl fails"""
 
     app = create_app()
 
@@ -43,8 +43,8 @@ def test_load_new_data_failure_raises_exception():
                 mock_conn.close = Mock()
                 mock_connect.return_value = mock_conn
 
-                # Make load_data_from_jsonl return False to trigger the exception
-                mock_loader.load_data_from_jsonl.return_value = False
+                # Make upsert_from_jsonl report a failed load to trigger the exception
+                mock_loader.upsert_from_jsonl.return_value = None
 
                 # Import and call the function directly
                 # This is a bit tricky since it's defined inside create_app
@@ -126,9 +126,9 @@ def test_direct_load_failure_exception():
                         mock_conn.close = Mock()
                         mock_connect.return_value = mock_conn
 
-                        # THIS IS THE KEY: Make load_data_from_jsonl return False
+                        # THIS IS THE KEY: Make upsert_from_jsonl report a failed load
                         # This will trigger line 239: raise RuntimeError("Failed to load new data")
-                        mock_loader.load_data_from_jsonl.return_value = False
+                        mock_loader.upsert_from_jsonl.return_value = None
 
                         # Execute synchronously
                         scraping_status["is_running"] = False
@@ -161,3 +161,39 @@ def test_direct_load_failure_exception():
                                 "Failed to load new data" in error_msg
                                 or "Database loading error" in error_msg
                             )
+
+
+@pytest.mark.db
+def test_load_migrates_schema_before_upsert():
+    """The schema migration runs before the upsert; a failed migration aborts the load"""
+    app = create_app()
+
+    with app.test_client() as client:
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = Mock(returncode=0, stdout="Success", stderr="")
+
+            with patch("builtins.open", create=True) as mock_open:
+                mock_open.return_value.__enter__.return_value = MagicMock()
+
+                with patch("load_data.GradCafeDataLoader") as mock_loader_class:
+                    mock_loader = mock_loader_class.return_value
+                    mock_loader.connect_to_database.return_value = True
+                    mock_loader.create_table.return_value = False
+                    scraping_status["is_running"] = False
+
+                    with patch("threading.Thread") as mock_thread_class:
+
+                        def mock_init(target=None, **kwargs):  # pylint: disable=unused-argument
+                            mock_thread = Mock()
+                            mock_thread.start = target
+                            return mock_thread
+
+                        mock_thread_class.side_effect = mock_init
+
+                        response = client.post("/pull-data")
+                        assert response.status_code == 202
+
+                    mock_loader.create_table.assert_called_once()
+                    mock_loader.upsert_from_jsonl.assert_not_called()
+                    mock_loader.close_connection.assert_called_once()
+                    assert "Failed to migrate database schema" in scraping_status["error"]
@@ -0,0 +1,66 @@
+"""
+Test suite for llm_hosting/fuzzy_index.py module
+"""
+
+import difflib
+import os
+import sys
+
+import pytest
+
+LLM_HOSTING_DIR = os.path.join(os.path.dirname(__file__), "..", "src", "llm_hosting")
+sys.path.insert(0, LLM_HOSTING_DIR)
+
+# pylint: disable=import-error,wrong-import-position
+from fuzzy_index import FuzzyIndex, _perturb, benchmark
+# pylint: enable=import-error,wrong-import-position
+
+
+def _canon(name):
+    """Read a canonical list shipped with the LLM standardizer."""
+    with open(os.path.join(LLM_HOSTING_DIR, name), "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def _difflib_best(name, candidates, cutoff):
+    """Reference result from difflib."""
+    matches = difflib.get_close_matches(name, candidates, n=1, cutoff=cutoff)
+    return matches[0] if matches else None
+
+
+@pytest.mark.analysis
+class TestFuzzyIndex:
+    """Agreement and edge-case tests for the trigram fuzzy index."""
+
+    @pytest.mark.parametrize(
+        "path, cutoff",
+        [("canon_universities.txt", 0.86), ("canon_programs.txt", 0.84)],
+    )
+    def test_agrees_with_difflib(self, path, cutoff):
+        """Every perturbed canon entry resolves exactly as difflib does."""
+        candidates = _canon(path)
+        index = FuzzyIndex(candidates)
+        queries = [_perturb(_perturb(name, i), 3 * i + 1) for i, name in enumerate(candidates)]
+        queries += ["University", "Univ of Toronto", "Computer Sci", "Mathematic", "xyz"]
+        for query in queries:
+            assert index.best_match(query, cutoff) == _difflib_best(query, candidates, cutoff)
+
+    def test_exact_and_empty(self):
+        """Exact hits short-circuit; empty inputs return None."""
+        index = FuzzyIndex(["Physics", "Chemistry"])
+        assert index.best_match("Physics") == "Physics"
+        assert index.best_match("") is None
+        assert FuzzyIndex([]).best_match("Physics") is None
+        assert len(index) == 2
+
+    def test_short_query_falls_back_to_difflib(self):
+        """Queries shorter than one n-gram use a full scan."""
+        index = FuzzyIndex(["AB", "CD"])
+        assert index.best_match("AB", cutoff=0.5) == "AB"
+        assert index.best_match("AC", cutoff=0.5) == _difflib_best("AC", ["AB", "CD"], 0.5)
+
+    def test_benchmark_reports_agreement(self):
+        """The benchmark helper reports latency and agreement."""
+        result = benchmark(_canon("canon_programs.txt"), cutoff=0.84, queries=50)
+        assert result["agreement"] == 1.0
+        assert result["queries"] == 50
@@ -0,0 +1,156 @@
+"""
+Test suite for llm_hosting/jobs.py module
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "llm_hosting"))
+
+# pylint: disable=import-error,wrong-import-position
+from jobs import JobQueue, resolve_input_path
+# pylint: enable=import-error,wrong-import-position
+
+# pylint: disable=redefined-outer-name
+
+
+def _upper(rows):
+    """Stand-in for the standardizer: upper-case each row's program."""
+    return [{**row, "llm-generated-program": row["program"].upper()} for row in rows]
+
+
+def _wait(queue, job_id, status="done"):
+    """Poll until the job reaches ``status`` (or fail after a few seconds)."""
+    for _ in range(500):
+        found = queue.status(job_id)
+        if found["status"] == status:
+            return found
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} stuck in {queue.status(job_id)['status']}")
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path of a fresh job store."""
+    return str(tmp_path / "jobs.sqlite3")
+
+
+@pytest.mark.analysis
+def test_submit_processes_rows_in_windows(db_path):
+    """A submitted job is drained window by window; results come back in input order."""
+    windows = []
+
+    def process(rows):
+        windows.append(len(rows))
+        return _upper(rows)
+
+    queue = JobQueue(db_path, process, window=2)
+    job_id = queue.submit({"program": p} for p in ["a", "b", "c"])
+
+    status = _wait(queue, job_id)
+    assert (status["total"], status["done"], status["progress"]) == (3, 3, 1.0)
+    assert windows == [2, 1]
+    assert [r["llm-generated-program"] for r in queue.results(job_id)] == ["A", "B", "C"]
+    assert queue.results(job_id, offset=2) == [{"program": "c", "llm-generated-program": "C"}]
+    assert queue.backlog() == 0
+    assert queue.status("missing") is None
+
+
+@pytest.mark.analysis
+def test_submit_streams_and_leaves_nothing_on_errors(db_path):
+    """Empty inputs create no job; a read error mid-stream rolls the whole job back."""
+    queue = JobQueue(db_path, _upper)
+
+    def broken():
+        yield {"program": "a"}
+        raise ValueError("truncated input")
+
+    with patch.object(queue, "start"):
+        assert queue.submit(iter([])) is None
+        with pytest.raises(ValueError):
+            queue.submit(broken())
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM job_rows").fetchone()[0] == 0
+
+
+@pytest.mark.analysis
+def test_jobs_are_claimed_oldest_first_and_failures_recorded(db_path):
+    """The worker takes jobs in submission order; a failing job does not block the next."""
+    seen = []
+
+    def process(rows):
+        seen.append(rows[0]["program"])
+        if rows[0]["program"] == "bad":
+            raise RuntimeError("model crashed")
+        return _upper(rows)
+
+    queue = JobQueue(db_path, process)
+    with patch.object(queue, "start"):
+        first = queue.submit([{"program": "bad"}])
+        second = queue.submit([{"program": "good"}])
+    assert queue.backlog() == 2
+
+    queue.start()
+    queue.start()  # idempotent while the worker is alive
+    failed = _wait(queue, first, "failed")
+    assert "model crashed" in failed["error"]
+    _wait(queue, second)
+    assert seen == ["bad", "good"]
+
+
+@pytest.mark.analysis
+def test_restart_resumes_from_first_unfinished_row(db_path):
+    """A job left running by a stopped process resumes without redoing finished rows."""
+    stopped = JobQueue(db_path, _upper, window=2)
+    with patch.object(stopped, "start"):
+        job_id = stopped.submit([{"program": p} for p in ["a", "b", "c", "d"]])
+
+    # Simulate a crash after the first window was persisted
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "UPDATE job_rows SET result = ? WHERE job_id = ? AND idx = ?",
+            [(json.dumps({"program": p, "llm-generated-program": "done"}), job_id, i)
+             for i, p in enumerate(["a", "b"])],
+        )
+        conn.execute("UPDATE jobs SET status = 'running', done = 2 WHERE id = ?", (job_id,))
+
+    processed = []
+
+    def process(rows):
+        processed.extend(row["program"] for row in rows)
+        return _upper(rows)
+
+    resumed = JobQueue(db_path, process, window=2)
+    assert resumed.results(job_id) == [
+        {"program": "a", "llm-generated-program": "done"},
+        {"program": "b", "llm-generated-program": "done"},
+    ]
+    resumed.start()
+    assert _wait(resumed, job_id)["done"] == 4
+    assert processed == ["c", "d"]
+    assert [r["llm-generated-program"] for r in resumed.results(job_id)] == [
+        "done", "done", "C", "D"
+    ]
+
+
+@pytest.mark.analysis
+def test_resolve_input_path_stays_inside_base(tmp_path):
+    """Job input paths resolve under the jobs directory; anything escaping it is refused."""
+    base = tmp_path / "inputs"
+    (base / "sub").mkdir(parents=True)
+    os.symlink("/etc", base / "escape")
+
+    expected = os.path.realpath(base / "sub" / "rows.json")
+    assert resolve_input_path(str(base), "sub/rows.json") == expected
+    assert resolve_input_path(str(base), "../secret.json") is None
+    assert resolve_input_path(str(base), "/etc/passwd") is None
+    assert resolve_input_path(str(base), "escape/passwd") is None
+    assert resolve_input_path("", "rows.json") is None
@@ -0,0 +1,111 @@
+"""
+Test suite for llm_hosting/llm_cache.py module
+"""
+
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "llm_hosting"))
+
+# pylint: disable=import-error,wrong-import-position
+from llm_cache import LLMCache, normalize_key
+# pylint: enable=import-error,wrong-import-position
+
+# pylint: disable=redefined-outer-name
+
+MATH = {"standardized_program": "Mathematics", "standardized_university": "MIT"}
+PHYSICS = {"standardized_program": "Physics", "standardized_university": "UBC"}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path of a fresh cache database."""
+    return str(tmp_path / "llm_cache.sqlite3")
+
+
+@pytest.mark.analysis
+def test_normalize_key_collapses_spacing_case_and_commas():
+    """Inputs that differ only in spacing, case or stray commas share one key."""
+    assert normalize_key("  Math,   MIT , ") == normalize_key("math, mit")
+    assert normalize_key(None) == ""
+
+
+@pytest.mark.analysis
+def test_put_get_round_trip_survives_reopen(db_path):
+    """Stored results come back for equivalent inputs, also after reopening the file."""
+    cache = LLMCache(db_path, "v1")
+    cache.put("Math, MIT", MATH)
+    assert cache.get("  math,  mit ") == MATH
+    cache.close()
+
+    reopened = LLMCache(db_path, "v1")
+    assert reopened.get("Math, MIT") == MATH
+    assert dict(reopened.items()) == {"math, mit": MATH}
+    reopened.close()
+
+
+@pytest.mark.analysis
+def test_namespaces_are_isolated_and_a_version_bump_misses(db_path):
+    """A new model or prompt/rule version starts empty; the old entries stay under theirs."""
+    old = LLMCache(db_path, "llama:model.gguf:rules-v1")
+    old.put("Math, MIT", MATH)
+
+    bumped = LLMCache(db_path, "llama:model.gguf:rules-v2")
+    assert bumped.get("Math, MIT") is None
+    assert not list(bumped.items())
+    assert bumped.stats()["entries"] == 0
+
+    bumped.put("Math, MIT", PHYSICS)
+    assert old.get("Math, MIT") == MATH
+    assert bumped.get("Math, MIT") == PHYSICS
+    old.close()
+    bumped.close()
+
+
+@pytest.mark.analysis
+def test_put_many_stores_a_batch_in_one_commit(db_path):
+    """A batch is written with one executemany and one commit; later writes replace."""
+    cache = LLMCache(db_path, "v1")
+    commits = []
+    cache._conn = _CountingConnection(cache._conn, commits)  # pylint: disable=protected-access
+
+    cache.put_many([("Math, MIT", MATH), ("Physics, UBC", PHYSICS)])
+    assert commits == ["commit"]
+    cache.put("Math, MIT", PHYSICS)
+    assert cache.get("Math, MIT") == PHYSICS
+    assert cache.stats()["entries"] == 2
+    cache.close()
+
+
+@pytest.mark.analysis
+def test_stats_count_hits_misses_and_entries(db_path):
+    """Hits, misses, hit rate and entry count reflect the lookups made."""
+    cache = LLMCache(db_path, "v1")
+    assert cache.stats() == {"hits": 0, "misses": 0, "hit_rate": 0.0, "entries": 0}
+
+    cache.put("Math, MIT", MATH)
+    cache.get("Math, MIT")
+    cache.get("Math, MIT")
+    cache.get("Physics, UBC")
+
+    assert cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 0.6667, "entries": 1}
+    cache.close()
+
+
+class _CountingConnection:  # pylint: disable=too-few-public-methods
+    """Wraps a sqlite3 connection and records each commit."""
+
+    def __init__(self, conn: sqlite3.Connection, commits: list) -> None:
+        self._conn = conn
+        self._commits = commits
+
+    def commit(self):
+        """Record, then commit."""
+        self._commits.append("commit")
+        self._conn.commit()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
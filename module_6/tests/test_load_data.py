@@ -129,6 +129,13 @@ class TestGradCafeDataLoader:  # pylint: disable=too-many-public-methods
         assert loader.parse_date("15/03/2025") == date(2025, 3, 15)
         assert loader.parse_date("3/15/2025") == date(2025, 3, 15)
 
+    def test_parse_date_typed_fast_path(self, loader):
+        """ISO strings and date objects skip dateutil entirely"""
+        with patch("load_data.date_parser.parse") as mock_parse:
+            assert loader.parse_date("2025-03-15") == date(2025, 3, 15)
+            assert loader.parse_date(date(2025, 3, 15)) == date(2025, 3, 15)
+        mock_parse.assert_not_called()
+
     def test_parse_date_invalid(self, loader):
         """Test parsing of invalid date strings"""
         assert loader.parse_date("Invalid Date") is None
@@ -163,7 +170,7 @@ class TestGradCafeDataLoader:  # pylint: disable=too-many-public-methods
         """Test transformation of complete record"""
         result = loader.transform_record(sample_record)
 
-        assert len(result) == 14
+        assert len(result) == 17
         assert result[0] == "Computer Science PhD @ MIT"  # program
         assert result[1] == "Great program!"  # comments
         assert result[2] == date(2025, 3, 15)  # date_added
@@ -178,6 +185,7 @@ class TestGradCafeDataLoader:  # pylint: disable=too-many-public-methods
         assert result[11] == "PhD"  # degree
         assert result[12] == "Computer Science"  # llm_generated_program
         assert result[13] == "MIT"  # llm_generated_university
+        assert result[14:] == ("4.0", "new", True)  # derived score validity flags
 
     def test_transform_record_minimal(self, loader):
         """Test transformation of minimal record"""
@@ -185,7 +193,7 @@ class TestGradCafeDataLoader:  # pylint: disable=too-many-public-methods
 
         result = loader.transform_record(minimal_record)
 
-        assert len(result) == 14
+        assert len(result) == 17
         assert result[0] == "MIT CS"
         assert result[1] == ""  # comments default to empty string
         # Most fields should be None or empty string
@@ -197,6 +205,107 @@ class TestGradCafeDataLoader:  # pylint: disable=too-many-public-methods
         result = loader.transform_record(record)
         assert result[8] == 170.0  # gre should fall back to gre_quant
 
+    def test_transform_record_uses_cleaner_flags(self, loader, sample_record):
+        """Flags computed by the cleaner are stored as-is"""
+        record = {**sample_record, "gpa_scale": "10", "gre_scale": "old", "gre_aw_valid": False}
+
+        result = loader.transform_record(record)
+        assert result[14:] == ("10", "old", False)
+
+    def test_create_table_adds_flag_indexes(self, loader):
+        """Schema setup migrates old tables and indexes the validity flags"""
+        mock_cursor = MagicMock()
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        loader.connection = mock_conn
+
+        assert loader.create_table() is True
+        create_table_sql = mock_cursor.execute.call_args[0][0]
+        assert "ADD COLUMN IF NOT EXISTS gre_scale" in create_table_sql
+        assert "CREATE INDEX IF NOT EXISTS idx_applicant_data_score_flags" in create_table_sql
+
+    def test_create_table_adds_unique_result_id(self, loader):
+        """Schema setup backfills result_id once and indexes it uniquely"""
+        mock_cursor = MagicMock()
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        loader.connection = mock_conn
+
+        assert loader.create_table() is True
+        create_table_sql = mock_cursor.execute.call_args[0][0]
+        assert "ADD COLUMN IF NOT EXISTS result_id BIGINT" in create_table_sql
+        # The backfill only runs when the column is first added
+        guard = create_table_sql.index("column_name = 'result_id'")
+        backfill = create_table_sql.index("UPDATE applicant_data AS a SET result_id")
+        assert guard < backfill < create_table_sql.index("END IF;", backfill)
+        assert (
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_applicant_data_result_id" in create_table_sql
+        )
+
+    def test_create_table_backfills_score_flags_once(self, loader):
+        """Legacy tables get the flag columns plus a one-time backfill from their scores"""
+        mock_cursor = MagicMock()
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        loader.connection = mock_conn
+
+        assert loader.create_table() is True
+        create_table_sql = mock_cursor.execute.call_args[0][0]
+        guard = create_table_sql.index("column_name = 'gre_scale'")
+        backfill = create_table_sql.index("UPDATE applicant_data SET")
+        assert guard < backfill < create_table_sql.index("END IF;")
+        # New-scale totals (260-340) are matched before the overlapping old section range
+        assert create_table_sql.index("gre BETWEEN 260.0 AND 340.0 THEN 'new'") < (
+            create_table_sql.index("gre BETWEEN 200.0 AND 800.0 THEN 'old'")
+        )
+        assert "gre_aw * 2 = trunc(gre_aw * 2)" in create_table_sql
+
+    def test_upsert_from_jsonl_reports_exact_counts(self, loader, sample_jsonl_content, tmp_path):
+        """Batches are merged on result_id; counts split inserted/updated/unchanged"""
+        test_file = tmp_path / "test_data.jsonl"
+        test_file.write_text(sample_jsonl_content)
+        mock_cursor = MagicMock()
+        # Batch 1 (2 rows): one new, one changed; batch 2 (1 row): unchanged
+        mock_cursor.fetchall.side_effect = [[(True,), (False,)], []]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        loader.connection = mock_conn
+
+        counts = loader.upsert_from_jsonl(str(test_file), batch_size=2)
+
+        assert counts == {
+            "processed": 3, "inserted": 1, "updated": 1, "unchanged": 1, "rejected": 0,
+            "failed": 0,
+        }
+        statements = [c[0][0] for c in mock_cursor.execute.call_args_list]
+        merge_sql = next(
+            s.as_string(None) for s in statements
+            if not isinstance(s, str) and "ON CONFLICT" in s.as_string(None)
+        )
+        assert 'ON CONFLICT (result_id) DO UPDATE SET "program" = EXCLUDED."program"' in merge_sql
+        assert "IS DISTINCT FROM" in merge_sql
+        # Each batch registers its own programs from the staging table, before the commit
+        registers = [
+            s.as_string(None) for s in statements
+            if not isinstance(s, str) and "program_canonical" in s.as_string(None)
+        ]
+        assert len(registers) == 2
+        assert 'FROM "applicant_data_staging"' in registers[0]
+        assert mock_conn.commit.call_count >= 2
+
+    def test_reload_of_unchanged_rows_still_succeeds(self, loader, sample_jsonl_content, tmp_path):
+        """Re-loading a file that is already in the table inserts nothing but is not a failure"""
+        test_file = tmp_path / "test_data.jsonl"
+        test_file.write_text(sample_jsonl_content)
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = []
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        loader.connection = mock_conn
+
+        assert loader.load_data_from_jsonl(str(test_file)) is True
+        assert loader.upsert_from_jsonl(str(tmp_path / "missing.jsonl")) is None
+
     def test_load_data_from_jsonl_success(self, loader, sample_jsonl_content, tmp_path):
         """Test successful loading of JSONL data"""
         # Create test file
@@ -216,6 +325,53 @@ class TestGradCafeDataLoader:  # pylint: disable=too-many-public-methods
         assert mock_cursor.executemany.call_count == 2
         mock_conn.commit.assert_called()
 
+    def test_update_llm_fields_from_jsonl(self, loader, tmp_path):
+        """Re-pass corrections update LLM fields by URL, skipping bad lines"""
+        test_file = tmp_path / "repass.jsonl"
+        test_file.write_text(
+            "\n".join(
+                [
+                    json.dumps(
+                        {
+                            "url": "http://example.com/1",
+                            "llm-generated-program": "Computer Science",
+                            "llm-generated-university": "MIT",
+                        }
+                    ),
+                    "not json",
+                    json.dumps({"llm-generated-program": "No URL"}),
+                ]
+            )
+        )
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 1
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        loader.connection = mock_conn
+
+        assert loader.update_llm_fields_from_jsonl(str(test_file)) == 1
+        # One staged batch and one UPDATE ... FROM, not one statement per row
+        staged = mock_cursor.executemany.call_args[0][1]
+        assert staged == [(1, "http://example.com/1", "Computer Science", "MIT")]
+        assert "UPDATE applicant_data AS a" in mock_cursor.execute.call_args[0][0]
+        assert mock_cursor.execute.call_count == 2
+        mock_conn.commit.assert_called_once()
+
+    def test_update_llm_fields_from_jsonl_errors(self, loader, tmp_path):
+        """Missing files and database errors update nothing"""
+        assert loader.update_llm_fields_from_jsonl(str(tmp_path / "missing.jsonl")) == 0
+
+        test_file = tmp_path / "repass.jsonl"
+        test_file.write_text(json.dumps({"url": "u", "llm-generated-program": "P"}))
+        mock_cursor = MagicMock()
+        mock_cursor.execute.side_effect = psycopg.Error("boom")
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        loader.connection = mock_conn
+
+        assert loader.update_llm_fields_from_jsonl(str(test_file)) == 0
+        mock_conn.rollback.assert_called_once()
+
     def test_load_data_from_jsonl_file_not_found(self, loader):
         """Test loading from non-existent file"""
         result = loader.load_data_from_jsonl("nonexistent.jsonl")
@@ -328,10 +484,12 @@ class TestGradCafeDataLoader:  # pylint: disable=too-many-public-methods
             ),
         ]
 
-        insert_sql = "INSERT INTO applicant_data VALUES ..."
-        result = loader._insert_batch(insert_sql, batch_data)  # pylint: disable=protected-access
+        mock_cursor.fetchall.return_value = [(True,)]
+        result = loader._insert_batch(batch_data)  # pylint: disable=protected-access
 
-        assert result == 2
+        assert result == {
+            "inserted": 1, "updated": 0, "unchanged": 1, "rejected": 0, "failed": 0
+        }
         mock_cursor.executemany.assert_called_once()
         mock_conn.commit.assert_called_once()
 
@@ -362,11 +520,105 @@ class TestGradCafeDataLoader:  # pylint: disable=too-many-public-methods
             )
         ]
 
-        insert_sql = "INSERT INTO applicant_data VALUES ..."
-        result = loader._insert_batch(insert_sql, batch_data)  # pylint: disable=protected-access
+        result = loader._insert_batch(batch_data)  # pylint: disable=protected-access
+
+        # Not caused by a row's data: the whole batch fails, nothing is bisected
+        assert result == {
+            "inserted": 0, "updated": 0, "unchanged": 0, "rejected": 0, "failed": 1
+        }
+        mock_cursor.executemany.assert_called_once()
+        mock_conn.rollback.assert_called_once()
+
+    def test_insert_batch_isolates_bad_rows(self, loader):
+        """A row-level error is bisected down to the bad rows; the rest load in bulk"""
+        staged_batches = []
+        rejects = []
+
+        def executemany(query, rows):
+            if isinstance(query, str) and "load_rejects" in query:
+                rejects.extend(rows)
+                return
+            staged_batches.append(len(rows))
+            if any(row[0].startswith("bad") for row in rows):
+                raise psycopg.DataError("invalid input syntax for type date")
+
+        mock_cursor = MagicMock()
+        mock_cursor.executemany.side_effect = executemany
+        mock_cursor.fetchall.return_value = []
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        loader.connection = mock_conn
+        loader._reject_source = "data.jsonl"  # pylint: disable=protected-access
+
+        programs = [f"good {i}" for i in range(8)]
+        programs[5] = "bad 5"
+        batch = [(p,) for p in programs]
+        lines = [(i + 1, f'{{"program": "{p}"}}') for i, p in enumerate(programs)]
+        result = loader._insert_batch(batch, lines=lines)  # pylint: disable=protected-access
+
+        assert result == {
+            "inserted": 0, "updated": 0, "unchanged": 7, "rejected": 1, "failed": 0
+        }
+        # 8 fails -> 4 ok, 4 fails -> 2 fails (-> 1 ok, 1 bad), 2 ok; in file order
+        assert staged_batches == [8, 4, 4, 2, 1, 1, 2]
+        assert rejects == [
+            ("data.jsonl", 6, "invalid input syntax for type date", '{"program": "bad 5"}')
+        ]
+
+    @pytest.mark.parametrize("mode", ["copy", "copy-binary"])
+    def test_load_data_from_jsonl_copy(self, loader, sample_jsonl_content, tmp_path, mode):
+        """COPY modes stream every transformed row through one COPY per batch"""
+        test_file = tmp_path / "test_data.jsonl"
+        test_file.write_text(sample_jsonl_content)
+        mock_cursor = MagicMock()
+        mock_copy = mock_cursor.copy.return_value.__enter__.return_value
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        loader.connection = mock_conn
+
+        assert loader.load_data_from_jsonl(str(test_file), batch_size=2, mode=mode) is True
+        assert mock_cursor.copy.call_count == 2
+        assert mock_copy.write_row.call_count == 3
+        mock_cursor.executemany.assert_not_called()
+        copy_sql = mock_cursor.copy.call_args[0][0].as_string(None)
+        assert copy_sql.startswith('COPY "applicant_data_staging" ("program", "comments"')
+        assert copy_sql.endswith("(FORMAT BINARY)") == (mode == "copy-binary")
+        assert mock_copy.set_types.called == (mode == "copy-binary")
+
+    def test_load_data_from_jsonl_row_at_a_time(self, loader, sample_jsonl_content, tmp_path):
+        """Row mode executes one INSERT per staged row, with no executemany"""
+        test_file = tmp_path / "test_data.jsonl"
+        test_file.write_text(sample_jsonl_content)
+        mock_cursor = MagicMock()
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        loader.connection = mock_conn
+        loader.load_mode = "row"
+
+        assert loader.load_data_from_jsonl(str(test_file), batch_size=2) is True
+        inserts = [
+            c for c in mock_cursor.execute.call_args_list
+            if "INSERT INTO \"applicant_data_staging\"" in c[0][0].as_string(None)
+        ]
+        assert len(inserts) == 3
+        mock_cursor.executemany.assert_not_called()
+        mock_conn.pipeline.assert_not_called()
+
+    def test_copy_batch_error_and_unknown_mode(self, loader, db_config):
+        """A failed COPY rolls back the batch; unknown modes are rejected"""
+        mock_cursor = MagicMock()
+        mock_cursor.copy.side_effect = psycopg.Error("bad row")
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        loader.connection = mock_conn
 
-        assert result == 0
+        result = loader._insert_batch([("MIT CS",)], "copy")  # pylint: disable=protected-access
+        assert result["failed"] == 1
         mock_conn.rollback.assert_called_once()
+        with pytest.raises(ValueError):
+            loader.load_data_from_jsonl("unused.jsonl", mode="bulk")
+        with pytest.raises(ValueError):
+            GradCafeDataLoader(db_config, load_mode="bulk")
 
     def test_get_table_stats_success(self, loader):
         """Test getting table statistics"""
@@ -433,6 +685,8 @@ class TestMainFunction:
             mock_parser = MagicMock()
             mock_args = MagicMock()
             mock_args.input = "test_data.jsonl"
+            mock_args.updates = None
+            mock_args.batch_size = 50000
             mock_parser.parse_args.return_value = mock_args
             mock_parser_class.return_value = mock_parser
 
@@ -455,10 +709,34 @@ class TestMainFunction:
                 assert result is True
                 mock_instance.connect_to_database.assert_called_once()
                 mock_instance.create_table.assert_called_once()
-                mock_instance.load_data_from_jsonl.assert_called_once_with("test_data.jsonl")
+                mock_instance.load_data_from_jsonl.assert_called_once_with(
+                    "test_data.jsonl", batch_size=50000
+                )
                 mock_instance.get_table_stats.assert_called_once()
                 mock_instance.close_connection.assert_called_once()
 
+    @pytest.mark.db
+    def test_main_applies_updates(self):
+        """--updates applies re-pass corrections instead of loading a file"""
+        with patch("argparse.ArgumentParser") as mock_parser_class:
+            mock_parser = MagicMock()
+            mock_args = MagicMock()
+            mock_args.updates = "repass.jsonl"
+            mock_parser.parse_args.return_value = mock_args
+            mock_parser_class.return_value = mock_parser
+
+            with patch.object(sys.modules["load_data"], "GradCafeDataLoader") as mock_loader_class:
+                mock_instance = MagicMock()
+                mock_instance.connect_to_database.return_value = True
+                mock_instance.create_table.return_value = True
+                mock_instance.update_llm_fields_from_jsonl.return_value = 3
+                mock_loader_class.return_value = mock_instance
+
+                assert main() is True
+                mock_instance.update_llm_fields_from_jsonl.assert_called_once_with("repass.jsonl")
+                mock_instance.load_data_from_jsonl.assert_not_called()
+                mock_instance.close_connection.assert_called_once()
+
     @pytest.mark.db
     def test_main_connection_failure(self):
         """Test main function with database connection failure"""
@@ -466,6 +744,7 @@ class TestMainFunction:
             mock_parser = MagicMock()
             mock_args = MagicMock()
             mock_args.input = "test_data.jsonl"
+            mock_args.updates = None
             mock_parser.parse_args.return_value = mock_args
             mock_parser_class.return_value = mock_parser
 
@@ -486,6 +765,7 @@ class TestMainFunction:
             mock_parser = MagicMock()
             mock_args = MagicMock()
             mock_args.input = "test_data.jsonl"
+            mock_args.updates = None
             mock_parser.parse_args.return_value = mock_args
             mock_parser_class.return_value = mock_parser
 
@@ -507,6 +787,7 @@ class TestMainFunction:
             mock_parser = MagicMock()
             mock_args = MagicMock()
             mock_args.input = "test_data.jsonl"
+            mock_args.updates = None
             mock_parser.parse_args.return_value = mock_args
             mock_parser_class.return_value = mock_parser
 
@@ -529,6 +810,7 @@ class TestMainFunction:
             mock_parser = MagicMock()
             mock_args = MagicMock()
             mock_args.input = "test_data.jsonl"
+            mock_args.updates = None
             mock_parser.parse_args.return_value = mock_args
             mock_parser_class.return_value = mock_parser
 
@@ -549,6 +831,7 @@ class TestMainFunction:
             mock_parser = MagicMock()
             mock_args = MagicMock()
             mock_args.input = "test_data.jsonl"
+            mock_args.updates = None
             mock_parser.parse_args.return_value = mock_args
             mock_parser_class.return_value = mock_parser
 
@@ -0,0 +1,74 @@
+"""
+Test suite for llm_hosting/metrics.py module
+"""
+
+import math
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "llm_hosting"))
+
+# pylint: disable=import-error,wrong-import-position
+from metrics import Histogram, family, format_labels, format_value
+# pylint: enable=import-error,wrong-import-position
+
+
+@pytest.mark.analysis
+def test_format_value():
+    """Integers print bare, infinities and NaN use Prometheus spellings."""
+    assert format_value(3.0) == "3"
+    assert format_value(0.25) == "0.25"
+    assert format_value(math.inf) == "+Inf"
+    assert format_value(-math.inf) == "-Inf"
+    assert format_value(math.nan) == "NaN"
+
+
+@pytest.mark.analysis
+def test_format_labels_escapes_values():
+    """Quotes, backslashes and newlines in label values are escaped."""
+    assert format_labels({}) == ""
+    assert format_labels({"a": 'x"y', "b": "p\\q\nr"}) == '{a="x\\"y",b="p\\\\q\\nr"}'
+
+
+@pytest.mark.analysis
+def test_family_renders_help_type_and_samples():
+    """A counter family has HELP, TYPE and one line per sample."""
+    lines = family("rows_total", "counter", "Rows.", [({"path": "llm"}, 2), ({}, 0.5)])
+    assert lines == [
+        "# HELP rows_total Rows.",
+        "# TYPE rows_total counter",
+        'rows_total{path="llm"} 2',
+        "rows_total 0.5",
+    ]
+
+
+@pytest.mark.analysis
+def test_histogram_buckets_are_cumulative():
+    """Buckets count observations <= their bound, ending with +Inf, _sum and _count."""
+    hist = Histogram("latency_seconds", "Latency.", labelnames=("path",), buckets=(0.1, 1.0))
+    hist.observe(0.05, path="rules")
+    hist.observe(0.5, count=2, path="rules")
+    hist.observe(5.0, path="rules")
+    lines = hist.render()
+    assert lines[:2] == ["# HELP latency_seconds Latency.", "# TYPE latency_seconds histogram"]
+    assert lines[2:] == [
+        'latency_seconds_bucket{path="rules",le="0.1"} 1',
+        'latency_seconds_bucket{path="rules",le="1"} 3',
+        'latency_seconds_bucket{path="rules",le="+Inf"} 4',
+        'latency_seconds_sum{path="rules"} 6.05',
+        'latency_seconds_count{path="rules"} 4',
+    ]
+
+
+@pytest.mark.analysis
+def test_histogram_bound_is_inclusive_and_series_are_separate():
+    """A value equal to a bound lands in that bucket; label sets get their own series."""
+    hist = Histogram("h", "H.", labelnames=("path",), buckets=(1.0,))
+    hist.observe(1.0, path="a")
+    hist.observe(2.0, path="b")
+    lines = hist.render()
+    assert 'h_bucket{path="a",le="1"} 1' in lines
+    assert 'h_bucket{path="b",le="1"} 0' in lines
+    assert 'h_count{path="b"} 1' in lines
@@ -0,0 +1,67 @@
+"""
+Test suite for near_duplicates.py module
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# pylint: disable=import-error,wrong-import-position
+from clean import GradCafeDataCleaner
+from near_duplicates import minhash_signature, near_dup_shingles
+# pylint: enable=import-error,wrong-import-position
+
+
+@pytest.mark.analysis
+@pytest.mark.parametrize("comments", ["", "   ", " \n\t "], ids=["empty", "spaces", "mixed"])
+def test_blank_comments_give_no_shingles_and_no_match(comments):
+    """Rows with nothing but blank comments have no shingles and never match each other."""
+    rows = [{"comments": comments, "url": "a"}, {"comments": comments, "url": "b"}]
+    assert near_dup_shingles(rows[0]) == set()
+    assert GradCafeDataCleaner().find_near_duplicates(rows) == [None, None]
+
+
+@pytest.mark.analysis
+def test_text_shorter_than_a_shingle_is_one_shingle():
+    """Text no longer than the shingle size becomes a single shingle."""
+    shingles = near_dup_shingles({"school": "MIT"}, size=50)
+    assert shingles == {"mit | | | | |"}
+
+
+@pytest.mark.analysis
+def test_signature_of_empty_and_dense_shingle_sets():
+    """No shingles gives an all-zero signature; when every bin is hit none is borrowed."""
+    assert minhash_signature(set(), 8) == (0,) * 8
+    dense = minhash_signature({f"shingle {i}" for i in range(200)}, 4)
+    assert len(dense) == 4 and all(value < 1 << 60 for value in dense)
+
+
+@pytest.mark.analysis
+def test_band_collision_below_threshold_is_not_a_duplicate():
+    """Rows sharing an LSH bucket are still kept apart when their similarity is too low."""
+    base = {
+        "school": "Stanford University",
+        "major": "Computer Science",
+        "degree": "PhD",
+        "status": "Accepted",
+        "date_added": "2025-03-01",
+        "comments": "Funded offer, five years, emailed by the department chair",
+    }
+    other = {**base, "comments": "Rejected after an interview, no feedback was given"}
+    num_perm = 64
+    first, second = (minhash_signature(near_dup_shingles(r), num_perm) for r in (base, other))
+    same = sum(a == b for a, b in zip(first, second))
+    # With one row per band any equal position puts both rows in the same bucket
+    assert 0 < same / num_perm < 0.8
+
+    cleaner = GradCafeDataCleaner()
+    assert cleaner.find_near_duplicates([base, other], num_perm=num_perm, bands=num_perm) == [
+        None,
+        None,
+    ]
+    assert cleaner.find_near_duplicates(
+        [base, other], threshold=same / num_perm, num_perm=num_perm, bands=num_perm
+    ) == [None, 0]
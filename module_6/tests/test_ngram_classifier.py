@@ -0,0 +1,133 @@
+"""
+Test suite for llm_hosting/ngram_classifier.py module
+"""
+
+import os
+import random
+import sys
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("numpy")
+
+LLM_HOSTING_DIR = os.path.join(os.path.dirname(__file__), "..", "src", "llm_hosting")
+sys.path.insert(0, LLM_HOSTING_DIR)
+
+# pylint: disable=import-error,wrong-import-position
+from fuzzy_index import _perturb
+from ngram_classifier import DistilledStandardizer, NgramNB, featurize
+from program_parts import split_pair
+# pylint: enable=import-error,wrong-import-position
+
+
+def _canon(name, limit):
+    """Read the first ``limit`` names of a canonical list shipped with the standardizer."""
+    with open(os.path.join(LLM_HOSTING_DIR, name), "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()][:limit]
+
+
+def _examples(count, seed):
+    """Synthetic (noisy input, LLM result) pairs over part of the canon lists."""
+    rng = random.Random(seed)
+    programs = _canon("canon_programs.txt", 40)
+    universities = _canon("canon_universities.txt", 60)
+    out = []
+    for _ in range(count):
+        prog, uni = rng.choice(programs), rng.choice(universities)
+        text = f"{_perturb(prog, rng.randrange(1000))}, {_perturb(uni, rng.randrange(1000))}"
+        out.append(
+            (text, {"standardized_program": prog, "standardized_university": uni})
+        )
+    return out
+
+
+@pytest.mark.analysis
+def test_featurize_is_case_insensitive_and_deduplicated():
+    """Ids are unique and sorted with matching counts."""
+    ids, counts = featurize("Abab", dim=1024)
+    same_ids, same_counts = featurize("aBAB", dim=1024)
+    assert ids.tolist() == same_ids.tolist()
+    assert counts.tolist() == same_counts.tolist()
+    assert ids.tolist() == sorted(set(ids.tolist()))
+    assert counts.sum() > len(ids)  # "ab" occurs twice
+
+    ids, counts = featurize("", dim=1024, sizes=(3,))  # padded text shorter than any gram
+    assert ids.size == 0 and counts.size == 0
+
+
+@pytest.mark.analysis
+def test_ngram_nb_predicts_training_labels():
+    """A fitted model recovers the labels of slightly perturbed inputs."""
+    model = NgramNB().fit(
+        ["computer science", "mathematics", "history"] * 3,
+        ["Computer Science", "Mathematics", "History"] * 3,
+    )
+    label, confidence = model.predict("computer sciense")
+    assert label == "Computer Science"
+    assert 0.0 < confidence <= 1.0
+    # Nothing to calibrate on when no held-out label is a known class
+    assert model.calibrate(["physics"], ["Physics"]) == model.temperature
+
+
+@pytest.mark.analysis
+def test_untrained_standardizer_defers():
+    """With too few examples the classifier stays untrained and answers nothing."""
+    model = DistilledStandardizer(min_examples=50)
+    assert model.train(_examples(10, seed=0)) is False
+    assert not model.ready
+    assert model.predict("Mathematics, McGill University") is None
+
+
+@pytest.mark.analysis
+def test_confident_answers_are_accurate():
+    """High-confidence answers cover most held-out rows and are almost always right."""
+    examples = _examples(3000, seed=1)
+    model = DistilledStandardizer()
+    assert model.train(examples)
+    assert model.trained_on == sum(split_pair(text) is not None for text, _ in examples)
+
+    test = _examples(500, seed=2)
+    answered = [(model.predict(text), want) for text, want in test]
+    answered = [(got, want) for got, want in answered if got is not None]
+    assert len(answered) >= 0.5 * len(test)
+    correct = sum(got == want for got, want in answered)
+    assert correct >= 0.97 * len(answered)
+
+
+@pytest.mark.analysis
+def test_unknown_universities_and_ambiguous_inputs_are_skipped():
+    """Rows labelled "Unknown" are not learned, and unsplittable inputs are not answered."""
+    labelled = _examples(200, seed=3)
+    examples = labelled + [
+        ("Physics, Somewhere", {"standardized_program": "Physics",
+                                "standardized_university": "Unknown"})
+    ] * 50
+    model = DistilledStandardizer()
+    assert model.train(examples)
+    assert model.trained_on == sum(split_pair(text) is not None for text, _ in labelled)
+    assert "Unknown" not in model.university.classes
+    assert model.predict("Physics") is None
+
+
+@pytest.mark.analysis
+@pytest.mark.parametrize(
+    "program_conf,university_conf", [(0.5, 0.99), (0.99, 0.5)], ids=["program", "university"]
+)
+def test_below_confidence_half_defers_to_the_llm(program_conf, university_conf):
+    """If either half is below min_confidence the whole row is left to the LLM."""
+    model = DistilledStandardizer(min_confidence=0.9)
+    assert model.train(_examples(200, seed=4))
+
+    def answer(prog_conf, uni_conf):
+        with patch.object(model.program, "predict", return_value=("Mathematics", prog_conf)):
+            with patch.object(
+                model.university, "predict", return_value=("McGill University", uni_conf)
+            ):
+                return model.predict("Mathematics, McGill University")
+
+    assert answer(program_conf, university_conf) is None
+    assert answer(0.99, 0.99) == {
+        "standardized_program": "Mathematics",
+        "standardized_university": "McGill University",
+    }
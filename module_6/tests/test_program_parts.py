@@ -0,0 +1,40 @@
+"""
+Test suite for llm_hosting/program_parts.py module
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "llm_hosting"))
+
+# pylint: disable=import-error,wrong-import-position
+from program_parts import split_halves, split_pair, split_parts
+# pylint: enable=import-error,wrong-import-position
+
+
+@pytest.mark.analysis
+def test_split_parts_on_commas_at_and_at_sign():
+    """Whitespace is collapsed and ",", " at " and " @ " all separate parts."""
+    assert split_parts(" Math ,  McGill, Montreal ,") == ["Math", "McGill", "Montreal"]
+    assert split_parts("Physics at MIT") == ["Physics", "MIT"]
+    assert split_parts("Physics @ MIT") == ["Physics", "MIT"]
+    assert not split_parts("  ")
+
+
+@pytest.mark.analysis
+def test_split_pair():
+    """Only unambiguous two-part inputs are split."""
+    assert split_pair(" Mathematics ,  UBC ") == ("Mathematics", "UBC")
+    assert split_pair("Physics at MIT") == ("Physics", "MIT")
+    assert split_pair("Physics") is None
+    assert split_pair("A, B, C") is None
+
+
+@pytest.mark.analysis
+def test_split_halves():
+    """The first two parts, padded with empty strings."""
+    assert split_halves("Math, McGill, Montreal") == ("Math", "McGill")
+    assert split_halves("Math") == ("Math", "")
+    assert split_halves(None) == ("", "")
@@ -181,6 +181,18 @@ class TestGradCafeQueryAnalyzer:  # pylint: disable=too-many-public-methods
             assert "Q3_Average_Metrics" in call_args[0]
             assert "AVG(gpa)" in call_args[1]
 
+    @pytest.mark.analysis
+    def test_question_3_keeps_gre_on_section_scale(self):
+        """Combined totals share the gre column, so Q3 bounds it to section scores"""
+        analyzer = GradCafeQueryAnalyzer({"host": "localhost"})
+
+        with patch.object(analyzer, "execute_query") as mock_execute:
+            analyzer.question_3_average_metrics()
+
+        query_sql = mock_execute.call_args[0][1].as_string(None)
+        assert '"gre" <= 170' in query_sql
+        assert "\"gre_scale\" = 'new'" in query_sql
+
     @pytest.mark.analysis
     def test_question_4_american_fall_2025_gpa(self):
         """Test question 4 query"""
@@ -565,3 +577,24 @@ def test_main_block_execution():
                 sys.exit(0 if success else 1)
 
             mock_exit.assert_called_with(0)
+
+
+@pytest.mark.analysis
+def test_university_questions_join_program_canonical():
+    """Q7-Q10 read canonical names from program_canonical, falling back to LLM fields"""
+    analyzer = GradCafeQueryAnalyzer({"host": "localhost"})
+    questions = [
+        analyzer.question_7_jhu_cs_masters,
+        analyzer.question_8_georgetown_cs_phd_2025_acceptances,
+        analyzer.question_9_penn_state_international_fall_2025,
+        analyzer.question_10_penn_state_2025_acceptances,
+    ]
+    for question in questions:
+        with patch.object(analyzer, "execute_query", return_value=1) as mock_execute:
+            question()
+        query = mock_execute.call_args[0][1].as_string(None)
+        assert 'LEFT JOIN "program_canonical"' in query
+        assert (
+            'COALESCE("program_canonical"."canonical_university", '
+            '"applicant_data"."llm_generated_university")' in query
+        )
@@ -0,0 +1,113 @@
+"""
+Test suite for llm_hosting/repass.py module
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "llm_hosting"))
+
+# pylint: disable=import-error,wrong-import-position
+from repass import RepassQueue
+# pylint: enable=import-error,wrong-import-position
+
+# pylint: disable=redefined-outer-name
+
+
+def _standardize(texts):
+    """Stand-in for the LLM: split on the comma."""
+    out = []
+    for text in texts:
+        prog, uni = [part.strip() for part in text.split(",")]
+        out.append({"standardized_program": prog, "standardized_university": uni})
+    return out
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """A queue with two degraded rows."""
+    q = RepassQueue(str(tmp_path / "repass.sqlite3"), batch=1, poll_s=0.01)
+    q.add([("url:a", "a", "Math, MIT"), ("url:b", "b", "Physics, UBC")])
+    return q
+
+
+@pytest.mark.analysis
+def test_run_once_processes_one_batch_in_order(queue):
+    """Rows are re-standardized oldest first, one batch per call."""
+    assert queue.pending(10) == [("url:a", "Math, MIT"), ("url:b", "Physics, UBC")]
+    assert queue.run_once(_standardize) == 1
+    assert queue.counts() == {"queued": 1, "done": 1, "exported": 0}
+    assert queue.run_once(_standardize) == 1
+    assert queue.run_once(_standardize) == 0
+
+
+@pytest.mark.analysis
+def test_export_yields_corrections_once(queue):
+    """Finished rows are exported as url + llm-generated-* corrections exactly once."""
+    while queue.run_once(_standardize):
+        pass
+    corrections = list(queue.export())
+    assert corrections[0] == {
+        "url": "a",
+        "program": "Math, MIT",
+        "llm-generated-program": "Math",
+        "llm-generated-university": "MIT",
+    }
+    assert len(corrections) == 2
+    assert not list(queue.export())
+    assert queue.counts() == {"queued": 0, "done": 2, "exported": 2}
+
+
+@pytest.mark.analysis
+def test_requeue_resets_result(queue):
+    """Degrading a row again re-queues it for another pass."""
+    queue.run_once(_standardize)
+    queue.add([("url:a", "a", "Math, MIT")])
+    assert queue.counts()["queued"] == 2
+
+
+@pytest.mark.analysis
+def test_queue_survives_restart(queue):
+    """A new queue on the same file sees the pending rows."""
+    again = RepassQueue(queue.path)
+    assert len(again.pending(10)) == 2
+
+
+@pytest.mark.analysis
+def test_background_pass_waits_for_idle(queue):
+    """The background thread only works while the model is idle."""
+    idle = {"value": False}
+    queue.start(_standardize, lambda: idle["value"])
+    time.sleep(0.1)
+    assert queue.counts()["done"] == 0
+
+    idle["value"] = True
+    deadline = time.time() + 5
+    while queue.counts()["queued"] and time.time() < deadline:
+        time.sleep(0.01)
+    assert queue.counts() == {"queued": 0, "done": 2, "exported": 0}
+
+
+@pytest.mark.analysis
+def test_failed_batches_stay_queued(queue, caplog):
+    """A failing re-pass is logged and counted, and leaves the rows queued for the next poll."""
+    calls = []
+
+    def failing(texts):
+        calls.append(texts)
+        raise RuntimeError("model unavailable")
+
+    idle = {"value": True}
+    queue.start(failing, lambda: idle["value"])
+    deadline = time.time() + 5
+    while len(calls) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    idle["value"] = False  # park the thread so it stops failing for the rest of the session
+    assert len(calls) >= 2
+    assert queue.counts()["queued"] == 2
+    assert queue.failures >= 2
+    failed = [r for r in caplog.records if r.name == "repass" and r.levelname == "ERROR"]
+    assert failed and "model unavailable" in failed[0].exc_text
@@ -0,0 +1,116 @@
+"""
+Test suite for llm_hosting/row_stream.py module
+"""
+
+import io
+import json
+import os
+import sys
+from collections import Counter
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "llm_hosting"))
+
+# pylint: disable=import-error,wrong-import-position
+from row_stream import (
+    _iter_array,
+    iter_json_rows,
+    row_key,
+    scan_completed,
+    skip_completed,
+)
+# pylint: enable=import-error,wrong-import-position
+
+ROWS = [
+    {"program": "Math, MIT", "url": "u1"},
+    {"program": "Physics, UBC", "comments": "brackets ] and, commas"},
+    {"program": "CS @ McGill", "url": "u3"},
+]
+
+
+@pytest.mark.analysis
+@pytest.mark.parametrize(
+    "text",
+    [
+        json.dumps(ROWS, indent=2),
+        "\n".join(json.dumps(row) for row in ROWS) + "\n\n",
+        json.dumps({"rows": ROWS}),
+        json.dumps({"rows": ROWS}, indent=2),
+    ],
+    ids=["array", "jsonl", "rows-wrapper", "rows-wrapper-multiline"],
+)
+def test_iter_json_rows_formats(tmp_path, text):
+    """Arrays, JSON Lines and {'rows': [...]} files stream the same rows."""
+    path = tmp_path / "in.json"
+    path.write_text("  \n" + text, encoding="utf-8")
+    assert list(iter_json_rows(str(path))) == ROWS
+
+
+@pytest.mark.analysis
+def test_iter_json_rows_empty_and_unknown(tmp_path):
+    """Empty files, empty arrays and non-JSON inputs yield nothing."""
+    for name, text in (("empty", ""), ("blank", "  \n"), ("none", "[]"), ("text", "hello")):
+        path = tmp_path / name
+        path.write_text(text, encoding="utf-8")
+        assert not list(iter_json_rows(str(path)))
+
+
+@pytest.mark.analysis
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_iter_array_values_split_across_chunks(chunk_size):
+    """Values cut by a chunk boundary are completed from the next read."""
+    rows = ROWS + [{"program": "Économie, Université Laval", "gpa": 3.95}, [1, 2], "s", 10]
+    stream = io.StringIO(json.dumps(rows)[1:])  # the caller consumed the "["
+    assert list(_iter_array(stream, chunk_size=chunk_size)) == rows
+
+
+@pytest.mark.analysis
+def test_iter_array_truncated_input_raises():
+    """A value still incomplete at end of file is an error, not a silent stop."""
+    with pytest.raises(json.JSONDecodeError):
+        list(_iter_array(io.StringIO('{"program": "Math"}, {"program": "Phy'), chunk_size=4))
+
+
+@pytest.mark.analysis
+def test_row_key_prefers_url_and_ignores_generated_fields():
+    """Rows are keyed by URL, else by their input fields only."""
+    assert row_key({"url": "u1", "program": "x"}) == "url:u1"
+    raw = {"program": "Physics, UBC"}
+    answered = {**raw, "llm-generated-program": "Physics", "llm-degraded": True}
+    assert row_key(raw) == row_key(answered)
+    assert row_key(raw).startswith("sha1:")
+    assert row_key(raw) != row_key({"program": "Physics, MIT"})
+
+
+@pytest.mark.analysis
+def test_scan_completed_truncates_partial_trailing_line(tmp_path):
+    """A crash mid-write leaves a partial line; it is dropped so appends start cleanly."""
+    out = tmp_path / "out.jsonl"
+    done = [dict(row, **{"llm-generated-program": "P"}) for row in ROWS[:2]]
+    complete = "".join(json.dumps(row) + "\n" for row in done)
+    out.write_text(complete + "not json\n" + '{"program": "CS @ Mc', encoding="utf-8")
+
+    completed = scan_completed(str(out))
+
+    assert completed == Counter({row_key(ROWS[0]): 1, row_key(ROWS[1]): 1})
+    assert out.read_text(encoding="utf-8") == complete + "not json\n"
+    assert scan_completed(str(tmp_path / "missing.jsonl")) == Counter()
+
+
+@pytest.mark.analysis
+def test_resume_skips_each_completed_row_once(tmp_path):
+    """Resuming skips one input row per completed output row, keeping true repeats."""
+    out = tmp_path / "out.jsonl"
+    repeat = {"program": "Math, MIT"}
+    out.write_text(
+        json.dumps(dict(repeat, **{"llm-generated-program": "Mathematics"})) + "\n"
+        + json.dumps(ROWS[0]) + "\n",
+        encoding="utf-8",
+    )
+    rows = [ROWS[0], repeat, repeat, ROWS[2]]
+
+    remaining = list(skip_completed(rows, scan_completed(str(out))))
+
+    assert remaining == [repeat, ROWS[2]]
+    assert list(skip_completed([None, {}], Counter())) == [None, {}]
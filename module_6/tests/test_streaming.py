@@ -0,0 +1,95 @@
+"""
+Test suite for llm_hosting/streaming.py module
+"""
+
+import io
+import json
+import os
+import sys
+
+import pytest
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "llm_hosting"))
+
+# pylint: disable=import-error,wrong-import-position
+from streaming import iter_windows, ndjson_lines, ndjson_response, write_jsonl
+# pylint: enable=import-error,wrong-import-position
+
+
+def _recorder(calls):
+    """A window processor that records window sizes and tags each row."""
+
+    def process(chunk):
+        calls.append(len(chunk))
+        return [{**row, "seen": True} for row in chunk]
+
+    return process
+
+
+@pytest.mark.analysis
+def test_iter_windows_processes_full_windows_then_the_rest():
+    """Rows go to the processor ``window`` at a time; output keeps input order."""
+    calls = []
+    rows = [{"i": i} for i in range(5)]
+    out = list(iter_windows(iter(rows), 2, _recorder(calls)))
+    assert calls == [2, 2, 1]
+    assert [row["i"] for row in out] == [0, 1, 2, 3, 4]
+    assert all(row["seen"] for row in out)
+    assert not list(iter_windows([], 2, _recorder(calls)))
+
+
+@pytest.mark.analysis
+def test_write_jsonl_flushes_every_n_rows():
+    """Each row becomes one JSON line; the sink is flushed every ``flush_every`` rows."""
+
+    class Sink(io.StringIO):
+        """StringIO that counts flushes."""
+
+        flushes = 0
+
+        def flush(self):
+            self.flushes += 1
+            super().flush()
+
+    sink = Sink()
+    written = write_jsonl(({"program": f"Économie {i}"} for i in range(5)), sink, flush_every=2)
+    assert written == 5
+    assert sink.flushes == 2
+    assert [json.loads(line) for line in sink.getvalue().splitlines()][4] == {
+        "program": "Économie 4"
+    }
+    assert "Économie" in sink.getvalue()  # not \u-escaped
+    assert write_jsonl([], Sink(), flush_every=2) == 0
+    assert list(ndjson_lines([{"a": 1}])) == ['{"a": 1}\n']
+
+
+@pytest.mark.web
+def test_ndjson_response_stops_producing_when_the_client_disconnects():
+    """Closing the response closes the generator, so no further windows are processed."""
+    calls = []
+    state = {"closed": False}
+
+    def source():
+        try:
+            for i in range(10):
+                yield {"i": i}
+        finally:
+            state["closed"] = True
+
+    flask_app = Flask(__name__)
+
+    @flask_app.get("/rows")
+    def rows():
+        windows = iter_windows(source(), 2, _recorder(calls))
+        return ndjson_response(windows, headers={"X-Distinct-Ratio": "1.0"})
+
+    response = flask_app.test_client().get("/rows", buffered=False)
+    assert response.mimetype == "application/x-ndjson"
+    assert response.headers["X-Distinct-Ratio"] == "1.0"
+    first = next(response.iter_encoded())
+    response.close()
+
+    assert json.loads(first) == {"i": 0, "seen": True}
+    assert calls == [2]
+    assert state["closed"]
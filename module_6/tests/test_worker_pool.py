@@ -0,0 +1,93 @@
+"""
+Test suite for llm_hosting/worker_pool.py module
+"""
+
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "llm_hosting"))
+
+# pylint: disable=import-error,wrong-import-position
+import worker_pool
+from worker_pool import WorkerPool, split_threads
+# pylint: enable=import-error,wrong-import-position
+
+# Set in each worker process by the pool initializer
+_THREADS = {}
+
+
+def _record_threads(n_threads):
+    """Pool initializer: remember this worker's thread budget."""
+    _THREADS["n"] = n_threads
+
+
+def _whoami(item):
+    """Report the worker's pid and thread budget along with the item."""
+    return os.getpid(), _THREADS.get("n"), item
+
+
+def _square(item):
+    """Trivial work item."""
+    return item * item
+
+
+@pytest.mark.analysis
+def test_split_threads():
+    """Threads are spread evenly and every worker gets at least one."""
+    assert split_threads(8, 3) == [3, 3, 2]
+    assert split_threads(2, 4) == [1, 1, 1, 1]
+    assert split_threads(4, 0) == [4]
+
+
+@pytest.mark.analysis
+def test_pool_spawns_initialized_workers_with_their_thread_share():
+    """start() brings up every worker; on_each reaches each one exactly once."""
+    pool = WorkerPool(2, 5, _record_threads)
+    try:
+        assert pool._executor._mp_context.get_start_method() == "spawn"  # pylint: disable=protected-access
+        pool.start()
+        seen = pool.on_each(_whoami)
+        assert [item for _, _, item in seen] == [0, 1]
+        assert len({pid for pid, _, _ in seen}) == 2
+        assert os.getpid() not in {pid for pid, _, _ in seen}
+        assert sorted(n for _, n, _ in seen) == [2, 3]
+
+        assert pool.map(_square, range(6)) == [0, 1, 4, 9, 16, 25]
+        assert pool.submit(_square, 7).result() == 49
+    finally:
+        pool.shutdown()
+
+
+def in_process_executor(max_workers, mp_context, initializer, initargs):
+    """Stand-in for ProcessPoolExecutor that runs the workers as threads of this process."""
+    del mp_context
+    return ThreadPoolExecutor(max_workers, initializer=initializer, initargs=initargs)
+
+
+@pytest.mark.analysis
+def test_in_process_workers_split_threads_and_meet_at_the_barrier(monkeypatch):
+    """Each worker claims one thread budget; on_each runs once per worker, all at once."""
+    monkeypatch.setattr(worker_pool, "ProcessPoolExecutor", in_process_executor)
+    budgets = {}
+
+    def record(n_threads):
+        budgets[threading.get_ident()] = n_threads
+
+    def meet(item):
+        return threading.get_ident(), item
+
+    pool = WorkerPool(3, 7, record)
+    try:
+        pool.start()
+        seen = pool.on_each(meet)
+        assert sorted(budgets.values()) == [2, 2, 3]
+        assert [item for _, item in seen] == [0, 1, 2]
+        # The barrier kept any worker from taking two of the calls
+        assert {ident for ident, _ in seen} == set(budgets)
+        assert pool.map(_square, [2, 3]) == [4, 9]
+    finally:
+        pool.shutdown()